@@ -0,0 +1,122 @@
+"""refresh token hash
+
+Revision ID: 0002_refresh_token_hash
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+
+- Thay cột `token` (String 512, token gốc) bằng `token_hash` (SHA-256, BINARY(32) trên MySQL, unique).
+- Thay `replaced_by_token` bằng `replaced_by_token_hash`.
+- Thêm index (user_id, is_revoked, expires_at) cho GetValidTokensForUser.
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_refresh_token_hash'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+TABLE = "refresh_tokens"
+BATCH_SIZE = 1000
+TokenHashType = sa.LargeBinary(32).with_variant(mysql.BINARY(32), "mysql")
+
+
+def _Columns(bind) -> set[str]:
+    inspector = sa.inspect(bind)
+    if not inspector.has_table(TABLE):
+        return set()
+    return {c["name"] for c in inspector.get_columns(TABLE)}
+
+
+def _Sha256(value: str | None) -> bytes | None:
+    return hashlib.sha256(value.encode("utf-8")).digest() if value else None
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = _Columns(bind)
+    if "token" not in columns:
+        # Bảng chưa có (DB mới, InitDb tạo theo model) hoặc đã ở schema mới
+        return
+
+    op.add_column(TABLE, sa.Column("token_hash", TokenHashType, nullable=True))
+    op.add_column(TABLE, sa.Column("replaced_by_token_hash", TokenHashType, nullable=True))
+
+    # Backfill theo batch (keyset theo id) để không load cả bảng
+    table = sa.table(
+        TABLE,
+        sa.column("id", sa.Integer),
+        sa.column("token", sa.String),
+        sa.column("replaced_by_token", sa.String),
+        sa.column("token_hash", TokenHashType),
+        sa.column("replaced_by_token_hash", TokenHashType),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.token, table.c.replaced_by_token)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update()
+            .where(table.c.id == sa.bindparam("_id"))
+            .values(token_hash=sa.bindparam("_token_hash"), replaced_by_token_hash=sa.bindparam("_replaced_hash")),
+            [
+                {"_id": row.id, "_token_hash": _Sha256(row.token), "_replaced_hash": _Sha256(row.replaced_by_token)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table(TABLE) as batch:
+        batch.alter_column("token_hash", existing_type=TokenHashType, nullable=False)
+        batch.create_unique_constraint("uq_refresh_tokens_token_hash", ["token_hash"])
+        batch.drop_column("token")
+        batch.drop_column("replaced_by_token")
+        batch.create_index("ix_refresh_tokens_user_revoked_expires", ["user_id", "is_revoked", "expires_at"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    if "token_hash" not in _Columns(bind):
+        return
+
+    # Không khôi phục được token gốc từ digest: điền hex(digest) cho cột token và revoke toàn bộ token,
+    # user cần đăng nhập lại để lấy refresh token mới.
+    with op.batch_alter_table(TABLE) as batch:
+        batch.drop_index("ix_refresh_tokens_user_revoked_expires")
+        batch.add_column(sa.Column("token", sa.String(512), nullable=True))
+        batch.add_column(sa.Column("replaced_by_token", sa.String(512), nullable=True))
+
+    table = sa.table(
+        TABLE,
+        sa.column("id", sa.Integer),
+        sa.column("token", sa.String),
+        sa.column("token_hash", TokenHashType),
+        sa.column("is_revoked", sa.Boolean),
+    )
+    rows = bind.execute(sa.select(table.c.id, table.c.token_hash)).all()
+    if rows:
+        bind.execute(
+            table.update()
+            .where(table.c.id == sa.bindparam("_id"))
+            .values(token=sa.bindparam("_token"), is_revoked=True),
+            [{"_id": row.id, "_token": bytes(row.token_hash).hex()} for row in rows],
+        )
+
+    with op.batch_alter_table(TABLE) as batch:
+        batch.alter_column("token", existing_type=sa.String(512), nullable=False)
+        batch.create_unique_constraint("uq_refresh_tokens_token", ["token"])
+        batch.drop_constraint("uq_refresh_tokens_token_hash", type_="unique")
+        batch.drop_column("token_hash")
+        batch.drop_column("replaced_by_token_hash")
@@ -0,0 +1,46 @@
+"""users claims version
+
+Revision ID: 0003_users_claims_version
+Revises: 0002_refresh_token_hash
+Create Date: 2026-10-18 00:00:00.000000
+
+- Thêm cột `users.claims_version` (INTEGER NOT NULL DEFAULT 0): trạng thái revoke của claims principal
+  nằm trong DB (dùng chung mọi worker, không mất khi restart) thay vì trong process.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_users_claims_version'
+down_revision = '0002_refresh_token_hash'
+branch_labels = None
+depends_on = None
+
+TABLE = "users"
+COLUMN = "claims_version"
+
+
+def _Columns(bind) -> set[str]:
+    inspector = sa.inspect(bind)
+    if not inspector.has_table(TABLE):
+        return set()
+    return {c["name"] for c in inspector.get_columns(TABLE)}
+
+
+def upgrade():
+    columns = _Columns(op.get_bind())
+    if not columns or COLUMN in columns:
+        # Bảng chưa có (DB mới, InitDb tạo theo model) hoặc đã có cột
+        return
+
+    op.add_column(TABLE, sa.Column(COLUMN, sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    if COLUMN not in _Columns(op.get_bind()):
+        return
+
+    with op.batch_alter_table(TABLE) as batch:
+        batch.drop_column(COLUMN)
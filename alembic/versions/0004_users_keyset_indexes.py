@@ -0,0 +1,50 @@
+"""users keyset indexes
+
+Revision ID: 0004_users_keyset_indexes
+Revises: 0003_users_claims_version
+Create Date: 2026-10-18 00:00:00.000000
+
+- Thêm index (full_name, id) và (is_active, id) cho keyset pagination của users
+  (UserRepository.SearchByCursor sort trên cột gốc thay vì coalesce / cast).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_users_keyset_indexes'
+down_revision = '0003_users_claims_version'
+branch_labels = None
+depends_on = None
+
+TABLE = "users"
+INDEXES = {
+    "ix_users_full_name_id": ["full_name", "id"],
+    "ix_users_is_active_id": ["is_active", "id"],
+}
+
+
+def _Indexes(bind) -> set[str] | None:
+    inspector = sa.inspect(bind)
+    if not inspector.has_table(TABLE):
+        return None
+    return {index["name"] for index in inspector.get_indexes(TABLE)}
+
+
+def upgrade():
+    existing = _Indexes(op.get_bind())
+    if existing is None:
+        # Bảng chưa có (DB mới, InitDb tạo theo model)
+        return
+
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, TABLE, columns)
+
+
+def downgrade():
+    existing = _Indexes(op.get_bind()) or set()
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name=TABLE)
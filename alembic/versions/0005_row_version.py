@@ -0,0 +1,57 @@
+"""row version
+
+Revision ID: 0005_row_version
+Revises: 0004_users_keyset_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+- Thêm cột `row_version` (BIGINT NOT NULL DEFAULT 1) cho mọi bảng dùng AuditMixin: tăng 1 ở mỗi UPDATE,
+  dùng cho ETag strong (updated_at chỉ chính xác tới giây trên SQLite / MySQL DATETIME).
+- Dòng cũ bắt đầu từ 1; dòng insert sau migration nhận version ngẫu nhiên (AuditMixin.NewRowVersion).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_row_version'
+down_revision = '0004_users_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+COLUMN = "row_version"
+TABLES = [
+    "users",
+    "roles",
+    "permissions",
+    "user_roles",
+    "role_permissions",
+    "refresh_tokens",
+    "products",
+    "weather_forecasts",
+]
+
+
+def _Columns(bind, table: str) -> set[str] | None:
+    inspector = sa.inspect(bind)
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table in TABLES:
+        columns = _Columns(bind, table)
+        if columns is None or COLUMN in columns:
+            # Bảng chưa có (DB mới, InitDb tạo theo model) hoặc đã có cột
+            continue
+        op.add_column(table, sa.Column(COLUMN, sa.BigInteger(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table in TABLES:
+        if COLUMN in (_Columns(bind, table) or set()):
+            with op.batch_alter_table(table) as batch:
+                batch.drop_column(COLUMN)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.application.services.PermissionResolver import PermissionResolver
+from app.infrastructure.auth.Authorization import RequireRoles, UserPrincipal
+from app.infrastructure.auth.PasswordHasher import PasswordHasherStats
+from app.infrastructure.db.base import DbEngines, GetDbEngines
+from app.infrastructure.db.pool import PoolStats
+from app.shared.api_responses import Ok
+from app.shared.response_cache import ResponseCacheStats
+
+
+router = APIRouter(prefix="/api/diagnostics", tags=["Diagnostics"])
+
+
+def _DbPoolStats(request: Request) -> dict:
+    engines: DbEngines = getattr(request.app.state, "db_engines", None) or GetDbEngines()
+    return {
+        "sync": PoolStats(engines.Engine),
+        "async": PoolStats(engines.AsyncEngine),
+        "replicas": [PoolStats(e) for e in engines.ReplicaEngines],
+    }
+
+
+@router.get("/db-pool")
+async def GetDbPool(request: Request, principal: UserPrincipal = Depends(RequireRoles("Admin"))):
+    """
+    GET /api/diagnostics/db-pool
+
+    Summary:
+    - Trạng thái connection pool: size, checked_out (in use), overflow, checkout latency, số lần timeout.
+
+    Authorization:
+    - Role bắt buộc: Admin
+    """
+    return Ok(_DbPoolStats(request))
+
+
+@router.get("")
+async def GetDiagnostics(request: Request, principal: UserPrincipal = Depends(RequireRoles("Admin"))):
+    """
+    GET /api/diagnostics
+
+    Summary:
+    - Tổng hợp: DB pool, cache quyền (PermissionResolver), response cache (hit/miss theo namespace),
+      executor hash password.
+
+    Authorization:
+    - Role bắt buộc: Admin
+    """
+    return Ok(
+        {
+            "db_pool": _DbPoolStats(request),
+            "permission_cache": PermissionResolver.CacheStats(),
+            "response_cache": ResponseCacheStats(),
+            "password_hasher": PasswordHasherStats(),
+        }
+    )
@@ -0,0 +1,43 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+
+from app.config.settings import get_settings
+from app.infrastructure.monitoring.metrics import RenderMetrics
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _RequireMetricsToken(request: Request) -> None:
+    """METRICS_TOKEN khác rỗng => bắt buộc header `Authorization: Bearer <METRICS_TOKEN>`."""
+    settings = getattr(request.app.state, "settings", None) or get_settings()
+    expected = settings.METRICS_TOKEN
+    if not expected:
+        return
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip().encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", include_in_schema=False)
+async def GetMetrics(request: Request):
+    """
+    GET /metrics
+
+    Summary:
+    - Metrics định dạng Prometheus text (gộp mọi worker khi có PROMETHEUS_MULTIPROC_DIR).
+
+    Authorization:
+    - Chỉ đăng ký khi METRICS_ENABLED=true (mặc định tắt).
+    - METRICS_TOKEN khác rỗng: yêu cầu `Authorization: Bearer <token>` (Prometheus `authorization.credentials`).
+    - METRICS_TOKEN rỗng: không yêu cầu token, phải chặn ở network/ingress.
+    """
+    _RequireMetricsToken(request)
+    content, content_type = RenderMetrics()
+    return Response(content=content, media_type=content_type)
@@ -1,47 +1,43 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.application.dtos.PermissionDto import PermissionDto
 from app.application.dtos.PermissionCreateDto import PermissionCreateDto
 from app.application.services.interfaces.IPermissionService import IPermissionService
 from app.application.services.PermissionService import PermissionService
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.db.DbContext import DbContext
-from app.infrastructure.repositories.UnitOfWork import UnitOfWork
 from app.infrastructure.auth.Authorization import RequireRoles, UserPrincipal
+from app.infrastructure.auth.Dependencies import GetUnitOfWork
 from app.shared.api_responses import Ok, NotFound, Created
+from app.shared.conditional_get import ConditionalGet
+from app.shared.export_helper import ExportFormat, StreamExport
+from app.shared.response_cache import CachedResponse
 
 
 router = APIRouter(prefix="/api/permissions", tags=["Permissions"])
 
 
-def GetDbContext():
-    db = DbContext()
-    try:
-        yield db
-    finally:
-        db.Dispose()
-
-
-def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
-    return UnitOfWork(db)
-
-
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IPermissionService:
     return PermissionService(uow)
 
 
 @router.get("")
+@ConditionalGet("permissions")
+@CachedResponse("permissions")
 async def GetPermissions(
+    format: ExportFormat = Query("json", description="json | ndjson | csv (ndjson/csv trả về dạng stream)"),
     service: IPermissionService = Depends(GetService),
     principal: UserPrincipal = Depends(RequireRoles("Admin")),
 ):
-    """GET /api/permissions - lấy tất cả permission (yêu cầu role Admin)."""
+    """GET /api/permissions - lấy tất cả permission (yêu cầu role Admin), `?format=ndjson|csv` để stream."""
+    if format != "json":
+        return StreamExport(service.StreamAll(), format, PermissionDto, "permissions")
     items: List[PermissionDto] = await service.GetAll()
     return Ok(items)
 
 
 @router.get("/{id}")
+@ConditionalGet("permissions", id_param="id")
 async def GetPermissionById(
     id: int,
     service: IPermissionService = Depends(GetService),
@@ -1,41 +1,33 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 
 from app.application.dtos.ProductDto import ProductDto
 from app.application.dtos.ProductCreateDto import ProductCreateDto
 from app.application.services.interfaces.IProductService import IProductService
 from app.application.services.ProductService import ProductService
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.db.DbContext import DbContext
-from app.infrastructure.repositories.UnitOfWork import UnitOfWork
 from app.infrastructure.auth.Authorization import RequireRoles, RequirePermissions, UserPrincipal
-from app.shared.api_responses import Ok, NotFound, Created
+from app.infrastructure.auth.Dependencies import GetUnitOfWork
+from app.shared.api_responses import Ok, NotFound, Created, BadRequest
+from app.shared.conditional_get import ConditionalGet
+from app.shared.export_helper import ExportFormat, StreamExport
+from app.shared.response_cache import CachedResponse
+from app.shared.ndjson_helper import ReadJsonRecords
 
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
 
-def GetDbContext():
-    """Factory DbContext cho mỗi request (giống AddDbContext)."""
-    db = DbContext()
-    try:
-        yield db
-    finally:
-        db.Dispose()
-
-
-def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
-    """Resolve IUnitOfWork dùng DbContext."""
-    return UnitOfWork(db)
-
-
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IProductService:
     """Resolve IProductService từ UnitOfWork."""
     return ProductService(uow)
 
 
 @router.get("")
+@ConditionalGet("products")
+@CachedResponse("products")
 async def GetProducts(
+    format: ExportFormat = Query("json", description="json | ndjson | csv (ndjson/csv trả về dạng stream)"),
     service: IProductService = Depends(GetService),
     principal: UserPrincipal = Depends(RequireRoles("Admin")),
 ):
@@ -44,16 +36,20 @@ async def GetProducts(
 
     Summary:
     - Lấy tất cả sản phẩm.
+    - `?format=ndjson|csv`: stream từng dòng từ DB cursor (không load cả bảng vào bộ nhớ).
 
     Authorization:
     - Role bắt buộc: Admin (RequireRoles("Admin"))
     - Permission có thể được check mềm trong business nếu cần.
     """
+    if format != "json":
+        return StreamExport(service.StreamAll(), format, ProductDto, "products")
     items = await service.GetAll()
     return Ok(items)
 
 
 @router.get("/{id}")
+@ConditionalGet("products", id_param="id")
 async def GetProductById(
     id: int,
     service: IProductService = Depends(GetService),
@@ -98,6 +94,46 @@ async def CreateProduct(
     return Created(location, created)
 
 
+@router.post(
+    "/bulk",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/ProductCreateDto"}}
+                },
+                "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/ProductCreateDto"}},
+            },
+        }
+    },
+)
+async def BulkCreateProducts(
+    request: Request,
+    service: IProductService = Depends(GetService),
+    principal: UserPrincipal = Depends(RequirePermissions("Products.Write", enforce=True)),
+):
+    """
+    POST /api/products/bulk
+
+    Summary:
+    - Import nhiều sản phẩm: JSON array hoặc NDJSON (Content-Type: application/x-ndjson, đọc theo stream).
+    - Validate + insert theo chunk (BULK_IMPORT_CHUNK_SIZE), mỗi chunk 1 transaction.
+
+    Authorization:
+    - Permission bắt buộc: Products.Write
+
+    Returns:
+    - 200: ApiResponse[BulkImportResultDto] (total, inserted, failed, errors theo index dòng)
+    - 400: body không phải JSON array / NDJSON
+    """
+    try:
+        result = await service.BulkCreate(ReadJsonRecords(request.headers.get("content-type"), request.stream()))
+    except ValueError as ex:
+        return BadRequest(str(ex))
+    return Ok(result)
+
+
 @router.put("/{id}")
 async def UpdateProduct(
     id: int,
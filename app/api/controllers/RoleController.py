@@ -1,47 +1,43 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.application.dtos.RoleDto import RoleDto
 from app.application.dtos.RoleCreateDto import RoleCreateDto
 from app.application.services.interfaces.IRoleService import IRoleService
 from app.application.services.RoleService import RoleService
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.db.DbContext import DbContext
-from app.infrastructure.repositories.UnitOfWork import UnitOfWork
 from app.infrastructure.auth.Authorization import RequireRoles, UserPrincipal
+from app.infrastructure.auth.Dependencies import GetUnitOfWork
 from app.shared.api_responses import Ok, NotFound, Created
+from app.shared.conditional_get import ConditionalGet
+from app.shared.export_helper import ExportFormat, StreamExport
+from app.shared.response_cache import CachedResponse
 
 
 router = APIRouter(prefix="/api/roles", tags=["Roles"])
 
 
-def GetDbContext():
-    db = DbContext()
-    try:
-        yield db
-    finally:
-        db.Dispose()
-
-
-def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
-    return UnitOfWork(db)
-
-
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IRoleService:
     return RoleService(uow)
 
 
 @router.get("")
+@ConditionalGet("roles")
+@CachedResponse("roles")
 async def GetRoles(
+    format: ExportFormat = Query("json", description="json | ndjson | csv (ndjson/csv trả về dạng stream)"),
     service: IRoleService = Depends(GetService),
     principal: UserPrincipal = Depends(RequireRoles("Admin")),
 ):
-    """GET /api/roles - lấy tất cả role (yêu cầu role Admin)."""
+    """GET /api/roles - lấy tất cả role (yêu cầu role Admin), `?format=ndjson|csv` để stream."""
+    if format != "json":
+        return StreamExport(service.StreamAll(), format, RoleDto, "roles")
     items: List[RoleDto] = await service.GetAll()
     return Ok(items)
 
 
 @router.get("/{id}")
+@ConditionalGet("roles", id_param="id")
 async def GetRoleById(
     id: int,
     service: IRoleService = Depends(GetService),
@@ -6,29 +6,13 @@ from app.application.dtos.UserCreateDto import UserCreateDto
 from app.application.services.UserService import UserService
 from app.application.services.interfaces.IUserService import IUserService
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.db.DbContext import DbContext
-from app.infrastructure.repositories.UnitOfWork import UnitOfWork
-from app.infrastructure.auth.Dependencies import GetCurrentUser
+from app.infrastructure.auth.Dependencies import GetCurrentUser, GetUnitOfWork
 from app.shared.api_responses import Ok, NotFound, Created, BadRequest
 
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
-def GetDbContext():
-    """Factory DbContext cho mỗi request (giống AddDbContext)."""
-    db = DbContext()
-    try:
-        yield db
-    finally:
-        db.Dispose()
-
-
-def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
-    """Resolve IUnitOfWork dùng DbContext."""
-    return UnitOfWork(db)
-
-
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IUserService:
     """Resolve IUserService từ UnitOfWork."""
     return UserService(uow)
@@ -45,6 +29,9 @@ async def GetUsers(
     sortDir: str = "asc",
     search: Optional[str] = None,
     isActive: Optional[bool] = None,
+    useCursor: bool = False,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True,
     service: IUserService = Depends(GetService),
     current_user: UserDto = Depends(GetCurrentUser),
 ):
@@ -59,10 +46,34 @@ async def GetUsers(
     - sortBy, sortDir: sắp xếp
     - search: tìm kiếm theo user_name, email, full_name
     - isActive: filter theo trạng thái hoạt động
+    - useCursor / cursor: keyset pagination (trang đầu: useCursor=true, trang sau: cursor=meta.next_cursor)
+    - includeTotal: false để bỏ qua COUNT (chỉ áp dụng cho cursor mode)
 
     Returns:
     - ApiResponse[List[UserDto]] với meta = thông tin phân trang
     """
+    if useCursor or cursor:
+        try:
+            cursor_paged = await service.GetPagedByCursor(
+                cursor=cursor,
+                page_size=pageSize,
+                sort_by=sortBy,
+                sort_dir=sortDir,
+                search=search,
+                is_active=isActive,
+                include_total=includeTotal,
+            )
+        except ValueError as ex:
+            return BadRequest(str(ex))
+        cursor_meta = {
+            "page_size": cursor_paged.page_size,
+            "next_cursor": cursor_paged.next_cursor,
+            "has_more": cursor_paged.has_more,
+        }
+        if cursor_paged.total is not None:
+            cursor_meta["total"] = cursor_paged.total
+        return Ok(cursor_paged.items, meta=cursor_meta)
+
     paged = await service.GetPaged(
         page=page,
         page_size=pageSize,
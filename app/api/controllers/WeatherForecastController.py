@@ -1,53 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 
 from app.application.dtos.WeatherForecastDto import WeatherForecastDto
 from app.application.dtos.WeatherForecastCreateDto import WeatherForecastCreateDto
 from app.application.services.WeatherForecastService import WeatherForecastService
 from app.application.services.interfaces.IWeatherForecastService import IWeatherForecastService
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.db.DbContext import DbContext
-from app.infrastructure.repositories.UnitOfWork import UnitOfWork
-from app.shared.api_responses import Ok, NotFound, Created
+from app.infrastructure.auth.Dependencies import GetUnitOfWork
+from app.shared.api_responses import Ok, NotFound, Created, BadRequest
+from app.shared.conditional_get import ConditionalGet
+from app.shared.export_helper import ExportFormat, StreamExport
+from app.shared.response_cache import CachedResponse
+from app.shared.ndjson_helper import ReadJsonRecords
 
 
 router = APIRouter(prefix="/api/weather-forecasts", tags=["WeatherForecasts"])
 
 
-def GetDbContext():
-    """Factory DbContext cho mỗi request (giống AddDbContext trong ASP.NET Core)."""
-    db = DbContext()
-    try:
-        yield db
-    finally:
-        db.Dispose()
-
-
-def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
-    """Resolve IUnitOfWork thông qua DbContext (pattern UnitOfWork)."""
-    return UnitOfWork(db)
-
-
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IWeatherForecastService:
     """Resolve IWeatherForecastService từ IUnitOfWork (giống DI container)."""
     return WeatherForecastService(uow)
 
 
 @router.get("")
-async def GetAll(service: IWeatherForecastService = Depends(GetService)):
+@ConditionalGet("weather-forecasts")
+@CachedResponse("weather-forecasts")
+async def GetAll(
+    format: ExportFormat = Query("json", description="json | ndjson | csv (ndjson/csv trả về dạng stream)"),
+    service: IWeatherForecastService = Depends(GetService),
+):
     """
     GET /api/weather-forecasts
 
     Summary:
     - Lấy danh sách tất cả WeatherForecast.
+    - `?format=ndjson|csv`: stream từng dòng từ DB cursor (không load cả bảng vào bộ nhớ).
 
     Returns:
     - ApiResponse[List[WeatherForecastDto]]
+    - ndjson: application/x-ndjson, csv: text/csv (file đính kèm)
     """
+    if format != "json":
+        return StreamExport(service.StreamAll(), format, WeatherForecastDto, "weather-forecasts")
     result = await service.GetAll()
     return Ok(result)
 
 
 @router.get("/{id}")
+@ConditionalGet("weather-forecasts", id_param="id")
 async def GetById(id: int, service: IWeatherForecastService = Depends(GetService)):
     """
     GET /api/weather-forecasts/{id}
@@ -85,6 +84,39 @@ async def Create(dto: WeatherForecastCreateDto, service: IWeatherForecastService
     return Created(location, created)
 
 
+@router.post(
+    "/bulk",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/WeatherForecastCreateDto"}}
+                },
+                "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/WeatherForecastCreateDto"}},
+            },
+        }
+    },
+)
+async def BulkCreate(request: Request, service: IWeatherForecastService = Depends(GetService)):
+    """
+    POST /api/weather-forecasts/bulk
+
+    Summary:
+    - Import nhiều WeatherForecast: JSON array hoặc NDJSON (Content-Type: application/x-ndjson).
+    - Validate + insert theo chunk (BULK_IMPORT_CHUNK_SIZE), mỗi chunk 1 transaction.
+
+    Returns:
+    - 200: ApiResponse[BulkImportResultDto]
+    - 400: body không phải JSON array / NDJSON
+    """
+    try:
+        result = await service.BulkCreate(ReadJsonRecords(request.headers.get("content-type"), request.stream()))
+    except ValueError as ex:
+        return BadRequest(str(ex))
+    return Ok(result)
+
+
 @router.put("/{id}")
 async def Update(id: int, dto: WeatherForecastDto, service: IWeatherForecastService = Depends(GetService)):
     """
@@ -0,0 +1,75 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import Settings, get_settings
+from app.infrastructure.db.query_profiler import StartProfile, StopProfile
+from app.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueryProfilerMiddleware:
+    """
+    Đo query DB của từng request (ASGI thuần, không bọc Request/Response).
+
+    - Bật cho mọi request bằng QUERY_PROFILER_ENABLED, hoặc từng request bằng header
+      QUERY_PROFILER_HEADER (khi QUERY_PROFILER_ALLOW_HEADER=true).
+    - Trả về header `Server-Timing: db;dur=<ms>;desc="<n> queries"` và `X-Query-Count`.
+    - Log warning khi vượt QUERY_BUDGET_PER_REQUEST hoặc 1 câu lệnh lặp >= QUERY_REPEAT_THRESHOLD lần (N+1).
+
+    Header được gắn lúc response start, nên query chạy trong lúc stream body (export) không được tính.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings | None = None):
+        self.app = app
+        settings = settings or get_settings()
+        self._enabled = settings.QUERY_PROFILER_ENABLED
+        self._header = settings.QUERY_PROFILER_HEADER.lower().encode("latin-1") if settings.QUERY_PROFILER_ALLOW_HEADER else None
+        self._budget = settings.QUERY_BUDGET_PER_REQUEST
+        self._repeat_threshold = settings.QUERY_REPEAT_THRESHOLD
+
+    def _ShouldProfile(self, scope: Scope) -> bool:
+        if self._enabled:
+            return True
+        if self._header is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == self._header:
+                return value.strip().lower() not in (b"", b"0", b"false")
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._ShouldProfile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = StartProfile()
+
+        async def SendWithTiming(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={profile.TotalMs};desc="{profile.Count} queries"')
+                headers.append("X-Query-Count", str(profile.Count))
+                self._Report(scope, profile)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, SendWithTiming)
+        finally:
+            StopProfile(token)
+
+    def _Report(self, scope: Scope, profile) -> None:
+        route = scope.get("route")
+        path = getattr(route, "path", None) or scope.get("path", "")
+        endpoint = f"{scope.get('method', '')} {path}"
+
+        if 0 < self._budget < profile.Count:
+            logger.warning(
+                "Query budget exceeded: %s ran %s queries (budget %s, %.2f ms)",
+                endpoint,
+                profile.Count,
+                self._budget,
+                profile.TotalMs,
+            )
+        for shape, count in profile.RepeatedShapes(self._repeat_threshold):
+            logger.warning("Possible N+1 in %s: statement ran %s times: %s", endpoint, count, shape[:300])
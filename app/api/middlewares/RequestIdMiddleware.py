@@ -0,0 +1,49 @@
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import Settings, get_settings
+from app.shared.logging_config import request_id_var
+
+# Chỉ nhận request id từ client nếu ngắn và an toàn để ghi vào log
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Gắn request id cho mỗi request (ASGI thuần):
+
+    - Lấy từ header REQUEST_ID_HEADER nếu hợp lệ (để nối log với gateway / service gọi tới), không thì sinh mới.
+    - Lưu vào contextvar => mọi log record trong request có request_id.
+    - Trả lại trong response header.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings | None = None):
+        self.app = app
+        self._header_name = (settings or get_settings()).REQUEST_ID_HEADER
+        self._header_key = self._header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self._header_key:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+        request_id_var.set(request_id)
+
+        async def SendWithRequestId(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self._header_name] = request_id
+            await send(message)
+
+        await self.app(scope, receive, SendWithRequestId)
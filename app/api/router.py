@@ -6,6 +6,9 @@ from app.api.controllers import UserController
 from app.api.controllers import ProductController
 from app.api.controllers import RoleController
 from app.api.controllers import PermissionController
+from app.api.controllers import DiagnosticsController
+from app.api.controllers import MetricsController
+from app.config.settings import get_settings
 
 
 def RegisterRoutes(app: FastAPI) -> None:
@@ -22,3 +25,7 @@ def RegisterRoutes(app: FastAPI) -> None:
     app.include_router(ProductController.router)
     app.include_router(RoleController.router)
     app.include_router(PermissionController.router)
+    app.include_router(DiagnosticsController.router)
+    settings = getattr(app.state, "settings", None) or get_settings()
+    if settings.METRICS_ENABLED:
+        app.include_router(MetricsController.router)
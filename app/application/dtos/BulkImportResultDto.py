@@ -0,0 +1,14 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+class BulkImportErrorDto(BaseModel):
+    index: int
+    errors: Dict[str, List[str]]
+
+
+class BulkImportResultDto(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkImportErrorDto] = []
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class RefreshTokenPurgeResultDto(BaseModel):
+    purged: int = 0
+    batches: int = 0
+    elapsed_ms: float = 0
@@ -1,19 +1,23 @@
 from datetime import datetime, timedelta
+import asyncio
 import secrets
+import time
 
 from fastapi import HTTPException, status
 
 from app.application.services.interfaces.IAuthService import IAuthService
 from app.application.dtos.LoginRequestDto import LoginRequestDto
+from app.application.dtos.RefreshTokenPurgeResultDto import RefreshTokenPurgeResultDto
 from app.application.dtos.TokenResponseDto import TokenResponseDto
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
-from app.infrastructure.auth.PasswordHasher import VerifyPassword
+from app.infrastructure.auth.PasswordHasher import VerifyPasswordAsync
+from app.infrastructure.auth.RefreshTokenHasher import HashRefreshToken
 from app.infrastructure.auth.JwtSettings import CreateAccessToken
 from app.domain.entities.RefreshToken import RefreshToken
+from app.domain.entities.Role import Role
+from app.domain.entities.User import User
 from app.config.settings import get_settings
 
-_settings = get_settings()
-
 
 class AuthService(IAuthService):
     def __init__(self, unit_of_work: IUnitOfWork):
@@ -22,7 +26,7 @@ class AuthService(IAuthService):
     async def Login(self, request: LoginRequestDto) -> TokenResponseDto:
         user = await self._unit_of_work.Users.GetByUserName(request.user_name)
 
-        if user is None or not VerifyPassword(request.password, user.password_hash):
+        if user is None or not await VerifyPasswordAsync(request.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password",
@@ -30,30 +34,41 @@ class AuthService(IAuthService):
             )
 
         role_entities = await self._unit_of_work.Roles.GetRolesByUser(user.id)
-        roles = [role.name for role in role_entities]
+        access_token = self._CreateAccessToken(user, role_entities)
 
-        access_token = CreateAccessToken(
+        refresh_token_str: str | None = None
+        if get_settings().ENABLE_REFRESH_TOKEN:
+            refresh_token_str = await self._IssueRefreshToken(user.id)
+
+        return TokenResponseDto(access_token=access_token, refresh_token=refresh_token_str)
+
+    @staticmethod
+    def _CreateAccessToken(user: User, role_entities: list[Role]) -> str:
+        """
+        Tạo access token kèm đủ claims để dựng principal mà không cần query DB
+        (AUTH_CLAIMS_PRINCIPAL=true): thông tin user, roles (name + id) và claims version "cv" (users.claims_version).
+        """
+        return CreateAccessToken(
             {
                 "sub": str(user.id),
                 "username": user.user_name,
-                "roles": roles,
+                "roles": [role.name for role in role_entities],
+                "role_ids": [role.id for role in role_entities],
+                "email": user.email,
+                "full_name": user.full_name,
+                "is_active": user.is_active,
+                "cv": user.claims_version,
             }
         )
 
-        refresh_token_str: str | None = None
-        if _settings.ENABLE_REFRESH_TOKEN:
-            refresh_token_str = await self._IssueRefreshToken(user.id)
-
-        return TokenResponseDto(access_token=access_token, refresh_token=refresh_token_str)
-
     async def _IssueRefreshToken(self, user_id: int) -> str:
         token = secrets.token_urlsafe(64)
-        expires = datetime.utcnow() + timedelta(days=_settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expires = datetime.utcnow() + timedelta(days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS)
 
         entity = RefreshToken(
             id=None,
             user_id=user_id,
-            token=token,
+            token_hash=HashRefreshToken(token),
             expires_at=expires,
         )
         await self._unit_of_work.RefreshTokens.Add(entity)
@@ -61,13 +76,13 @@ class AuthService(IAuthService):
         return token
 
     async def Refresh(self, refresh_token: str) -> TokenResponseDto:
-        if not _settings.ENABLE_REFRESH_TOKEN:
+        if not get_settings().ENABLE_REFRESH_TOKEN:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Refresh token is disabled by configuration",
             )
 
-        existing = await self._unit_of_work.RefreshTokens.GetByToken(refresh_token)
+        existing = await self._unit_of_work.RefreshTokens.GetByTokenHash(HashRefreshToken(refresh_token))
         if existing is None or existing.is_revoked or existing.expires_at <= datetime.utcnow():
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,27 +97,41 @@ class AuthService(IAuthService):
             )
 
         role_entities = await self._unit_of_work.Roles.GetRolesByUser(user.id)
-        roles = [role.name for role in role_entities]
-
-        access_token = CreateAccessToken(
-            {
-                "sub": str(user.id),
-                "username": user.user_name,
-                "roles": roles,
-            }
-        )
+        access_token = self._CreateAccessToken(user, role_entities)
 
         # Optionally: rotate refresh token
         new_refresh_token = await self._IssueRefreshToken(user.id)
         existing.is_revoked = True
+        existing.replaced_by_token_hash = HashRefreshToken(new_refresh_token)
         await self._unit_of_work.RefreshTokens.Revoke(existing)
         await self._unit_of_work.SaveChanges()
 
         return TokenResponseDto(access_token=access_token, refresh_token=new_refresh_token)
 
     async def RevokeRefreshToken(self, refresh_token: str) -> None:
-        existing = await self._unit_of_work.RefreshTokens.GetByToken(refresh_token)
+        existing = await self._unit_of_work.RefreshTokens.GetByTokenHash(HashRefreshToken(refresh_token))
         if existing is None:
             return
         await self._unit_of_work.RefreshTokens.Revoke(existing)
         await self._unit_of_work.SaveChanges()
+
+    async def PurgeRefreshTokens(self, retention_days: int, batch_size: int) -> RefreshTokenPurgeResultDto:
+        """
+        Xoá refresh token hết hạn / đã revoke quá retention_days ngày.
+        Mỗi batch 1 transaction ngắn, nhường event loop giữa các batch.
+        """
+        started = time.perf_counter()
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        result = RefreshTokenPurgeResultDto()
+        while True:
+            deleted = await self._unit_of_work.RefreshTokens.DeleteExpiredBatch(cutoff, batch_size)
+            await self._unit_of_work.SaveChanges()
+            if deleted <= 0:
+                break
+            result.purged += deleted
+            result.batches += 1
+            if deleted < batch_size:
+                break
+            await asyncio.sleep(0)
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        return result
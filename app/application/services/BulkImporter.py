@@ -0,0 +1,91 @@
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.application.dtos.BulkImportResultDto import BulkImportErrorDto, BulkImportResultDto
+from app.config.settings import get_settings
+from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class BulkImporter:
+    """
+    Import nhiều record theo chunk:
+
+    - Validate từng record bằng create DTO, record lỗi được ghi vào report (không dừng cả lô).
+    - Record hợp lệ được map sang entity và insert theo chunk bằng `add_range` (executemany),
+      mỗi chunk commit trong 1 transaction; chunk insert lỗi thì rollback và đánh dấu lỗi cho cả chunk.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: IUnitOfWork,
+        dto_type: Type[BaseModel],
+        entity_type: Type[Any],
+        add_range: Callable[[List[Any]], Awaitable[None]],
+        chunk_size: int | None = None,
+        max_errors: int | None = None,
+    ):
+        settings = get_settings()
+        self._unit_of_work = unit_of_work
+        self._dto_type = dto_type
+        self._entity_type = entity_type
+        self._add_range = add_range
+        self._chunk_size = max(1, chunk_size or settings.BULK_IMPORT_CHUNK_SIZE)
+        self._max_errors = settings.BULK_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self._result = BulkImportResultDto()
+
+    async def Run(self, records: AsyncIterable[Tuple[int, Any]]) -> BulkImportResultDto:
+        indexes: List[int] = []
+        entities: List[Any] = []
+
+        async for index, record in records:
+            self._result.total += 1
+            if isinstance(record, ValueError):
+                self._AddError(index, {"": [str(record)]})
+                continue
+            try:
+                dto = self._dto_type.model_validate(record)
+            except ValidationError as ex:
+                self._AddError(index, self._ToModelState(ex))
+                continue
+
+            indexes.append(index)
+            entities.append(MapperInstance.Map(dto, self._entity_type))
+            if len(entities) >= self._chunk_size:
+                await self._FlushChunk(indexes, entities)
+                indexes, entities = [], []
+
+        if entities:
+            await self._FlushChunk(indexes, entities)
+        return self._result
+
+    async def _FlushChunk(self, indexes: List[int], entities: List[Any]) -> None:
+        try:
+            await self._add_range(entities)
+            await self._unit_of_work.SaveChanges()
+        except Exception as ex:
+            await self._unit_of_work.Rollback()
+            logger.warning("Bulk import chunk failed (%s rows): %s", len(entities), ex)
+            message = f"Insert failed: {type(ex).__name__}"
+            for index in indexes:
+                self._AddError(index, {"": [message]})
+            return
+        self._result.inserted += len(entities)
+
+    def _AddError(self, index: int, errors: Dict[str, List[str]]) -> None:
+        self._result.failed += 1
+        if len(self._result.errors) < self._max_errors:
+            self._result.errors.append(BulkImportErrorDto(index=index, errors=errors))
+
+    @staticmethod
+    def _ToModelState(ex: ValidationError) -> Dict[str, List[str]]:
+        """Chuẩn hoá lỗi validate giống ModelState (cùng format với validation_exception_handler)."""
+        errors: Dict[str, List[str]] = {}
+        for err in ex.errors(include_url=False, include_context=False, include_input=False):
+            field = ".".join(str(x) for x in err.get("loc", ()))
+            errors.setdefault(field, []).append(err.get("msg", ""))
+        return errors
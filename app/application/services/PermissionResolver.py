@@ -0,0 +1,68 @@
+from dataclasses import asdict
+from typing import List
+
+import orjson
+
+from app.application.services.interfaces.IPermissionResolver import IPermissionResolver
+from app.config.settings import get_settings
+from app.domain.entities.UserAccess import UserAccess
+from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.shared.cache import ICache, MemoryCache
+
+# Cache dùng chung cho cả process (key = user_id); lifespan thay bằng cache theo CACHE_BACKEND (ConfigureCache)
+_access_cache: ICache = MemoryCache(
+    max_entries=get_settings().PERMISSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=get_settings().PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+class PermissionResolver(IPermissionResolver):
+    """
+    Tính roles + permission hiệu lực của user.
+
+    Convention:
+    - Cache miss: một query join UserRoles -> Roles -> RolePermissions -> Permissions.
+    - Cache hit: không query DB (TTL + LRU, cấu hình qua PERMISSION_CACHE_*; backend theo CACHE_BACKEND).
+    - Mọi thao tác ghi ảnh hưởng tới quyền (RoleService, PermissionService, gán role cho user)
+      phải await InvalidateUser / InvalidateAll sau khi SaveChanges.
+    """
+
+    def __init__(self, unit_of_work: IUnitOfWork):
+        self._unit_of_work = unit_of_work
+
+    async def GetUserAccess(self, user_id: int) -> UserAccess:
+        cache = _access_cache
+        cached = await cache.Get(str(user_id))
+        if cached is not None:
+            return UserAccess(**orjson.loads(cached))
+
+        # Generation đổi trong lúc query (invalidate ở node này hoặc node khác) => không ghi kết quả cũ vào cache
+        generation = cache.Generation
+        access = await self._unit_of_work.Permissions.GetUserAccess(user_id)
+        if generation == cache.Generation:
+            await cache.Set(str(user_id), orjson.dumps(asdict(access)))
+        return access
+
+    async def GetPermissions(self, user_id: int) -> List[str]:
+        access = await self.GetUserAccess(user_id)
+        return access.permissions
+
+    @staticmethod
+    async def InvalidateUser(user_id: int) -> None:
+        """Xoá cache của một user (gán/bỏ role, xoá user...), trên mọi node."""
+        await _access_cache.Delete(str(user_id))
+
+    @staticmethod
+    async def InvalidateAll() -> None:
+        """Xoá toàn bộ cache (sửa/xoá role, sửa/xoá/gán permission cho role...), trên mọi node."""
+        await _access_cache.Invalidate()
+
+    @staticmethod
+    def ConfigureCache(cache: ICache) -> None:
+        """Dùng cache mới (AppCaches.Permissions); gọi khi app start."""
+        global _access_cache
+        _access_cache = cache
+
+    @staticmethod
+    def CacheStats() -> dict:
+        return _access_cache.Stats()
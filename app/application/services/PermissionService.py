@@ -1,10 +1,14 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from app.application.dtos.PermissionDto import PermissionDto
+from app.application.services.PermissionResolver import PermissionResolver
 from app.application.services.interfaces.IPermissionService import IPermissionService
 from app.domain.entities.Permission import Permission
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.domain.entities.EntityVersion import EntityVersion
+from app.config.settings import get_settings
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.response_cache import InvalidateResponseCache
 
 
 class PermissionService(IPermissionService):
@@ -15,7 +19,18 @@ class PermissionService(IPermissionService):
 
     async def GetAll(self) -> List[PermissionDto]:
         entities = await self._unit_of_work.Permissions.GetAll()
-        return [MapperInstance.Map(e, PermissionDto) for e in entities]
+        return MapperInstance.MapMany(entities, PermissionDto)
+
+    async def StreamAll(self) -> AsyncIterator[PermissionDto]:
+        batch_size = get_settings().EXPORT_STREAM_BATCH_SIZE
+        async for entity in self._unit_of_work.Permissions.StreamAll(batch_size):
+            yield MapperInstance.Map(entity, PermissionDto)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await self._unit_of_work.Permissions.GetVersion()
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await self._unit_of_work.Permissions.GetVersionById(id)
 
     async def GetById(self, id: int) -> PermissionDto | None:
         entity = await self._unit_of_work.Permissions.GetById(id)
@@ -25,6 +40,7 @@ class PermissionService(IPermissionService):
         entity = MapperInstance.Map(dto, Permission)
         created = await self._unit_of_work.Permissions.Add(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("permissions")
         return MapperInstance.Map(created, PermissionDto)
 
     async def Update(self, id: int, dto: PermissionDto) -> PermissionDto:
@@ -32,16 +48,22 @@ class PermissionService(IPermissionService):
         entity.id = id
         updated = await self._unit_of_work.Permissions.Update(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("permissions")
+        await PermissionResolver.InvalidateAll()
         return MapperInstance.Map(updated, PermissionDto)
 
     async def Delete(self, id: int) -> None:
         await self._unit_of_work.Permissions.Delete(id)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("permissions")
+        await PermissionResolver.InvalidateAll()
 
     async def AssignPermissionToRole(self, permission_id: int, role_id: int) -> None:
         await self._unit_of_work.Permissions.AssignPermissionToRole(permission_id=permission_id, role_id=role_id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateAll()
 
     async def RemovePermissionFromRole(self, permission_id: int, role_id: int) -> None:
         await self._unit_of_work.Permissions.RemovePermissionFromRole(permission_id=permission_id, role_id=role_id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateAll()
@@ -1,10 +1,16 @@
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
 
+from app.application.dtos.BulkImportResultDto import BulkImportResultDto
+from app.application.dtos.ProductCreateDto import ProductCreateDto
 from app.application.dtos.ProductDto import ProductDto
+from app.application.services.BulkImporter import BulkImporter
 from app.application.services.interfaces.IProductService import IProductService
 from app.domain.entities.Product import Product
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.domain.entities.EntityVersion import EntityVersion
+from app.config.settings import get_settings
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.response_cache import InvalidateResponseCache
 
 
 class ProductService(IProductService):
@@ -15,7 +21,18 @@ class ProductService(IProductService):
 
     async def GetAll(self) -> List[ProductDto]:
         entities = await self._unit_of_work.Products.GetAll()
-        return [MapperInstance.Map(e, ProductDto) for e in entities]
+        return MapperInstance.MapMany(entities, ProductDto)
+
+    async def StreamAll(self) -> AsyncIterator[ProductDto]:
+        batch_size = get_settings().EXPORT_STREAM_BATCH_SIZE
+        async for entity in self._unit_of_work.Products.StreamAll(batch_size):
+            yield MapperInstance.Map(entity, ProductDto)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await self._unit_of_work.Products.GetVersion()
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await self._unit_of_work.Products.GetVersionById(id)
 
     async def GetById(self, id: int) -> Optional[ProductDto]:
         entity = await self._unit_of_work.Products.GetById(id)
@@ -25,15 +42,24 @@ class ProductService(IProductService):
         entity = MapperInstance.Map(dto, Product)
         created = await self._unit_of_work.Products.Add(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("products")
         return MapperInstance.Map(created, ProductDto)
 
+    async def BulkCreate(self, records: AsyncIterable[Tuple[int, Any]]) -> BulkImportResultDto:
+        importer = BulkImporter(self._unit_of_work, ProductCreateDto, Product, self._unit_of_work.Products.AddRange)
+        result = await importer.Run(records)
+        await InvalidateResponseCache("products")
+        return result
+
     async def Update(self, id: int, dto: ProductDto) -> ProductDto:
         entity = MapperInstance.Map(dto, Product)
         entity.id = id
         updated = await self._unit_of_work.Products.Update(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("products")
         return MapperInstance.Map(updated, ProductDto)
 
     async def Delete(self, id: int) -> None:
         await self._unit_of_work.Products.Delete(id)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("products")
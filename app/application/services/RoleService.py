@@ -1,10 +1,14 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from app.application.dtos.RoleDto import RoleDto
+from app.application.services.PermissionResolver import PermissionResolver
 from app.application.services.interfaces.IRoleService import IRoleService
 from app.domain.entities.Role import Role
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.domain.entities.EntityVersion import EntityVersion
+from app.config.settings import get_settings
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.response_cache import InvalidateResponseCache
 
 
 class RoleService(IRoleService):
@@ -15,7 +19,18 @@ class RoleService(IRoleService):
 
     async def GetAll(self) -> List[RoleDto]:
         entities = await self._unit_of_work.Roles.GetAll()
-        return [MapperInstance.Map(e, RoleDto) for e in entities]
+        return MapperInstance.MapMany(entities, RoleDto)
+
+    async def StreamAll(self) -> AsyncIterator[RoleDto]:
+        batch_size = get_settings().EXPORT_STREAM_BATCH_SIZE
+        async for entity in self._unit_of_work.Roles.StreamAll(batch_size):
+            yield MapperInstance.Map(entity, RoleDto)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await self._unit_of_work.Roles.GetVersion()
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await self._unit_of_work.Roles.GetVersionById(id)
 
     async def GetById(self, id: int) -> RoleDto | None:
         entity = await self._unit_of_work.Roles.GetById(id)
@@ -25,23 +40,35 @@ class RoleService(IRoleService):
         entity = MapperInstance.Map(dto, Role)
         created = await self._unit_of_work.Roles.Add(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("roles")
         return MapperInstance.Map(created, RoleDto)
 
     async def Update(self, id: int, dto: RoleDto) -> RoleDto:
         entity = MapperInstance.Map(dto, Role)
         entity.id = id
         updated = await self._unit_of_work.Roles.Update(entity)
+        await self._unit_of_work.Users.RevokeClaimsByRole(id)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("roles")
+        await PermissionResolver.InvalidateAll()
         return MapperInstance.Map(updated, RoleDto)
 
     async def Delete(self, id: int) -> None:
+        # Revoke trước khi xoá: user_roles của role bị xoá theo (ON DELETE CASCADE)
+        await self._unit_of_work.Users.RevokeClaimsByRole(id)
         await self._unit_of_work.Roles.Delete(id)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("roles")
+        await PermissionResolver.InvalidateAll()
 
     async def AssignRoleToUser(self, role_id: int, user_id: int) -> None:
         await self._unit_of_work.Roles.AssignRoleToUser(user_id=user_id, role_id=role_id)
+        await self._unit_of_work.Users.RevokeClaims(user_id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateUser(user_id)
 
     async def RemoveRoleFromUser(self, role_id: int, user_id: int) -> None:
         await self._unit_of_work.Roles.RemoveRoleFromUser(user_id=user_id, role_id=role_id)
+        await self._unit_of_work.Users.RevokeClaims(user_id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateUser(user_id)
@@ -1,11 +1,12 @@
 from typing import List, Optional
+from app.application.services.PermissionResolver import PermissionResolver
 from app.application.services.interfaces.IUserService import IUserService
 from app.application.dtos.UserDto import UserDto
 from app.application.dtos.UserCreateDto import UserCreateDto
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
 from app.domain.entities.User import User
 from app.infrastructure.mapping.AutoMapper import MapperInstance
-from app.shared.pagination import PagedResult
+from app.shared.pagination import CursorPagedResult, PagedResult
 
 
 class UserService(IUserService):
@@ -24,7 +25,11 @@ class UserService(IUserService):
     async def GetAll(self) -> List[UserDto]:
         """Lấy tất cả user (ít dùng, chủ yếu dùng GetPaged)."""
         entities = await self._unit_of_work.Users.GetAll()
-        return [MapperInstance.Map(e, UserDto) for e in entities]
+        return MapperInstance.MapMany(entities, UserDto)
+
+    async def GetClaimsVersion(self, user_id: int) -> Optional[int]:
+        """claims_version hiện tại của user đang active (so với claim "cv" của access token)."""
+        return await self._unit_of_work.Users.GetClaimsVersion(user_id)
 
     async def GetById(self, id: int) -> Optional[UserDto]:
         """Lấy user theo Id, trả về None nếu không có."""
@@ -57,13 +62,45 @@ class UserService(IUserService):
             search=search,
             is_active=is_active,
         )
-        dto_items = [MapperInstance.Map(e, UserDto) for e in items]
-        dto_items = [await self._AttachRoles(dto) for dto in dto_items]
+        dto_items = MapperInstance.MapMany(items, UserDto)
+        dto_items = await self._AttachRolesMany(dto_items)
         return PagedResult(dto_items, total, page, page_size)
 
+    async def GetPagedByCursor(
+        self,
+        cursor: str | None,
+        page_size: int,
+        sort_by: str | None,
+        sort_dir: str,
+        search: str | None,
+        is_active: bool | None,
+        include_total: bool,
+    ) -> CursorPagedResult[UserDto]:
+        """
+        Lấy danh sách user theo keyset (cursor) pagination.
+
+        - Không dùng OFFSET nên trang sâu vẫn nhanh như trang đầu.
+        - include_total=False để bỏ qua câu COUNT.
+        - Raise ValueError nếu cursor không hợp lệ.
+        """
+        if page_size <= 0:
+            page_size = 10
+        items, next_cursor, total = await self._unit_of_work.Users.SearchByCursor(
+            cursor=cursor,
+            page_size=page_size,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            search=search,
+            is_active=is_active,
+            include_total=include_total,
+        )
+        dto_items = MapperInstance.MapMany(items, UserDto)
+        dto_items = await self._AttachRolesMany(dto_items)
+        return CursorPagedResult(dto_items, page_size, next_cursor, total)
+
     async def Create(self, dto: UserCreateDto) -> UserDto:
         """Tạo mới user từ DTO."""
-        from app.infrastructure.auth.PasswordHasher import HashPassword
+        from app.infrastructure.auth.PasswordHasher import HashPasswordAsync
 
         entity = User(
             id=None,
@@ -71,7 +108,7 @@ class UserService(IUserService):
             email=dto.email,
             full_name=dto.full_name,
             is_active=dto.is_active,
-            password_hash=HashPassword(dto.password),
+            password_hash=await HashPasswordAsync(dto.password),
         )
         created = await self._unit_of_work.Users.Add(entity)
 
@@ -85,6 +122,7 @@ class UserService(IUserService):
                 await self._unit_of_work.Roles.AssignRoleToUser(user_id=created.id, role_id=role.id)
 
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateUser(created.id)
         user_dto = MapperInstance.Map(created, UserDto)
         user_dto.roles = dto.roles or []
         return user_dto
@@ -102,6 +140,7 @@ class UserService(IUserService):
         """Xoá user theo Id."""
         await self._unit_of_work.Users.Delete(id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateUser(id)
 
     # -------- Current user helpers --------
 
@@ -119,13 +158,7 @@ class UserService(IUserService):
         Lấy danh sách permission name hiệu lực cho user
         (union tất cả permission của các role hiện tại).
         """
-        roles = await self._unit_of_work.Roles.GetRolesByUser(user_id)
-        perm_names: set[str] = set()
-        for r in roles:
-            perms = await self._unit_of_work.Permissions.GetPermissionsByRole(r.id)
-            for p in perms:
-                perm_names.add(p.name)
-        return sorted(perm_names)
+        return await PermissionResolver(self._unit_of_work).GetPermissions(user_id)
 
     async def UpdateCurrentUserRoles(self, user_id: int, role_ids: List[int]) -> UserDto:
         """
@@ -150,7 +183,9 @@ class UserService(IUserService):
         if entity is None:
             raise ValueError("User not found when updating own roles")
 
+        await self._unit_of_work.Users.RevokeClaims(user_id)
         await self._unit_of_work.SaveChanges()
+        await PermissionResolver.InvalidateUser(user_id)
 
         dto = MapperInstance.Map(entity, UserDto)
         dto.roles = [r.id for r in roles]
@@ -163,16 +198,16 @@ class UserService(IUserService):
         - Kiểm tra current_password khớp với password_hash hiện tại
         - Hash new_password và lưu vào DB
         """
-        from app.infrastructure.auth.PasswordHasher import VerifyPassword, HashPassword
+        from app.infrastructure.auth.PasswordHasher import VerifyPasswordAsync, HashPasswordAsync
 
         entity = await self._unit_of_work.Users.GetById(user_id)
         if entity is None:
             raise ValueError("User not found")
 
-        if not entity.password_hash or not VerifyPassword(current_password, entity.password_hash):
+        if not entity.password_hash or not await VerifyPasswordAsync(current_password, entity.password_hash):
             raise ValueError("Current password is incorrect")
 
-        entity.password_hash = HashPassword(new_password)
+        entity.password_hash = await HashPasswordAsync(new_password)
         await self._unit_of_work.Users.Update(entity)
         await self._unit_of_work.SaveChanges()
 
@@ -183,3 +218,12 @@ class UserService(IUserService):
         roles = await self._unit_of_work.Roles.GetRolesByUser(dto.id)
         dto.roles = [r.id for r in roles]
         return dto
+
+    async def _AttachRolesMany(self, dtos: List[UserDto]) -> List[UserDto]:
+        """Gán roles cho cả trang user bằng một query IN (tránh N+1 của _AttachRoles)."""
+        role_ids_by_user = await self._unit_of_work.Roles.GetRoleIdsByUsers(
+            [dto.id for dto in dtos if dto.id is not None]
+        )
+        for dto in dtos:
+            dto.roles = role_ids_by_user.get(dto.id, []) if dto.id is not None else []
+        return dtos
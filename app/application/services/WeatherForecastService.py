@@ -1,9 +1,15 @@
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
 from app.application.services.interfaces.IWeatherForecastService import IWeatherForecastService
+from app.application.dtos.BulkImportResultDto import BulkImportResultDto
+from app.application.dtos.WeatherForecastCreateDto import WeatherForecastCreateDto
 from app.application.dtos.WeatherForecastDto import WeatherForecastDto
+from app.application.services.BulkImporter import BulkImporter
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
 from app.domain.entities.WeatherForecast import WeatherForecast
+from app.domain.entities.EntityVersion import EntityVersion
+from app.config.settings import get_settings
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.response_cache import InvalidateResponseCache
 
 
 class WeatherForecastService(IWeatherForecastService):
@@ -22,7 +28,21 @@ class WeatherForecastService(IWeatherForecastService):
     async def GetAll(self) -> List[WeatherForecastDto]:
         """Lấy danh sách tất cả WeatherForecast dưới dạng DTO."""
         entities = await self._unit_of_work.WeatherForecasts.GetAll()
-        return [MapperInstance.Map(e, WeatherForecastDto) for e in entities]
+        return MapperInstance.MapMany(entities, WeatherForecastDto)
+
+    async def StreamAll(self) -> AsyncIterator[WeatherForecastDto]:
+        """Stream toàn bộ WeatherForecast theo batch từ DB cursor (dùng cho export NDJSON/CSV)."""
+        batch_size = get_settings().EXPORT_STREAM_BATCH_SIZE
+        async for entity in self._unit_of_work.WeatherForecasts.StreamAll(batch_size):
+            yield MapperInstance.Map(entity, WeatherForecastDto)
+
+    async def GetVersion(self) -> EntityVersion:
+        """Số dòng + mốc sửa gần nhất của bảng (ETag / Last-Modified cho GET list)."""
+        return await self._unit_of_work.WeatherForecasts.GetVersion()
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        """Mốc sửa gần nhất của 1 WeatherForecast (count = 0 nếu không tồn tại)."""
+        return await self._unit_of_work.WeatherForecasts.GetVersionById(id)
 
     async def GetById(self, id: int) -> Optional[WeatherForecastDto]:
         """Lấy WeatherForecast theo Id, trả về None nếu không tồn tại."""
@@ -34,17 +54,32 @@ class WeatherForecastService(IWeatherForecastService):
         entity = MapperInstance.Map(dto, WeatherForecast)
         created = await self._unit_of_work.WeatherForecasts.Add(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("weather-forecasts")
         return MapperInstance.Map(created, WeatherForecastDto)
 
+    async def BulkCreate(self, records: AsyncIterable[Tuple[int, Any]]) -> BulkImportResultDto:
+        """Import nhiều WeatherForecast (JSON array / NDJSON) theo chunk, trả về report từng dòng lỗi."""
+        importer = BulkImporter(
+            self._unit_of_work,
+            WeatherForecastCreateDto,
+            WeatherForecast,
+            self._unit_of_work.WeatherForecasts.AddRange,
+        )
+        result = await importer.Run(records)
+        await InvalidateResponseCache("weather-forecasts")
+        return result
+
     async def Update(self, id: int, dto: WeatherForecastDto) -> WeatherForecastDto:
         """Cập nhật WeatherForecast (Id lấy từ route, data từ DTO)."""
         entity = MapperInstance.Map(dto, WeatherForecast)
         entity.id = id
         updated = await self._unit_of_work.WeatherForecasts.Update(entity)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("weather-forecasts")
         return MapperInstance.Map(updated, WeatherForecastDto)
 
     async def Delete(self, id: int) -> None:
         """Xoá WeatherForecast theo Id."""
         await self._unit_of_work.WeatherForecasts.Delete(id)
         await self._unit_of_work.SaveChanges()
+        await InvalidateResponseCache("weather-forecasts")
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from app.application.dtos.LoginRequestDto import LoginRequestDto
+from app.application.dtos.RefreshTokenPurgeResultDto import RefreshTokenPurgeResultDto
 from app.application.dtos.TokenResponseDto import TokenResponseDto
 
 
@@ -15,3 +16,7 @@ class IAuthService(ABC):
     @abstractmethod
     async def RevokeRefreshToken(self, refresh_token: str) -> None:
         pass
+
+    @abstractmethod
+    async def PurgeRefreshTokens(self, retention_days: int, batch_size: int) -> RefreshTokenPurgeResultDto:
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.domain.entities.UserAccess import UserAccess
+
+
+class IPermissionResolver(ABC):
+    @abstractmethod
+    async def GetUserAccess(self, user_id: int) -> UserAccess:
+        pass
+
+    @abstractmethod
+    async def GetPermissions(self, user_id: int) -> List[str]:
+        pass
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List
 
 from app.application.dtos.PermissionDto import PermissionDto
+from app.domain.entities.EntityVersion import EntityVersion
 
 
 class IPermissionService(ABC):
@@ -9,6 +10,18 @@ class IPermissionService(ABC):
     async def GetAll(self) -> List[PermissionDto]:
         pass
 
+    @abstractmethod
+    def StreamAll(self) -> AsyncIterator[PermissionDto]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> PermissionDto | None:
         pass
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
 
+from app.application.dtos.BulkImportResultDto import BulkImportResultDto
 from app.application.dtos.ProductDto import ProductDto
+from app.domain.entities.EntityVersion import EntityVersion
 
 
 class IProductService(ABC):
@@ -9,6 +11,18 @@ class IProductService(ABC):
     async def GetAll(self) -> List[ProductDto]:
         pass
 
+    @abstractmethod
+    def StreamAll(self) -> AsyncIterator[ProductDto]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> Optional[ProductDto]:
         pass
@@ -17,6 +31,10 @@ class IProductService(ABC):
     async def Create(self, dto: ProductDto) -> ProductDto:
         pass
 
+    @abstractmethod
+    async def BulkCreate(self, records: AsyncIterable[Tuple[int, Any]]) -> BulkImportResultDto:
+        pass
+
     @abstractmethod
     async def Update(self, id: int, dto: ProductDto) -> ProductDto:
         pass
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List
 
 from app.application.dtos.RoleDto import RoleDto
+from app.domain.entities.EntityVersion import EntityVersion
 
 
 class IRoleService(ABC):
@@ -9,6 +10,18 @@ class IRoleService(ABC):
     async def GetAll(self) -> List[RoleDto]:
         pass
 
+    @abstractmethod
+    def StreamAll(self) -> AsyncIterator[RoleDto]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> RoleDto | None:
         pass
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Optional
 from app.application.dtos.UserDto import UserDto
 from app.application.dtos.UserCreateDto import UserCreateDto
-from app.shared.pagination import PagedResult
+from app.shared.pagination import CursorPagedResult, PagedResult
 
 
 class IUserService(ABC):
@@ -14,6 +14,10 @@ class IUserService(ABC):
     async def GetById(self, id: int) -> Optional[UserDto]:
         pass
 
+    @abstractmethod
+    async def GetClaimsVersion(self, user_id: int) -> Optional[int]:
+        pass
+
     @abstractmethod
     async def GetPaged(
         self,
@@ -26,6 +30,19 @@ class IUserService(ABC):
     ) -> PagedResult[UserDto]:
         pass
 
+    @abstractmethod
+    async def GetPagedByCursor(
+        self,
+        cursor: str | None,
+        page_size: int,
+        sort_by: str | None,
+        sort_dir: str,
+        search: str | None,
+        is_active: bool | None,
+        include_total: bool,
+    ) -> CursorPagedResult[UserDto]:
+        pass
+
     @abstractmethod
     async def Create(self, dto: UserCreateDto) -> UserDto:
         pass
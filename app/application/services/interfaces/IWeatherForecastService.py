@@ -1,16 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+from app.application.dtos.BulkImportResultDto import BulkImportResultDto
 from app.application.dtos.WeatherForecastDto import WeatherForecastDto
+from app.domain.entities.EntityVersion import EntityVersion
 
 
 class IWeatherForecastService(ABC):
     @abstractmethod
     async def GetAll(self) -> List[WeatherForecastDto]: ...
     @abstractmethod
+    def StreamAll(self) -> AsyncIterator[WeatherForecastDto]: ...
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion: ...
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion: ...
+    @abstractmethod
     async def GetById(self, id: int) -> Optional[WeatherForecastDto]: ...
     @abstractmethod
     async def Create(self, dto: WeatherForecastDto) -> WeatherForecastDto: ...
     @abstractmethod
+    async def BulkCreate(self, records: AsyncIterable[Tuple[int, Any]]) -> BulkImportResultDto: ...
+    @abstractmethod
     async def Update(self, id: int, dto: WeatherForecastDto) -> WeatherForecastDto: ...
     @abstractmethod
     async def Delete(self, id: int) -> None: ...
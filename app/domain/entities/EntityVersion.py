@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class EntityVersion:
+    """
+    Phiên bản dữ liệu cho ETag / Last-Modified.
+
+    - count + checksum (tổng row_version): đổi sau mọi insert / update / delete, kể cả nhiều lần trong cùng 1 giây.
+    - last_modified: mốc sửa gần nhất (coalesce(updated_at, created_at)).
+    - database_now: thời điểm hiện tại theo đồng hồ DB (cùng query), để biết giây của last_modified đã qua hẳn chưa.
+    """
+
+    count: int
+    checksum: int = 0
+    last_modified: datetime | None = None
+    database_now: datetime | None = None
@@ -5,9 +5,9 @@ from datetime import datetime
 @dataclass
 class RefreshToken:
     user_id: int
-    token: str
+    token_hash: bytes
     expires_at: datetime
     id: int | None = None
     revoked_at: datetime | None = None
-    replaced_by_token: str | None = None
+    replaced_by_token_hash: bytes | None = None
     is_revoked: bool = False
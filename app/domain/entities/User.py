@@ -9,3 +9,4 @@ class User:
     full_name: str | None = None
     is_active: bool = True
     password_hash: str | None = None
+    claims_version: int = 0
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class UserAccess:
+    """Quyền hiệu lực của một user: roles đang gán + union permission của các role đó."""
+
+    user_id: int
+    role_ids: List[int] = field(default_factory=list)
+    role_names: List[str] = field(default_factory=list)
+    permissions: List[str] = field(default_factory=list)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+from app.domain.entities.EntityVersion import EntityVersion
 from app.domain.entities.Permission import Permission
+from app.domain.entities.UserAccess import UserAccess
 
 
 class IPermissionRepository(ABC):
@@ -9,6 +11,18 @@ class IPermissionRepository(ABC):
     async def GetAll(self) -> List[Permission]:
         pass
 
+    @abstractmethod
+    def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Permission]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> Optional[Permission]:
         pass
@@ -40,3 +54,8 @@ class IPermissionRepository(ABC):
     @abstractmethod
     async def GetPermissionsByRole(self, role_id: int) -> List[Permission]:
         pass
+
+    @abstractmethod
+    async def GetUserAccess(self, user_id: int) -> UserAccess:
+        """Lấy roles + permission hiệu lực của user trong một query join duy nhất."""
+        pass
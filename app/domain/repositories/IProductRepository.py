@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+from app.domain.entities.EntityVersion import EntityVersion
 from app.domain.entities.Product import Product
 
 
@@ -9,6 +10,18 @@ class IProductRepository(ABC):
     async def GetAll(self) -> List[Product]:
         pass
 
+    @abstractmethod
+    def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Product]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> Optional[Product]:
         pass
@@ -17,6 +30,10 @@ class IProductRepository(ABC):
     async def Add(self, entity: Product) -> Product:
         pass
 
+    @abstractmethod
+    async def AddRange(self, entities: List[Product]) -> None:
+        pass
+
     @abstractmethod
     async def Update(self, entity: Product) -> Product:
         pass
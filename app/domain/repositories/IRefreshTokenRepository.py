@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, List
 from app.domain.entities.RefreshToken import RefreshToken
 
@@ -9,7 +10,7 @@ class IRefreshTokenRepository(ABC):
         pass
 
     @abstractmethod
-    async def GetByToken(self, token: str) -> Optional[RefreshToken]:
+    async def GetByTokenHash(self, token_hash: bytes) -> Optional[RefreshToken]:
         pass
 
     @abstractmethod
@@ -23,3 +24,7 @@ class IRefreshTokenRepository(ABC):
     @abstractmethod
     async def GetValidTokensForUser(self, user_id: int) -> List[RefreshToken]:
         pass
+
+    @abstractmethod
+    async def DeleteExpiredBatch(self, cutoff: datetime, batch_size: int) -> int:
+        pass
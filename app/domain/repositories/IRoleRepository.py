@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
+from app.domain.entities.EntityVersion import EntityVersion
 from app.domain.entities.Role import Role
 
 
@@ -9,6 +10,18 @@ class IRoleRepository(ABC):
     async def GetAll(self) -> List[Role]:
         pass
 
+    @abstractmethod
+    def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Role]:
+        pass
+
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion:
+        pass
+
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        pass
+
     @abstractmethod
     async def GetById(self, id: int) -> Optional[Role]:
         pass
@@ -55,3 +68,8 @@ class IRoleRepository(ABC):
     @abstractmethod
     async def GetRolesByUser(self, user_id: int) -> List[Role]:
         pass
+
+    @abstractmethod
+    async def GetRoleIdsByUsers(self, user_ids: List[int]) -> Dict[int, List[int]]:
+        """Lấy role id của nhiều user trong một query (user không có role => list rỗng)."""
+        pass
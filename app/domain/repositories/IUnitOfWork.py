@@ -19,6 +19,10 @@ class IUnitOfWork(ABC):
     async def SaveChanges(self) -> None:
         pass
 
+    @abstractmethod
+    async def Rollback(self) -> None:
+        pass
+
     @abstractmethod
     async def Dispose(self) -> None:
         pass
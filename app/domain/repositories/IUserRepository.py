@@ -16,6 +16,11 @@ class IUserRepository(ABC):
     async def GetByUserName(self, user_name: str) -> Optional[User]:
         pass
 
+    @abstractmethod
+    async def GetClaimsVersion(self, id: int) -> Optional[int]:
+        """claims_version của user đang active; None nếu user không tồn tại hoặc bị khoá."""
+        pass
+
     @abstractmethod
     async def Search(
         self,
@@ -29,6 +34,20 @@ class IUserRepository(ABC):
         """Trả về (items, total)"""
         pass
 
+    @abstractmethod
+    async def SearchByCursor(
+        self,
+        cursor: str | None,
+        page_size: int,
+        sort_by: str | None,
+        sort_dir: str,
+        search: str | None,
+        is_active: bool | None,
+        include_total: bool,
+    ) -> Tuple[List[User], str | None, int | None]:
+        """Keyset pagination theo (sort column, id). Trả về (items, next_cursor, total | None)."""
+        pass
+
     @abstractmethod
     async def Add(self, entity: User) -> User:
         pass
@@ -40,3 +59,13 @@ class IUserRepository(ABC):
     @abstractmethod
     async def Delete(self, id: int) -> None:
         pass
+
+    @abstractmethod
+    async def RevokeClaims(self, id: int) -> None:
+        """Tăng claims_version: access token đã phát hành cho user không còn dùng claims được."""
+        pass
+
+    @abstractmethod
+    async def RevokeClaimsByRole(self, role_id: int) -> None:
+        """Tăng claims_version của mọi user đang có role (gọi trước khi sửa/xoá role)."""
+        pass
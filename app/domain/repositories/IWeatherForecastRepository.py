@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
+from app.domain.entities.EntityVersion import EntityVersion
 from app.domain.entities.WeatherForecast import WeatherForecast
 
 
@@ -7,10 +8,18 @@ class IWeatherForecastRepository(ABC):
     @abstractmethod
     async def GetAll(self) -> List[WeatherForecast]: ...
     @abstractmethod
+    def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[WeatherForecast]: ...
+    @abstractmethod
+    async def GetVersion(self) -> EntityVersion: ...
+    @abstractmethod
+    async def GetVersionById(self, id: int) -> EntityVersion: ...
+    @abstractmethod
     async def GetById(self, id: int) -> Optional[WeatherForecast]: ...
     @abstractmethod
     async def Add(self, entity: WeatherForecast) -> WeatherForecast: ...
     @abstractmethod
+    async def AddRange(self, entities: List[WeatherForecast]) -> None: ...
+    @abstractmethod
     async def Update(self, entity: WeatherForecast) -> WeatherForecast: ...
     @abstractmethod
     async def Delete(self, id: int) -> None: ...
@@ -1,11 +1,16 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List
 
 from fastapi import Depends, HTTPException, status
 
-from app.infrastructure.auth.Dependencies import GetCurrentUser, GetUnitOfWork
+from app.infrastructure.auth.Dependencies import (
+    GetCurrentUser,
+    GetPermissionResolver,
+    GetTokenPayload,
+    UseClaimsPrincipal,
+)
 from app.application.dtos.UserDto import UserDto
-from app.domain.repositories.IUnitOfWork import IUnitOfWork
+from app.application.services.interfaces.IPermissionResolver import IPermissionResolver
 
 
 @dataclass
@@ -24,6 +29,19 @@ def BuildPrincipal(user: UserDto, roles: List[str] | None = None) -> UserPrincip
     )
 
 
+async def _ResolveRoleNames(
+    user: UserDto,
+    payload: dict[str, Any],
+    use_claims: bool,
+    resolver: IPermissionResolver,
+) -> List[str]:
+    """Lấy role names của user: từ claims nếu được phép, ngược lại qua PermissionResolver (có cache)."""
+    if use_claims:
+        return list(payload.get("roles") or [])
+    access = await resolver.GetUserAccess(user.id)
+    return list(access.role_names)
+
+
 def RequireRoles(*required_roles: str):
     """Dependency yêu cầu user phải có ít nhất một trong các role.
 
@@ -32,10 +50,12 @@ def RequireRoles(*required_roles: str):
 
     async def dependency(
         user: UserDto = Depends(GetCurrentUser),
-        uow: IUnitOfWork = Depends(GetUnitOfWork),
+        payload: dict[str, Any] = Depends(GetTokenPayload),
+        use_claims: bool = Depends(UseClaimsPrincipal),
+        resolver: IPermissionResolver = Depends(GetPermissionResolver),
     ) -> UserPrincipal:
-        roles = await uow.Roles.GetRolesByUser(user.id)
-        principal = BuildPrincipal(user, roles=[r.name for r in roles])
+        role_names = await _ResolveRoleNames(user, payload, use_claims, resolver)
+        principal = BuildPrincipal(user, roles=role_names)
         if required_roles:
             user_roles = set(principal.roles)
             expected = set(required_roles)
@@ -60,20 +80,17 @@ def RequirePermissions(*required_permissions: str, enforce: bool = True):
 
     async def dependency(
         user: UserDto = Depends(GetCurrentUser),
-        uow: IUnitOfWork = Depends(GetUnitOfWork),
+        payload: dict[str, Any] = Depends(GetTokenPayload),
+        use_claims: bool = Depends(UseClaimsPrincipal),
+        resolver: IPermissionResolver = Depends(GetPermissionResolver),
     ) -> UserPrincipal:
-        roles = await uow.Roles.GetRolesByUser(user.id)
-        principal = BuildPrincipal(user, roles=[r.name for r in roles])
+        role_names = await _ResolveRoleNames(user, payload, use_claims, resolver)
+        principal = BuildPrincipal(user, roles=role_names)
         if not required_permissions or not enforce:
             # Không bắt buộc, chỉ trả về principal để service tự xử lý tiếp.
             return principal
 
-        perm_names: set[str] = set()
-        for role in roles:
-            perms = await uow.Permissions.GetPermissionsByRole(role.id)
-            for perm in perms:
-                perm_names.add(perm.name)
-        user_permissions = perm_names
+        user_permissions = set(await resolver.GetPermissions(user.id))
         missing = [p for p in required_permissions if p not in user_permissions]
 
         if missing:
@@ -1,43 +1,68 @@
-from fastapi import Depends, HTTPException, status
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
+from app.application.services.PermissionResolver import PermissionResolver
 from app.application.services.UserService import UserService
+from app.application.services.interfaces.IPermissionResolver import IPermissionResolver
 from app.application.services.interfaces.IUserService import IUserService
-from app.infrastructure.auth.JwtSettings import SECRET_KEY, DecodeToken
+from app.infrastructure.auth.JwtSettings import DecodeToken
 from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.routing import SetConsistencyKey
 from app.infrastructure.repositories.UnitOfWork import UnitOfWork
 from app.domain.repositories.IUnitOfWork import IUnitOfWork
 from app.application.dtos.UserDto import UserDto
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.config.settings import get_settings
 
 bearer_scheme = HTTPBearer(auto_error=True)
-ALGORITHM = "HS256"
 
-def GetDbContext():
-    db = DbContext()
+async def GetDbContext(request: Request):
+    """Factory DbContext cho mỗi request (giống AddDbContext, lifetime Scoped).
+
+    Mọi controller và mọi dependency auth (GetCurrentUser, RequireRoles, RequirePermissions)
+    đều phải resolve qua đúng hàm này: FastAPI cache dependency theo callable trong phạm vi
+    một request, nên cả request chỉ mở một Session (một lần checkout pool, chung identity map).
+
+    Request GET/HEAD mở DbContext read-only (được phép đọc từ read replica).
+    Engines lấy từ app đang xử lý request (app.state.db_engines, do lifespan tạo).
+    """
+    db = DbContext(
+        read_only=request.method in ("GET", "HEAD"),
+        engines=getattr(request.app.state, "db_engines", None),
+    )
     try:
         yield db
     finally:
-        db.Dispose()
-        
+        await db.Dispose()
+
+
 def GetUnitOfWork(db: DbContext = Depends(GetDbContext)) -> IUnitOfWork:
+    """Resolve IUnitOfWork dùng chung DbContext của request."""
     return UnitOfWork(db)
 
+
 def GetService(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IUserService:
     """Resolve IUserService từ UnitOfWork."""
     return UserService(uow)
 
 
-async def GetCurrentUser(
+def GetPermissionResolver(uow: IUnitOfWork = Depends(GetUnitOfWork)) -> IPermissionResolver:
+    """Resolve IPermissionResolver (cache quyền hiệu lực dùng chung cả process)."""
+    return PermissionResolver(uow)
+
+
+async def GetTokenPayload(
     creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    service: IUserService = Depends(GetService),
-) -> UserDto:
+) -> dict[str, Any]:
+    """Decode access token của request (cache theo request, dùng chung cho GetCurrentUser và Authorization)."""
     token = creds.credentials
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = DecodeToken(token)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
@@ -48,12 +73,66 @@ async def GetCurrentUser(
 
     # JWT hay để sub là string → convert về int
     try:
-        user_id = int(sub)
+        int(sub)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user id in token")
 
-    user = await service.GetById(user_id)
+    # Read-your-writes theo user: sau khi user này ghi, các request đọc của user đó đi primary
+    SetConsistencyKey(f"user:{sub}")
+
+    return payload
+
+
+async def UseClaimsPrincipal(
+    payload: dict[str, Any] = Depends(GetTokenPayload),
+    service: IUserService = Depends(GetService),
+) -> bool:
+    """
+    True nếu đang bật AUTH_CLAIMS_PRINCIPAL và claims trong token còn mới (không bị revoke).
+
+    Claim "cv" phải khớp users.claims_version của user đang active: 1 query theo khoá chính,
+    dùng chung mọi worker và không mất khi restart. Dependency được cache theo request nên
+    GetCurrentUser và RequireRoles / RequirePermissions chỉ kiểm tra 1 lần.
+    """
+    if not get_settings().AUTH_CLAIMS_PRINCIPAL or "role_ids" not in payload or "cv" not in payload:
+        return False
+    return payload["cv"] == await service.GetClaimsVersion(int(payload["sub"]))
+
+
+def BuildUserFromClaims(payload: dict[str, Any]) -> UserDto:
+    """Dựng UserDto từ claims (token đã được verify chữ ký nên không validate lại)."""
+    return UserDto.model_construct(
+        id=int(payload["sub"]),
+        user_name=payload.get("username"),
+        email=payload.get("email"),
+        full_name=payload.get("full_name"),
+        is_active=payload.get("is_active", True),
+        roles=list(payload.get("role_ids") or []),
+    )
+
+
+async def GetCurrentUser(
+    payload: dict[str, Any] = Depends(GetTokenPayload),
+    service: IUserService = Depends(GetService),
+    use_claims: bool = Depends(UseClaimsPrincipal),
+) -> UserDto:
+    """
+    Lấy user hiện tại từ access token.
+
+    - AUTH_CLAIMS_PRINCIPAL=true và claims còn mới: dựng UserDto từ claims, chỉ query claims_version.
+    - Ngược lại (hoặc token cũ / đã bị revoke / user bị khoá): đọc user từ DB như bình thường.
+    - User bị khoá (is_active = false) luôn bị từ chối.
+    """
+    user_id = int(payload["sub"])
+
+    if use_claims:
+        user = BuildUserFromClaims(payload)
+    else:
+        user = await service.GetById(user_id)
+
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive")
 
-    return user
\ No newline at end of file
+    return user
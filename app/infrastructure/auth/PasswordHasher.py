@@ -1,7 +1,20 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from app.config.settings import get_settings
+from app.shared.logging_config import get_logger
+
 _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+logger = get_logger(__name__)
+
 
 def HashPassword(password: str) -> str:
     return _pwd_context.hash(password)
@@ -11,3 +24,110 @@ def VerifyPassword(plain_password: str, hashed_password: str | None) -> bool:
     if hashed_password is None:
         return False
     return _pwd_context.verify(plain_password, hashed_password)
+
+
+# -------- Bounded executor cho bcrypt (không chặn event loop) --------
+
+_lock = threading.Lock()
+_executor: Executor | None = None
+_executor_kind = "thread"
+_workers = 1
+_max_pending = 1
+
+# Metrics (cập nhật trên event loop, đọc qua PasswordHasherStats)
+_in_flight = 0
+_completed = 0
+_rejected = 0
+_total_seconds = 0.0
+_total_hash_seconds = 0.0
+_max_seconds = 0.0
+
+
+def _GetExecutor() -> Executor:
+    global _executor, _executor_kind, _workers, _max_pending
+    if _executor is not None:
+        return _executor
+    with _lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor_kind = settings.PASSWORD_HASH_EXECUTOR.lower()
+            _workers = settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1)
+            _max_pending = max(_workers, settings.PASSWORD_HASH_MAX_PENDING)
+            if _executor_kind == "process":
+                _executor = ProcessPoolExecutor(max_workers=_workers)
+            else:
+                _executor_kind = "thread"
+                _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="password-hash")
+    return _executor
+
+
+def _Timed(func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    """Chạy trong worker (thread/process), trả về kèm thời gian hash thực tế."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+async def _RunBounded(func: Callable[..., Any], *args: Any) -> Any:
+    global _in_flight, _completed, _rejected, _total_seconds, _total_hash_seconds, _max_seconds
+    executor = _GetExecutor()
+    if _in_flight >= _max_pending:
+        # Hàng đợi đã đầy: từ chối ngay thay vì để request chờ lâu
+        _rejected += 1
+        logger.warning("Password hashing saturated (%s in flight), rejecting request", _in_flight)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    _in_flight += 1
+    started = time.perf_counter()
+    try:
+        result, hash_seconds = await asyncio.get_running_loop().run_in_executor(executor, _Timed, func, *args)
+    finally:
+        _in_flight -= 1
+
+    elapsed = time.perf_counter() - started
+    _completed += 1
+    _total_seconds += elapsed
+    _total_hash_seconds += hash_seconds
+    _max_seconds = max(_max_seconds, elapsed)
+    return result
+
+
+async def HashPasswordAsync(password: str) -> str:
+    """HashPassword chạy trên executor riêng; quá PASSWORD_HASH_MAX_PENDING => HTTP 429."""
+    return await _RunBounded(HashPassword, password)
+
+
+async def VerifyPasswordAsync(plain_password: str, hashed_password: str | None) -> bool:
+    """VerifyPassword chạy trên executor riêng; quá PASSWORD_HASH_MAX_PENDING => HTTP 429."""
+    if hashed_password is None:
+        return False
+    return await _RunBounded(VerifyPassword, plain_password, hashed_password)
+
+
+def PasswordHasherStats() -> dict:
+    completed = _completed or 1
+    return {
+        "executor": _executor_kind,
+        "workers": _workers,
+        "max_pending": _max_pending,
+        "in_flight": _in_flight,
+        "queue_depth": max(0, _in_flight - _workers),
+        "completed": _completed,
+        "rejected": _rejected,
+        "avg_latency_ms": round(_total_seconds / completed * 1000, 2),
+        "avg_hash_ms": round(_total_hash_seconds / completed * 1000, 2),
+        "avg_wait_ms": round((_total_seconds - _total_hash_seconds) / completed * 1000, 2),
+        "max_latency_ms": round(_max_seconds * 1000, 2),
+    }
+
+
+def ShutdownPasswordHasher() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
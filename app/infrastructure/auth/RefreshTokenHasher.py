@@ -0,0 +1,6 @@
+import hashlib
+
+
+def HashRefreshToken(token: str) -> bytes:
+    """SHA-256 (32 byte) của refresh token: DB chỉ lưu/tra cứu theo digest, không lưu token gốc."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.application.dtos.RefreshTokenPurgeResultDto import RefreshTokenPurgeResultDto
+from app.application.services.AuthService import AuthService
+from app.config.settings import get_settings
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+from app.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def PurgeRefreshTokens(
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+) -> RefreshTokenPurgeResultDto:
+    """Chạy 1 lượt purge với DbContext riêng (không gắn với request)."""
+    settings = get_settings()
+    uow = UnitOfWork(DbContext())
+    try:
+        result = await AuthService(uow).PurgeRefreshTokens(
+            retention_days if retention_days is not None else settings.REFRESH_TOKEN_PURGE_RETENTION_DAYS,
+            batch_size or settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
+        )
+    finally:
+        await uow.Dispose()
+    logger.info(
+        "Refresh token purge: %s rows in %s batches, %s ms",
+        result.purged,
+        result.batches,
+        result.elapsed_ms,
+    )
+    return result
+
+
+async def RunRefreshTokenPurgeLoop(interval_seconds: float) -> None:
+    """Background task (app lifespan): purge định kỳ, lỗi 1 lượt không làm dừng vòng lặp."""
+    while True:
+        try:
+            await PurgeRefreshTokens()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Refresh token purge failed")
+        await asyncio.sleep(interval_seconds)
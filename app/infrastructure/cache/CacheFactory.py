@@ -0,0 +1,85 @@
+from typing import Any
+
+from app.config.settings import Settings
+from app.shared.cache import ICache, MemoryCache
+from app.shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def CreateRedisClient(url: str) -> Any:
+    """
+    Tạo client redis.asyncio (import lazy: chỉ cần package redis khi CACHE_BACKEND=redis).
+
+    `fakeredis://`: server Redis giả trong process (cần package fakeredis) cho dev/test không có Redis thật.
+    """
+    if url.startswith("fakeredis://"):
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis()
+
+    from redis.asyncio import Redis
+
+    return Redis.from_url(url)
+
+
+class AppCaches:
+    """
+    Các cache của app theo CACHE_BACKEND (tạo trong lifespan, giống DbEngines):
+
+    - Permissions: quyền hiệu lực theo user (PermissionResolver), cấu hình PERMISSION_CACHE_*.
+    - Responses: response GET list đã serialize (response_cache), cấu hình RESPONSE_CACHE_*.
+
+    redis_client: truyền client có sẵn (vd fakeredis khi test) thay vì tạo từ CACHE_REDIS_URL.
+    """
+
+    def __init__(self, settings: Settings, redis_client: Any = None):
+        self.Backend = settings.CACHE_BACKEND.lower()
+        self.RedisClient = None
+        self._owns_client = False
+        if self.Backend == "redis":
+            self.RedisClient = redis_client
+            if self.RedisClient is None:
+                self.RedisClient = CreateRedisClient(settings.CACHE_REDIS_URL)
+                self._owns_client = True
+        elif self.Backend != "memory":
+            raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+        self.Permissions = self._Create(
+            settings, "permissions", settings.PERMISSION_CACHE_MAX_ENTRIES, settings.PERMISSION_CACHE_TTL_SECONDS
+        )
+        self.Responses = self._Create(
+            settings, "responses", settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+
+    def _Create(self, settings: Settings, namespace: str, max_entries: int, ttl_seconds: float) -> ICache:
+        if self.RedisClient is None or max_entries <= 0:
+            return MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+        from app.infrastructure.cache.RedisCache import RedisCache
+
+        return RedisCache(
+            self.RedisClient,
+            namespace,
+            ttl_seconds=ttl_seconds,
+            near_max_entries=max_entries,
+            near_ttl_seconds=settings.CACHE_NEAR_TTL_SECONDS,
+            key_prefix=settings.CACHE_KEY_PREFIX,
+        )
+
+    def All(self) -> list[ICache]:
+        return [self.Permissions, self.Responses]
+
+    async def Start(self) -> None:
+        """Subscribe kênh invalidate (Redis); lỗi kết nối chỉ log, cache vẫn chạy và coi như miss."""
+        for cache in self.All():
+            try:
+                await cache.Start()
+            except Exception:
+                logger.exception("Cache listener failed to start (%s backend)", self.Backend)
+
+    async def Close(self) -> None:
+        for cache in self.All():
+            await cache.Close()
+        if self._owns_client and self.RedisClient is not None:
+            await self.RedisClient.aclose()
@@ -0,0 +1,185 @@
+import asyncio
+import re
+import uuid
+from typing import Any
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.shared.cache import ICache
+from app.shared.logging_config import get_logger
+from app.shared.memory_cache import TtlLruCache
+
+logger = get_logger(__name__)
+
+# Ký tự đặc biệt của pattern SCAN MATCH (glob) cần escape khi prefix là chuỗi thường
+_GLOB_CHARS = re.compile(r"([*?\[\]\\])")
+_UNLINK_BATCH_SIZE = 500
+
+
+class RedisCache(ICache):
+    """
+    ICache trên Redis (hoặc server tương thích giao thức Redis / fakeredis khi test):
+
+    - Value lưu ở Redis với key `<key_prefix><namespace>:<key>`, TTL tính bằng ms (SET PX).
+    - Near-cache trong process (TTL ngắn) để request nóng không phải round-trip Redis.
+    - Delete / Invalidate: xoá trên Redis + publish lên kênh `<key_prefix>invalidate:<namespace>`;
+      listener (Start) ở mọi node xoá near-cache tương ứng ngay khi nhận message.
+    - Redis lỗi => coi như cache miss (log warning), request vẫn chạy tiếp bằng DB.
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        namespace: str,
+        ttl_seconds: float,
+        near_max_entries: int,
+        near_ttl_seconds: float,
+        key_prefix: str = "",
+    ):
+        self._client = client
+        self._namespace = namespace
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._key_prefix = f"{key_prefix}{namespace}:"
+        self._channel = f"{key_prefix}invalidate:{namespace}"
+        self._near: TtlLruCache[str, bytes] = TtlLruCache(
+            max_entries=near_max_entries,
+            ttl_seconds=min(near_ttl_seconds, ttl_seconds),
+        )
+        self._node_id = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+        self.Generation = 0
+        self.RemoteHits = 0
+        self.RemoteMisses = 0
+        self.Errors = 0
+        self.InvalidationsReceived = 0
+
+    @property
+    def Enabled(self) -> bool:
+        return self._ttl_ms > 0
+
+    async def Get(self, key: str) -> bytes | None:
+        if not self.Enabled:
+            return None
+        value = self._near.Get(key)
+        if value is not None:
+            return value
+        try:
+            value = await self._client.get(self._key_prefix + key)
+        except RedisError as ex:
+            self._OnError("GET", ex)
+            return None
+        if value is None:
+            self.RemoteMisses += 1
+            return None
+        self.RemoteHits += 1
+        self._near.Set(key, value)
+        return value
+
+    async def Set(self, key: str, value: bytes) -> None:
+        if not self.Enabled:
+            return
+        self._near.Set(key, value)
+        try:
+            await self._client.set(self._key_prefix + key, value, px=self._ttl_ms)
+        except RedisError as ex:
+            self._OnError("SET", ex)
+
+    async def Delete(self, key: str) -> None:
+        self._EvictLocal(key=key)
+        try:
+            await self._client.unlink(self._key_prefix + key)
+            await self._Publish({"key": key})
+        except RedisError as ex:
+            self._OnError("DELETE", ex)
+
+    async def Invalidate(self, prefix: str = "") -> None:
+        self._EvictLocal(prefix=prefix)
+        pattern = _GLOB_CHARS.sub(r"\\\1", self._key_prefix + prefix) + "*"
+        try:
+            batch: list[bytes] = []
+            async for redis_key in self._client.scan_iter(match=pattern, count=_UNLINK_BATCH_SIZE):
+                batch.append(redis_key)
+                if len(batch) >= _UNLINK_BATCH_SIZE:
+                    await self._client.unlink(*batch)
+                    batch = []
+            if batch:
+                await self._client.unlink(*batch)
+            await self._Publish({"prefix": prefix})
+        except RedisError as ex:
+            self._OnError("INVALIDATE", ex)
+
+    async def Start(self) -> None:
+        if self._listener is None:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self._channel)
+            self._listener = asyncio.create_task(self._Listen(pubsub))
+
+    async def Close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def Stats(self) -> dict[str, Any]:
+        near = self._near.Stats()
+        lookups = near["hits"] + self.RemoteHits + self.RemoteMisses
+        hits = near["hits"] + self.RemoteHits
+        return {
+            "backend": "redis",
+            "size": near["size"],
+            "ttl_seconds": self._ttl_ms / 1000,
+            "hits": hits,
+            "misses": self.RemoteMisses,
+            "hit_ratio": (hits / lookups) if lookups else 0.0,
+            "remote_hits": self.RemoteHits,
+            "remote_misses": self.RemoteMisses,
+            "errors": self.Errors,
+            "invalidations_received": self.InvalidationsReceived,
+            "near_cache": near,
+        }
+
+    async def _Publish(self, message: dict[str, str]) -> None:
+        await self._client.publish(self._channel, orjson.dumps({"node": self._node_id, **message}))
+
+    def _EvictLocal(self, key: str | None = None, prefix: str | None = None) -> None:
+        self.Generation += 1
+        if key is not None:
+            self._near.Delete(key)
+        elif prefix:
+            self._near.DeleteWhere(lambda k: k.startswith(prefix))
+        else:
+            self._near.Clear()
+
+    def _HandleMessage(self, data: bytes) -> None:
+        try:
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return
+        if message.get("node") == self._node_id:
+            return
+        self.InvalidationsReceived += 1
+        if "key" in message:
+            self._EvictLocal(key=message["key"])
+        else:
+            self._EvictLocal(prefix=message.get("prefix", ""))
+
+    async def _Listen(self, pubsub) -> None:
+        """Nhận message invalidate từ node khác; mất kết nối => xoá near-cache (có thể đã lỡ message) rồi thử lại."""
+        try:
+            while True:
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._HandleMessage(message["data"])
+                except RedisError as ex:
+                    self._OnError("SUBSCRIBE", ex)
+                    self._EvictLocal()
+                await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+    def _OnError(self, operation: str, ex: Exception) -> None:
+        self.Errors += 1
+        logger.warning("Redis cache %s failed (%s): %s", operation, self._namespace, ex)
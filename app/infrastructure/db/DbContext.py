@@ -1,13 +1,96 @@
+from typing import Any, AsyncIterator
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db.base import SessionLocal, InitDb  # noqa: F401
+from app.infrastructure.db.base import DbEngines, GetDbEngines
 
 
 class DbContext:
-    """DbContext tương tự EF Core DbContext (quản lý SQLAlchemy Session)."""
+    """DbContext tương tự EF Core DbContext (quản lý SQLAlchemy Session).
+
+    - DB_ASYNC=false: dùng Session sync (mặc định).
+    - DB_ASYNC=true: dùng AsyncSession, mọi truy vấn đều được await trên driver async.
+
+    Repository chỉ gọi các method bên dưới nên không phụ thuộc vào mode đang chạy.
+
+    read_only=True (request GET/HEAD): khi có READ_REPLICA_URLS, SELECT được định tuyến sang replica.
+    engines: engines của app (app.state.db_engines); None => engines mặc định (GetDbEngines()).
+    """
+
+    def __init__(self, read_only: bool = False, engines: DbEngines | None = None):
+        engines = engines or GetDbEngines()
+        self.IsAsync: bool = engines.UseAsync
+        # Tên dialect (sqlite, mysql, postgresql...) cho repository cần SQL khác nhau theo DB
+        self.Dialect: str = engines.Engine.dialect.name
+        self.Session: Session | AsyncSession = engines.AsyncSessionLocal() if self.IsAsync else engines.SessionLocal()
+        self.Session.info["read_only"] = read_only
+
+    async def Execute(self, statement: Any, params: Any = None) -> Result:
+        if self.IsAsync:
+            return await self.Session.execute(statement, params)
+        return self.Session.execute(statement, params)
+
+    async def Scalars(self, statement: Any) -> list[Any]:
+        result = await self.Execute(statement)
+        return list(result.scalars().all())
+
+    async def First(self, statement: Any) -> Any | None:
+        result = await self.Execute(statement)
+        return result.scalars().first()
+
+    async def Scalar(self, statement: Any) -> Any:
+        result = await self.Execute(statement)
+        return result.scalar()
+
+    async def StreamScalars(self, statement: Any, batch_size: int = 1000) -> AsyncIterator[Any]:
+        """Đọc kết quả theo từng batch (yield_per, server-side cursor) thay vì load hết bằng .all()."""
+        statement = statement.execution_options(yield_per=batch_size)
+        if self.IsAsync:
+            result = await self.Session.stream_scalars(statement)
+            try:
+                async for row in result:
+                    yield row
+            finally:
+                await result.close()
+        else:
+            result = self.Session.scalars(statement)
+            try:
+                for row in result:
+                    yield row
+            finally:
+                result.close()
+
+    def Add(self, instance: Any) -> None:
+        self.Session.add(instance)
+
+    async def Delete(self, instance: Any) -> None:
+        if self.IsAsync:
+            await self.Session.delete(instance)
+        else:
+            self.Session.delete(instance)
+
+    async def Flush(self) -> None:
+        if self.IsAsync:
+            await self.Session.flush()
+        else:
+            self.Session.flush()
+
+    async def Commit(self) -> None:
+        if self.IsAsync:
+            await self.Session.commit()
+        else:
+            self.Session.commit()
 
-    def __init__(self):
-        self.Session: Session = SessionLocal()
+    async def Rollback(self) -> None:
+        if self.IsAsync:
+            await self.Session.rollback()
+        else:
+            self.Session.rollback()
 
-    def Dispose(self):
-        self.Session.close()
+    async def Dispose(self) -> None:
+        if self.IsAsync:
+            await self.Session.close()
+        else:
+            self.Session.close()
@@ -1,4 +1,17 @@
-from sqlalchemy import Column, DateTime, String, func
+import secrets
+from typing import Any
+
+from sqlalchemy import BigInteger, Column, DateTime, String, func, literal_column, select
+
+from app.domain.entities.EntityVersion import EntityVersion
+
+
+def NewRowVersion() -> int:
+    """
+    Version ban đầu của 1 dòng: ngẫu nhiên thay vì 1, để xoá rồi insert lại (SQLite có thể dùng lại id)
+    không cho cùng version / cùng tổng version với dữ liệu cũ.
+    """
+    return secrets.randbelow(2**31) + 1
 
 
 class AuditMixin:
@@ -8,3 +21,40 @@ class AuditMixin:
     created_by = Column("created_by", String(100), nullable=True)
     updated_at = Column("updated_at", DateTime(timezone=True), onupdate=func.now())
     updated_by = Column("updated_by", String(100), nullable=True)
+    # Tăng 1 ở mỗi UPDATE (ORM flush lẫn update() Core): phân biệt 2 lần sửa trong cùng 1 giây, khi
+    # updated_at (func.now()) chỉ chính xác tới giây trên SQLite / MySQL DATETIME
+    row_version = Column(
+        "row_version",
+        BigInteger,
+        nullable=False,
+        default=NewRowVersion,
+        server_default="1",
+        onupdate=literal_column("row_version") + 1,
+    )
+
+
+async def QueryVersion(db_context: Any, model: type[AuditMixin], *where: Any) -> EntityVersion:
+    """
+    count(*) + sum(row_version) + max(coalesce(updated_at, created_at)) + now() của DB cho các dòng thoả `where`
+    (1 query aggregate, không load entity).
+
+    updated_at chỉ được set khi UPDATE nên dòng mới insert dùng created_at.
+    """
+    last_modified = func.max(func.coalesce(model.updated_at, model.created_at), type_=DateTime(timezone=True))
+    result = await db_context.Execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(model.row_version), 0),
+            last_modified,
+            func.now(type_=DateTime(timezone=True)),
+        )
+        .select_from(model)
+        .where(*where)
+    )
+    count, checksum, last_modified_value, database_now = result.one()
+    return EntityVersion(
+        count=count,
+        checksum=int(checksum),
+        last_modified=last_modified_value,
+        database_now=database_now,
+    )
@@ -1,29 +1,185 @@
+import threading
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from app.config.settings import get_settings
+from app.config.settings import Settings, get_settings
+from app.infrastructure.db.pool import EngineOptions
+from app.infrastructure.db.routing import ReplicaRouter, RoutingSession
+
+# Alembic (alembic/env.py) đọc URL từ đây
+DATABASE_URL = get_settings().DATABASE_URL
+
+# Driver async tương ứng với từng backend (dùng khi DB_ASYNC=true)
+_ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
 
-settings = get_settings()
+def ToAsyncUrl(url: str) -> str:
+    """Đổi URL sync sang URL dùng driver async (vd: mysql+pymysql -> mysql+aiomysql)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
 
-DATABASE_URL = settings.DATABASE_URL
 
 Base = declarative_base()
 
-engine = create_engine(
-    DATABASE_URL,
-    future=True,
-    echo=False,
-)
 
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-    expire_on_commit=False,
-)
+class DbEngines:
+    """
+    Engine + session factory của 1 app instance (sync, async, read replica).
+
+    Được tạo trong lifespan khi app start (CreateDbEngines) và dispose khi shutdown,
+    không tạo lúc import module: worker start nhanh, test tạo app riêng với settings riêng.
+    """
+
+    def __init__(self, settings: Settings):
+        self.Settings = settings
+        self.UseAsync: bool = settings.DB_ASYNC
+
+        self.Engine: Engine = create_engine(
+            settings.DATABASE_URL,
+            future=True,
+            echo=False,
+            **EngineOptions(settings.DATABASE_URL, settings),
+        )
+
+        # Async mode: engine sync ở trên vẫn được giữ cho InitDb()/Alembic,
+        # còn request chạy qua AsyncSession để mọi truy vấn đều nhường event loop.
+        self.AsyncEngine: AsyncEngine | None = None
+        if self.UseAsync:
+            async_url = settings.ASYNC_DATABASE_URL or ToAsyncUrl(settings.DATABASE_URL)
+            self.AsyncEngine = create_async_engine(
+                async_url,
+                echo=False,
+                **EngineOptions(async_url, settings, is_async=True),
+            )
+
+        # Read replica: mỗi URL trong READ_REPLICA_URLS là 1 engine (sync hoặc async theo DB_ASYNC),
+        # RoutingSession chọn primary/replica cho từng câu lệnh.
+        replica_urls = [url.strip() for url in settings.READ_REPLICA_URLS.split(",") if url.strip()]
+        self.ReplicaEngines: list[Engine | AsyncEngine] = [
+            self._CreateReplicaEngine(url, index) for index, url in enumerate(replica_urls)
+        ]
+
+        self.SessionLocal = sessionmaker(
+            bind=self.Engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            **(
+                {"class_": RoutingSession, "router": self._CreateRouter(self.Engine)}
+                if self.ReplicaEngines and not self.UseAsync
+                else {}
+            ),
+        )
+
+        self.AsyncSessionLocal = (
+            async_sessionmaker(
+                bind=self.AsyncEngine,
+                autoflush=False,
+                expire_on_commit=False,
+                **(
+                    {"sync_session_class": RoutingSession, "router": self._CreateRouter(self.AsyncEngine.sync_engine)}
+                    if self.ReplicaEngines
+                    else {}
+                ),
+            )
+            if self.AsyncEngine is not None
+            else None
+        )
+
+    def _CreateReplicaEngine(self, url: str, index: int) -> Engine | AsyncEngine:
+        name = f"replica{index}"
+        if self.UseAsync:
+            async_url = ToAsyncUrl(url)
+            return create_async_engine(
+                async_url, echo=False, **EngineOptions(async_url, self.Settings, is_async=True, name=name)
+            )
+        return create_engine(url, future=True, echo=False, **EngineOptions(url, self.Settings, name=name))
+
+    def _CreateRouter(self, primary: Engine) -> ReplicaRouter:
+        replicas = [e.sync_engine if isinstance(e, AsyncEngine) else e for e in self.ReplicaEngines]
+        return ReplicaRouter(
+            primary, replicas, self.Settings.READ_REPLICA_STRATEGY, self.Settings.READ_YOUR_WRITES_SECONDS
+        )
+
+    @property
+    def PrimaryEngine(self) -> Engine | AsyncEngine:
+        """Engine request đang dùng (async nếu DB_ASYNC)."""
+        return self.AsyncEngine if self.AsyncEngine is not None else self.Engine
+
+    def All(self) -> list[Engine | AsyncEngine]:
+        return [e for e in (self.Engine, self.AsyncEngine, *self.ReplicaEngines) if e is not None]
+
+    def SyncEngines(self) -> list[tuple[str, Engine]]:
+        """(tên, engine sync) để gắn event listener; async engine dùng sync_engine bên trong."""
+        engines = [("primary", getattr(self.PrimaryEngine, "sync_engine", self.PrimaryEngine))]
+        engines.extend(
+            (f"replica{index}", getattr(e, "sync_engine", e)) for index, e in enumerate(self.ReplicaEngines)
+        )
+        return engines
+
+    def ResetAfterFork(self) -> None:
+        """
+        Gọi trong process con sau fork (gunicorn preload_app): bỏ các connection kế thừa từ master
+        mà không đóng chúng (close=False) => mỗi worker tự mở pool mới.
+        """
+        for db_engine in self.All():
+            getattr(db_engine, "sync_engine", db_engine).dispose(close=False)
+
+    async def Dispose(self) -> None:
+        """Đóng toàn bộ connection trong pool khi shutdown."""
+        for db_engine in self.All():
+            if isinstance(db_engine, AsyncEngine):
+                await db_engine.dispose()
+            else:
+                db_engine.dispose()
+
+
+_current: DbEngines | None = None
+_current_lock = threading.Lock()
+
+
+def CreateDbEngines(settings: Settings | None = None) -> DbEngines:
+    return DbEngines(settings or get_settings())
+
+
+def SetDbEngines(engines: DbEngines | None) -> None:
+    """Lifespan đặt engines của app làm mặc định cho code ngoài request (background job, CLI)."""
+    global _current
+    _current = engines
+
+
+def CurrentDbEngines() -> DbEngines | None:
+    """Engines hiện tại, None nếu chưa được tạo (không tạo mới)."""
+    return _current
+
+
+def GetDbEngines() -> DbEngines:
+    """Engines mặc định; script/CLI chạy ngoài app lifespan thì tạo lazy từ get_settings()."""
+    global _current
+    if _current is None:
+        with _current_lock:
+            if _current is None:
+                _current = CreateDbEngines()
+    return _current
+
+
+def ResetEnginesAfterFork() -> None:
+    if _current is not None:
+        _current.ResetAfterFork()
 
 
-def InitDb():
+def InitDb(engines: DbEngines | None = None):
     # Import models để đăng ký với Base.metadata
     from app.infrastructure.db.models import (
         user_model,
@@ -35,4 +191,4 @@ def InitDb():
         role_permission_model,
         refresh_token_model,
     )  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=(engines or GetDbEngines()).Engine)
@@ -1,15 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects import mysql
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.audit_mixin import AuditMixin
 
+# SHA-256 digest: BINARY(32) trên MySQL (key cố định 32 byte), LargeBinary ở dialect khác
+TokenHashType = LargeBinary(32).with_variant(mysql.BINARY(32), "mysql")
+
 
 class RefreshTokenModel(AuditMixin, Base):
     __tablename__ = "refresh_tokens"
 
     id = Column("id", Integer, primary_key=True, index=True)
     user_id = Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token = Column("token", String(512), nullable=False, unique=True)
+    token_hash = Column("token_hash", TokenHashType, nullable=False, unique=True)
     expires_at = Column("expires_at", DateTime(timezone=True), nullable=False)
     revoked_at = Column("revoked_at", DateTime(timezone=True), nullable=True)
-    replaced_by_token = Column("replaced_by_token", String(512), nullable=True)
+    replaced_by_token_hash = Column("replaced_by_token_hash", TokenHashType, nullable=True)
     is_revoked = Column("is_revoked", Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_revoked_expires", "user_id", "is_revoked", "expires_at"),
+    )
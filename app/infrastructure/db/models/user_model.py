@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Index, Integer, String, Boolean
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.audit_mixin import AuditMixin
 
@@ -12,3 +12,11 @@ class UserModel(AuditMixin, Base):
     full_name = Column("full_name", String(256), nullable=True)
     is_active = Column("is_active", Boolean, nullable=False, default=True)
     password_hash = Column("password_hash", String(256), nullable=True)
+    # Tăng mỗi khi user / roles của user đổi: access token mang claim "cv" khác giá trị này thì không dùng claims nữa
+    claims_version = Column("claims_version", Integer, nullable=False, default=0, server_default="0")
+
+    # Keyset pagination sort theo (full_name, id) / (is_active, id); user_name, email đã có unique index
+    __table_args__ = (
+        Index("ix_users_full_name_id", "full_name", "id"),
+        Index("ix_users_is_active_id", "is_active", "id"),
+    )
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from typing import Any, Type
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+
+from app.config.settings import Settings
+
+
+class PoolMetrics:
+    """Số liệu checkout của 1 pool (thời gian chờ lấy connection, số lần timeout)."""
+
+    def __init__(self, name: str):
+        self.Name = name
+        self._lock = threading.Lock()
+        self.Checkouts = 0
+        self.Timeouts = 0
+        self.TotalSeconds = 0.0
+        self.MaxSeconds = 0.0
+
+    def Record(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.Timeouts += 1
+                return
+            self.Checkouts += 1
+            self.TotalSeconds += seconds
+            self.MaxSeconds = max(self.MaxSeconds, seconds)
+
+    def Snapshot(self) -> dict:
+        with self._lock:
+            checkouts = self.Checkouts
+            return {
+                "checkouts": checkouts,
+                "timeouts": self.Timeouts,
+                "avg_checkout_ms": round(self.TotalSeconds / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_checkout_ms": round(self.MaxSeconds * 1000, 3),
+            }
+
+
+_metrics: dict[str, PoolMetrics] = {}
+
+
+def _InstrumentedPool(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    Subclass pool đo thời gian `_do_get` (thời gian chờ checkout connection).
+    Tên metrics gắn vào class nên vẫn giữ khi engine.dispose() gọi pool.recreate().
+    """
+    metrics = _metrics.setdefault(name, PoolMetrics(name))
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.Record(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.Record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+    # Giữ __module__ của SQLAlchemy để log của pool vẫn đi theo logger sqlalchemy.pool (mặc định WARNING)
+    return type(
+        f"Instrumented{base.__name__}",
+        (base,),
+        {"_do_get": _do_get, "MetricsName": name, "__module__": base.__module__},
+    )
+
+
+def _IsMemorySqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def EngineOptions(url: str, settings: Settings, is_async: bool = False, name: str | None = None) -> dict[str, Any]:
+    """kwargs cho create_engine / create_async_engine theo cấu hình pool trong Settings."""
+    if _IsMemorySqlite(url):
+        # SQLite in-memory (test): 1 connection dùng chung mọi thread, nếu không mỗi thread
+        # (TestClient, threadpool) mở 1 DB rỗng riêng; không áp dụng QueuePool
+        if is_async:
+            return {"poolclass": StaticPool}
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    name = name or ("async" if is_async else "sync")
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        "poolclass": _InstrumentedPool(base, name),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def PoolStats(engine: Engine | AsyncEngine | None) -> dict | None:
+    """Trạng thái hiện tại của pool (in use, overflow, ...) + metrics checkout."""
+    if engine is None:
+        return None
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            }
+        )
+    name = getattr(pool, "MetricsName", None)
+    if name in _metrics:
+        stats.update(_metrics[name].Snapshot())
+    return stats
+
+
+def WarmUpPool(engine: Engine, connections: int) -> int:
+    """Mở sẵn `connections` connection (SELECT 1) rồi trả về pool, request đầu tiên không phải chờ connect."""
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+async def WarmUpAsyncPool(engine: AsyncEngine, connections: int) -> int:
+    async def _Open():
+        connection = await engine.connect()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    opened = await asyncio.gather(*[_Open() for _ in range(connections)], return_exceptions=True)
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+    errors = [c for c in opened if isinstance(c, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(opened)
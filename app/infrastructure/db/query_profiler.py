@@ -0,0 +1,104 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Profile của request hiện tại; None => không đo (listener return ngay)
+_current_profile: ContextVar["QueryProfile | None"] = ContextVar("db_query_profile", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryProfile:
+    """Số câu query, tổng thời gian DB và số lần lặp của từng "shape" câu lệnh trong 1 request."""
+
+    def __init__(self):
+        self.Count = 0
+        self.TotalSeconds = 0.0
+        self.Shapes: Counter[str] = Counter()
+
+    def Record(self, statement: str, seconds: float) -> None:
+        self.Count += 1
+        self.TotalSeconds += seconds
+        # Câu lệnh đã được bind tham số (?, %s, :name) nên text chính là shape
+        self.Shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def RepeatedShapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Các shape chạy >= threshold lần (dấu hiệu N+1)."""
+        if threshold <= 0:
+            return []
+        return [(shape, count) for shape, count in self.Shapes.most_common() if count >= threshold]
+
+    @property
+    def TotalMs(self) -> float:
+        return round(self.TotalSeconds * 1000, 2)
+
+
+def StartProfile() -> tuple[QueryProfile, object]:
+    profile = QueryProfile()
+    return profile, _current_profile.set(profile)
+
+
+def StopProfile(token) -> None:
+    _current_profile.reset(token)
+
+
+@contextmanager
+def ProfileQueries() -> Iterator[QueryProfile]:
+    """
+    Đo các query chạy trong block (cùng context), vd:
+
+        with ProfileQueries() as profile:
+            await service.GetPaged(...)
+        assert profile.Count <= 3
+    """
+    profile, token = StartProfile()
+    try:
+        yield profile
+    finally:
+        StopProfile(token)
+
+
+@contextmanager
+def AssertMaxQueries(max_queries: int) -> Iterator[QueryProfile]:
+    """
+    Helper cho test: AssertionError nếu block chạy quá max_queries query (kèm các shape để tìm N+1), vd:
+
+        with AssertMaxQueries(3):
+            client.get("/api/users?pageSize=50", headers=auth_headers)
+
+    Engine phải được gắn listener (InstallQueryProfiler). TestClient chạy request trong context
+    copy từ thread của test nên query của endpoint vẫn được đếm.
+    """
+    with ProfileQueries() as profile:
+        yield profile
+    if profile.Count > max_queries:
+        shapes = "\n".join(f"  {count}x {shape[:200]}" for shape, count in profile.Shapes.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, ran {profile.Count}:\n{shapes}")
+
+
+def _BeforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_profiler_started", []).append(time.perf_counter())
+
+
+def _AfterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started = conn.info.get("query_profiler_started")
+    if not started:
+        return
+    profile.Record(statement, time.perf_counter() - started.pop())
+
+
+def InstallQueryProfiler(engine: Engine) -> None:
+    """Gắn listener before/after_cursor_execute vào engine (async: truyền async_engine.sync_engine)."""
+    if not event.contains(engine, "before_cursor_execute", _BeforeCursorExecute):
+        event.listen(engine, "before_cursor_execute", _BeforeCursorExecute)
+        event.listen(engine, "after_cursor_execute", _AfterCursorExecute)
@@ -0,0 +1,93 @@
+import itertools
+import threading
+from contextvars import ContextVar
+from typing import Any, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Insert, Update
+
+from app.shared.memory_cache import TtlLruCache
+
+# Khoá read-your-writes của request hiện tại (vd "user:1"); request ẩn danh dùng chung khoá "*"
+_consistency_key: ContextVar[str | None] = ContextVar("db_consistency_key", default=None)
+
+
+def SetConsistencyKey(key: str | None) -> None:
+    _consistency_key.set(key)
+
+
+def _CurrentKey() -> str:
+    return _consistency_key.get() or "*"
+
+
+class ReplicaRouter:
+    """
+    Chọn engine cho RoutingSession.
+
+    - strategy "round_robin": lần lượt từng replica.
+    - strategy "least_connections": replica đang checkout ít connection nhất.
+    - Sau khi commit có ghi dữ liệu, khoá hiện tại được đọc từ primary trong read_your_writes_seconds.
+      Mốc ghi nằm trong process này: worker khác không biết => read-your-writes chỉ đúng trong 1 worker.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], strategy: str, read_your_writes_seconds: float):
+        self.Primary = primary
+        self.Replicas = replicas
+        self._strategy = strategy.lower()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._recent_writes: TtlLruCache[str, bool] = TtlLruCache(100_000, read_your_writes_seconds)
+
+    def PickReplica(self) -> Engine:
+        if self._strategy == "least_connections":
+            return min(self.Replicas, key=lambda e: e.pool.checkedout() if hasattr(e.pool, "checkedout") else 0)
+        with self._lock:
+            index = next(self._counter)
+        return self.Replicas[index % len(self.Replicas)]
+
+    def MarkWrite(self) -> None:
+        if self._recent_writes.Enabled:
+            self._recent_writes.Set(_CurrentKey(), True)
+
+    def InReadYourWritesWindow(self) -> bool:
+        return self._recent_writes.Enabled and self._recent_writes.Get(_CurrentKey()) is not None
+
+
+class RoutingSession(Session):
+    """
+    Session định tuyến theo từng câu lệnh (SQLAlchemy get_bind):
+
+    - Session không read-only (request ghi, job, CLI), flush, INSERT/UPDATE/DELETE => primary.
+    - Transaction đã ghi => mọi câu sau đó tới primary cho đến khi commit/rollback.
+    - Trong cửa sổ read-your-writes của khoá hiện tại => primary.
+    - Còn lại (SELECT của request read-only) => 1 replica, giữ cố định trong suốt session.
+    """
+
+    def __init__(self, router: ReplicaRouter, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        router = self._router
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["wrote"] = True
+            return router.Primary
+        if not self.info.get("read_only") or self.info.get("wrote") or router.InReadYourWritesWindow():
+            return router.Primary
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = router.PickReplica()
+        return replica
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _AfterCommit(session: RoutingSession) -> None:
+    if session.info.pop("wrote", False):
+        session._router.MarkWrite()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _AfterRollback(session: RoutingSession) -> None:
+    session.info.pop("wrote", None)
@@ -1,13 +1,111 @@
-from typing import Any, Callable, Dict, Tuple, Type, TypeVar
+import dataclasses
 import inspect
+import keyword
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type, TypeVar
 
 TSource = TypeVar("TSource")
 TDestination = TypeVar("TDestination")
 
 
+def _SourceFields(source_type: Type[Any]) -> List[str] | None:
+    """Danh sách field đọc được từ source (None nếu không xác định trước được, vd dict)."""
+    if dataclasses.is_dataclass(source_type):
+        return [f.name for f in dataclasses.fields(source_type)]
+    model_fields = getattr(source_type, "model_fields", None)  # Pydantic v2 BaseModel
+    if isinstance(model_fields, dict):
+        return list(model_fields.keys())
+    return None
+
+
+def _DestFields(dest_type: Type[Any]) -> set[str] | None:
+    """Tập tham số mà destination nhận khi khởi tạo (None nếu không inspect được)."""
+    if dataclasses.is_dataclass(dest_type):
+        return {f.name for f in dataclasses.fields(dest_type) if f.init}
+    model_fields = getattr(dest_type, "model_fields", None)
+    if isinstance(model_fields, dict):
+        return set(model_fields.keys())
+    try:
+        return set(inspect.signature(dest_type).parameters.keys())
+    except (TypeError, ValueError):
+        # Some callables/types may not have a signature we can inspect
+        return None
+
+
+def _IsTrustedSource(source_type: Type[Any]) -> bool:
+    """Domain entity (dataclass) đã hợp lệ => map sang DTO bằng model_construct, không validate lại."""
+    return dataclasses.is_dataclass(source_type)
+
+
+def _CompileMapping(source_type: Type[TSource], dest_type: Type[TDestination]) -> Callable[[TSource], TDestination]:
+    """
+    Tính trước field plan cho cặp (source, dest) một lần duy nhất và sinh hàm map chuyên biệt:
+
+    - dataclass -> Pydantic: Dest.model_construct(a=source.a, ...)
+    - Pydantic  -> Pydantic: Dest.model_validate({"a": source.a, ...})
+    - *         -> dataclass/class: Dest(a=source.a, ...)
+
+    Source không xác định được field (dict, object tuỳ ý) dùng đường generic,
+    nhưng signature của destination vẫn chỉ inspect một lần.
+    """
+    source_fields = _SourceFields(source_type)
+    dest_fields = _DestFields(dest_type)
+    is_pydantic_dest = hasattr(dest_type, "model_validate")
+
+    if is_pydantic_dest and _IsTrustedSource(source_type):
+        construct: Callable[..., Any] = dest_type.model_construct  # type: ignore[attr-defined]
+    elif is_pydantic_dest:
+        construct = lambda **data: dest_type.model_validate(data)  # type: ignore[attr-defined]  # noqa: E731
+    else:
+        construct = dest_type
+
+    if source_fields is not None and dest_fields is not None:
+        plan = [name for name in source_fields if name in dest_fields]
+        if all(name.isidentifier() and not keyword.iskeyword(name) for name in plan):
+            args = ", ".join(f"{name}=source.{name}" for name in plan)
+            namespace: Dict[str, Any] = {"_construct": construct}
+            exec(f"def _map(source):\n    return _construct({args})\n", namespace)
+            return namespace["_map"]
+        return lambda source: construct(**{name: getattr(source, name) for name in plan})
+
+    def generic_mapping(source: TSource) -> TDestination:
+        # 1) Extract data safely from source
+        if hasattr(source, "model_dump"):  # Pydantic v2 BaseModel
+            data = source.model_dump(exclude_unset=True)
+        elif hasattr(source, "dict"):  # Pydantic v1 BaseModel
+            data = source.dict(exclude_unset=True)
+        elif isinstance(source, dict):
+            data = dict(source)
+        else:
+            # fallback: only instance attributes (NOT dir())
+            data = dict(getattr(source, "__dict__", {}))
+
+        # 2) Filter keys by destination params (computed once at CreateMap)
+        #    This prevents "unexpected keyword argument" errors.
+        if dest_fields is not None:
+            data = {k: v for k, v in data.items() if k in dest_fields}
+
+        return construct(**data)
+
+    return generic_mapping
+
+
 class Mapper:
     def __init__(self):
         self._mappings: Dict[Tuple[Type[Any], Type[Any]], Callable[[Any], Any]] = {}
+        self._pending_configure: Callable[[], None] | None = None
+        self._configure_lock = threading.Lock()
+
+    def ConfigureOnFirstUse(self, configure: Callable[[], None]) -> None:
+        """Hoãn đăng ký profiles tới lần Map đầu tiên (giảm thời gian khởi động)."""
+        self._pending_configure = configure
+
+    def _RunPendingConfigure(self) -> None:
+        with self._configure_lock:
+            configure = self._pending_configure
+            if configure is not None:
+                configure()
+                self._pending_configure = None
 
     def CreateMap(
         self,
@@ -15,45 +113,35 @@ class Mapper:
         dest_type: Type[TDestination],
         mapping_func: Callable[[TSource], TDestination] | None = None,
     ):
-        def default_mapping(source: TSource) -> TDestination:
-            # 1) Extract data safely from source
-            if hasattr(source, "model_dump"):  # Pydantic v2 BaseModel
-                data = source.model_dump(exclude_unset=True)
-            elif hasattr(source, "dict"):  # Pydantic v1 BaseModel
-                data = source.dict(exclude_unset=True)
-            elif isinstance(source, dict):
-                data = dict(source)
-            else:
-                # fallback: only instance attributes (NOT dir())
-                data = dict(getattr(source, "__dict__", {}))
-
-            # 2) If destination is a normal class/dataclass, filter keys by its __init__ params
-            #    This prevents "unexpected keyword argument" errors.
-            try:
-                sig = inspect.signature(dest_type)
-                allowed = set(sig.parameters.keys())
-                data = {k: v for k, v in data.items() if k in allowed}
-            except (TypeError, ValueError):
-                # Some callables/types may not have a signature we can inspect
-                pass
-
-            # 3) If destination is Pydantic v2 model, validate/construct via model_validate
-            if hasattr(dest_type, "model_validate"):
-                return dest_type.model_validate(data)  # type: ignore
-
-            # 4) Normal Python class/dataclass
-            return dest_type(**data)  # type: ignore
-
-        self._mappings[(source_type, dest_type)] = mapping_func or default_mapping
+        self._mappings[(source_type, dest_type)] = mapping_func or _CompileMapping(source_type, dest_type)
         return self
 
-    def Map(self, source: TSource, dest_type: Type[TDestination]) -> TDestination:
-        mapping = self._mappings.get((type(source), dest_type))
+    def _GetMapping(self, source_type: Type[Any], dest_type: Type[TDestination]) -> Callable[[Any], TDestination]:
+        mapping = self._mappings.get((source_type, dest_type))
+        if not mapping and self._pending_configure is not None:
+            self._RunPendingConfigure()
+            mapping = self._mappings.get((source_type, dest_type))
         if not mapping:
             raise ValueError(
-                f"No mapping configured from {type(source).__name__} to {dest_type.__name__}"
+                f"No mapping configured from {source_type.__name__} to {dest_type.__name__}"
             )
-        return mapping(source)
+        return mapping
+
+    def Map(self, source: TSource, dest_type: Type[TDestination]) -> TDestination:
+        return self._GetMapping(type(source), dest_type)(source)
+
+    def MapMany(self, sources: Iterable[TSource], dest_type: Type[TDestination]) -> List[TDestination]:
+        """Map cả danh sách; chỉ tra mapping một lần cho mỗi kiểu source."""
+        result: List[TDestination] = []
+        mapping: Callable[[Any], TDestination] | None = None
+        mapped_type: Type[Any] | None = None
+        for source in sources:
+            source_type = type(source)
+            if source_type is not mapped_type:
+                mapping = self._GetMapping(source_type, dest_type)
+                mapped_type = source_type
+            result.append(mapping(source))  # type: ignore[misc]
+        return result
 
 
 MapperInstance = Mapper()
@@ -73,3 +161,8 @@ def ConfigureMappings():
     RoleProfile(MapperInstance)
     PermissionProfile(MapperInstance)
     DbModelProfile(MapperInstance)
+
+
+def ConfigureMappingsLazily():
+    """Giống ConfigureMappings() nhưng chỉ chạy (import profiles + compile mapping) ở lần Map đầu tiên."""
+    MapperInstance.ConfigureOnFirstUse(ConfigureMappings)
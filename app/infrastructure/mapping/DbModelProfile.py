@@ -45,6 +45,7 @@ class DbModelProfile:
                 full_name=model.full_name,
                 is_active=model.is_active,
                 password_hash=model.password_hash,
+                claims_version=model.claims_version,
             ),
         )
         mapper.CreateMap(
@@ -125,10 +126,10 @@ class DbModelProfile:
             lambda model: RefreshToken(
                 id=model.id,
                 user_id=model.user_id,
-                token=model.token,
+                token_hash=model.token_hash,
                 expires_at=model.expires_at,
                 revoked_at=model.revoked_at,
-                replaced_by_token=model.replaced_by_token,
+                replaced_by_token_hash=model.replaced_by_token_hash,
                 is_revoked=model.is_revoked,
             ),
         )
@@ -138,10 +139,10 @@ class DbModelProfile:
             lambda entity: RefreshTokenModel(
                 id=entity.id,
                 user_id=entity.user_id,
-                token=entity.token,
+                token_hash=entity.token_hash,
                 expires_at=entity.expires_at,
                 revoked_at=entity.revoked_at,
-                replaced_by_token=entity.replaced_by_token,
+                replaced_by_token_hash=entity.replaced_by_token_hash,
                 is_revoked=entity.is_revoked,
             ),
         )
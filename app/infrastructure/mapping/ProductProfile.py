@@ -1,9 +1,11 @@
 from app.infrastructure.mapping.AutoMapper import Mapper
 from app.domain.entities.Product import Product
 from app.application.dtos.ProductDto import ProductDto
+from app.application.dtos.ProductCreateDto import ProductCreateDto
 
 
 class ProductProfile:
     def __init__(self, mapper: Mapper):
         mapper.CreateMap(Product, ProductDto)
         mapper.CreateMap(ProductDto, Product)
+        mapper.CreateMap(ProductCreateDto, Product)
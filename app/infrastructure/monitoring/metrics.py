@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.application.services.PermissionResolver import PermissionResolver
+from app.infrastructure.auth.PasswordHasher import PasswordHasherStats
+from app.infrastructure.db.base import CurrentDbEngines, DbEngines
+from app.infrastructure.db.pool import PoolStats
+from app.shared.response_cache import ResponseCacheStats
+
+# Nhiều worker (gunicorn/uvicorn --workers): prometheus_client ghi metrics ra file mmap trong
+# PROMETHEUS_MULTIPROC_DIR (phải set env trước khi start), /metrics gộp số liệu của mọi process.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency theo route template và status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Số request đang xử lý",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Thời gian chạy câu lệnh SQL (count = số query)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+# Trạng thái tại thời điểm scrape (được làm mới bởi RefreshStateMetrics)
+DB_POOL_SIZE = Gauge("db_pool_size", "Pool size cấu hình", ["pool"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connection đang được dùng", ["pool"], multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connection overflow đang mở", ["pool"], multiprocess_mode="livesum")
+DB_POOL_CHECKOUT_TIMEOUTS = Gauge(
+    "db_pool_checkout_timeouts", "Số lần chờ checkout quá DB_POOL_TIMEOUT", ["pool"], multiprocess_mode="livesum"
+)
+PERMISSION_CACHE_HITS = Gauge("permission_cache_hits", "Cache quyền: số lần hit", multiprocess_mode="livesum")
+PERMISSION_CACHE_MISSES = Gauge("permission_cache_misses", "Cache quyền: số lần miss", multiprocess_mode="livesum")
+PERMISSION_CACHE_ENTRIES = Gauge("permission_cache_entries", "Cache quyền: số entry", multiprocess_mode="livesum")
+RESPONSE_CACHE_HITS = Gauge(
+    "response_cache_hits", "Response cache: số lần hit", ["namespace"], multiprocess_mode="livesum"
+)
+RESPONSE_CACHE_MISSES = Gauge(
+    "response_cache_misses", "Response cache: số lần miss", ["namespace"], multiprocess_mode="livesum"
+)
+RESPONSE_CACHE_ENTRIES = Gauge("response_cache_entries", "Response cache: số entry", multiprocess_mode="livesum")
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "bcrypt hash/verify đang chạy + đang chờ", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge("password_hash_queue_depth", "bcrypt đang chờ worker", multiprocess_mode="livesum")
+PASSWORD_HASH_REJECTED = Gauge("password_hash_rejected", "bcrypt bị từ chối (429)", multiprocess_mode="livesum")
+
+
+def _BeforeCursorExecute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+def InstallQueryMetrics(db_engine: Engine, name: str) -> None:
+    """Đo số query / thời gian query của engine (async: truyền async_engine.sync_engine)."""
+    histogram = DB_QUERY_DURATION.labels(engine=name)
+
+    def _AfterCursorExecute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("metrics_query_started")
+        if started:
+            histogram.observe(time.perf_counter() - started.pop())
+
+    event.listen(db_engine, "before_cursor_execute", _BeforeCursorExecute)
+    event.listen(db_engine, "after_cursor_execute", _AfterCursorExecute)
+
+
+def InstallAllQueryMetrics(engines: DbEngines) -> None:
+    for name, db_engine in engines.SyncEngines():
+        InstallQueryMetrics(db_engine, name)
+
+
+def RefreshStateMetrics() -> None:
+    """Cập nhật gauge trạng thái (pool, cache quyền, response cache, bcrypt) của process hiện tại."""
+    engines = CurrentDbEngines()
+    for name, db_engine in engines.SyncEngines() if engines is not None else []:
+        stats = PoolStats(db_engine) or {}
+        DB_POOL_SIZE.labels(pool=name).set(stats.get("size", 0))
+        DB_POOL_CHECKED_OUT.labels(pool=name).set(stats.get("checked_out", 0))
+        DB_POOL_OVERFLOW.labels(pool=name).set(stats.get("overflow", 0))
+        DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=name).set(stats.get("timeouts", 0))
+
+    cache = PermissionResolver.CacheStats()
+    PERMISSION_CACHE_HITS.set(cache.get("hits", 0))
+    PERMISSION_CACHE_MISSES.set(cache.get("misses", 0))
+    PERMISSION_CACHE_ENTRIES.set(cache.get("size", 0))
+
+    response_cache = ResponseCacheStats()
+    RESPONSE_CACHE_ENTRIES.set(response_cache["size"])
+    for namespace, counter in response_cache["namespaces"].items():
+        RESPONSE_CACHE_HITS.labels(namespace=namespace).set(counter["hits"])
+        RESPONSE_CACHE_MISSES.labels(namespace=namespace).set(counter["misses"])
+
+    hasher = PasswordHasherStats()
+    PASSWORD_HASH_IN_FLIGHT.set(hasher["in_flight"])
+    PASSWORD_HASH_QUEUE_DEPTH.set(hasher["queue_depth"])
+    PASSWORD_HASH_REJECTED.set(hasher["rejected"])
+
+
+async def RunStateMetricsLoop(interval_seconds: float) -> None:
+    """Multiprocess: mỗi worker tự làm mới gauge trạng thái để /metrics (ở worker bất kỳ) thấy đủ mọi process."""
+    while True:
+        RefreshStateMetrics()
+        await asyncio.sleep(interval_seconds)
+
+
+def RenderMetrics() -> tuple[bytes, str]:
+    RefreshStateMetrics()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
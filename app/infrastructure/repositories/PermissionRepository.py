@@ -1,79 +1,116 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import delete, select, update
 
 from app.domain.repositories.IPermissionRepository import IPermissionRepository
 from app.domain.entities.Permission import Permission
+from app.domain.entities.UserAccess import UserAccess
+from app.domain.entities.EntityVersion import EntityVersion
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.audit_mixin import QueryVersion
 from app.infrastructure.db.models.permission_model import PermissionModel
+from app.infrastructure.db.models.role_model import RoleModel
 from app.infrastructure.db.models.role_permission_model import RolePermissionModel
+from app.infrastructure.db.models.user_role_model import UserRoleModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
 
 
 class PermissionRepository(IPermissionRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def GetAll(self) -> List[Permission]:
-        rows = self._session.query(PermissionModel).all()
-        return [MapperInstance.Map(r, Permission) for r in rows]
+        rows = await self._db.Scalars(select(PermissionModel))
+        return MapperInstance.MapMany(rows, Permission)
+
+    async def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Permission]:
+        async for row in self._db.StreamScalars(select(PermissionModel).order_by(PermissionModel.id), batch_size):
+            yield MapperInstance.Map(row, Permission)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await QueryVersion(self._db, PermissionModel)
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await QueryVersion(self._db, PermissionModel, PermissionModel.id == id)
 
     async def GetById(self, id: int) -> Optional[Permission]:
-        row = self._session.query(PermissionModel).filter(PermissionModel.id == id).first()
+        row = await self._db.First(select(PermissionModel).where(PermissionModel.id == id))
         return MapperInstance.Map(row, Permission) if row else None
 
     async def GetByName(self, name: str) -> Optional[Permission]:
-        row = self._session.query(PermissionModel).filter(PermissionModel.name == name).first()
+        row = await self._db.First(select(PermissionModel).where(PermissionModel.name == name))
         return MapperInstance.Map(row, Permission) if row else None
 
     async def Add(self, entity: Permission) -> Permission:
         row = MapperInstance.Map(entity, PermissionModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
     async def Update(self, entity: Permission) -> Permission:
-        row = self._session.query(PermissionModel).filter(PermissionModel.id == entity.id).first()
-        if not row:
+        result = await self._db.Execute(
+            update(PermissionModel)
+            .where(PermissionModel.id == entity.id)
+            .values(
+                name=entity.name,
+                description=entity.description,
+                is_active=entity.is_active,
+            )
+        )
+        if result.rowcount == 0:
             raise KeyError("Permission not found")
-        row.name = entity.name
-        row.description = entity.description
-        row.is_active = entity.is_active
-        self._session.flush()
         return entity
 
     async def Delete(self, id: int) -> None:
-        row = self._session.query(PermissionModel).filter(PermissionModel.id == id).first()
-        if row:
-            self._session.delete(row)
-            self._session.flush()
+        await self._db.Execute(delete(PermissionModel).where(PermissionModel.id == id))
 
     async def AssignPermissionToRole(self, permission_id: int, role_id: int) -> None:
-        existing = (
-            self._session.query(RolePermissionModel)
-            .filter(RolePermissionModel.role_id == role_id, RolePermissionModel.permission_id == permission_id)
-            .first()
+        existing = await self._db.First(
+            select(RolePermissionModel).where(
+                RolePermissionModel.role_id == role_id,
+                RolePermissionModel.permission_id == permission_id,
+            )
         )
         if existing:
             return
         link = RolePermissionModel(role_id=role_id, permission_id=permission_id)
-        self._session.add(link)
-        self._session.flush()
+        self._db.Add(link)
+        await self._db.Flush()
 
     async def RemovePermissionFromRole(self, permission_id: int, role_id: int) -> None:
-        link = (
-            self._session.query(RolePermissionModel)
-            .filter(RolePermissionModel.role_id == role_id, RolePermissionModel.permission_id == permission_id)
-            .first()
+        await self._db.Execute(
+            delete(RolePermissionModel).where(
+                RolePermissionModel.role_id == role_id,
+                RolePermissionModel.permission_id == permission_id,
+            )
         )
-        if link:
-            self._session.delete(link)
-            self._session.flush()
 
     async def GetPermissionsByRole(self, role_id: int) -> List[Permission]:
-        joins = (
-            self._session.query(PermissionModel)
+        joins = await self._db.Scalars(
+            select(PermissionModel)
             .join(RolePermissionModel, RolePermissionModel.permission_id == PermissionModel.id)
-            .filter(RolePermissionModel.role_id == role_id)
-            .all()
+            .where(RolePermissionModel.role_id == role_id)
+        )
+        return MapperInstance.MapMany(joins, Permission)
+
+    async def GetUserAccess(self, user_id: int) -> UserAccess:
+        result = await self._db.Execute(
+            select(RoleModel.id, RoleModel.name, PermissionModel.name)
+            .select_from(UserRoleModel)
+            .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .outerjoin(RolePermissionModel, RolePermissionModel.role_id == RoleModel.id)
+            .outerjoin(PermissionModel, PermissionModel.id == RolePermissionModel.permission_id)
+            .where(UserRoleModel.user_id == user_id)
+        )
+        roles: dict[int, str] = {}
+        permissions: set[str] = set()
+        for role_id, role_name, permission_name in result.all():
+            roles[role_id] = role_name
+            if permission_name is not None:
+                permissions.add(permission_name)
+        return UserAccess(
+            user_id=user_id,
+            role_ids=list(roles.keys()),
+            role_names=list(roles.values()),
+            permissions=sorted(permissions),
         )
-        return [MapperInstance.Map(r, Permission) for r in joins]
@@ -1,43 +1,66 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import delete, insert, select, update
 
 from app.domain.repositories.IProductRepository import IProductRepository
 from app.domain.entities.Product import Product
+from app.domain.entities.EntityVersion import EntityVersion
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.audit_mixin import QueryVersion
 from app.infrastructure.db.models.product_model import ProductModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
 
 
 class ProductRepository(IProductRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def GetAll(self) -> List[Product]:
-        rows = self._session.query(ProductModel).all()
-        return [MapperInstance.Map(r, Product) for r in rows]
+        rows = await self._db.Scalars(select(ProductModel))
+        return MapperInstance.MapMany(rows, Product)
+
+    async def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Product]:
+        async for row in self._db.StreamScalars(select(ProductModel).order_by(ProductModel.id), batch_size):
+            yield MapperInstance.Map(row, Product)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await QueryVersion(self._db, ProductModel)
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await QueryVersion(self._db, ProductModel, ProductModel.id == id)
 
     async def GetById(self, id: int) -> Optional[Product]:
-        row = self._session.query(ProductModel).filter(ProductModel.id == id).first()
+        row = await self._db.First(select(ProductModel).where(ProductModel.id == id))
         return MapperInstance.Map(row, Product) if row else None
 
     async def Add(self, entity: Product) -> Product:
         row = MapperInstance.Map(entity, ProductModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
+    async def AddRange(self, entities: List[Product]) -> None:
+        """Insert nhiều dòng bằng 1 câu INSERT executemany (không lấy lại id)."""
+        if not entities:
+            return
+        await self._db.Execute(
+            insert(ProductModel),
+            [{"name": e.name, "price": e.price, "is_active": e.is_active} for e in entities],
+        )
+
     async def Update(self, entity: Product) -> Product:
-        row = self._session.query(ProductModel).filter(ProductModel.id == entity.id).first()
-        if not row:
+        result = await self._db.Execute(
+            update(ProductModel)
+            .where(ProductModel.id == entity.id)
+            .values(
+                name=entity.name,
+                price=entity.price,
+                is_active=entity.is_active,
+            )
+        )
+        if result.rowcount == 0:
             raise KeyError("Product not found")
-        row.name = entity.name
-        row.price = entity.price
-        row.is_active = entity.is_active
-        self._session.flush()
         return entity
 
     async def Delete(self, id: int) -> None:
-        row = self._session.query(ProductModel).filter(ProductModel.id == id).first()
-        if row:
-            self._session.delete(row)
-            self._session.flush()
+        await self._db.Execute(delete(ProductModel).where(ProductModel.id == id))
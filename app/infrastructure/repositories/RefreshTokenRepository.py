@@ -1,51 +1,82 @@
+from datetime import datetime
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, delete, func, or_, select, update
 
 from app.domain.repositories.IRefreshTokenRepository import IRefreshTokenRepository
 from app.domain.entities.RefreshToken import RefreshToken
+from app.infrastructure.db.DbContext import DbContext
 from app.infrastructure.db.models.refresh_token_model import RefreshTokenModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
 
 
 class RefreshTokenRepository(IRefreshTokenRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def Add(self, entity: RefreshToken) -> RefreshToken:
         row = MapperInstance.Map(entity, RefreshTokenModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
-    async def GetByToken(self, token: str) -> Optional[RefreshToken]:
-        row = self._session.query(RefreshTokenModel).filter(RefreshTokenModel.token == token).first()
+    async def GetByTokenHash(self, token_hash: bytes) -> Optional[RefreshToken]:
+        row = await self._db.First(select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash))
         return MapperInstance.Map(row, RefreshToken) if row else None
 
     async def Revoke(self, token: RefreshToken) -> None:
-        row = self._session.query(RefreshTokenModel).filter(RefreshTokenModel.id == token.id).first()
-        if row:
-            row.is_revoked = True
-            self._session.flush()
+        await self._db.Execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == token.id, RefreshTokenModel.is_revoked == False)  # noqa: E712
+            .values(is_revoked=True, revoked_at=datetime.utcnow(), replaced_by_token_hash=token.replaced_by_token_hash)
+        )
 
     async def RevokeAllForUser(self, user_id: int) -> None:
-        rows = self._session.query(RefreshTokenModel).filter(
-            and_(RefreshTokenModel.user_id == user_id, RefreshTokenModel.is_revoked == False)  # noqa: E712
+        # Một câu UPDATE set-based, không load từng token lên Python
+        await self._db.Execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.user_id == user_id, RefreshTokenModel.is_revoked == False)  # noqa: E712
+            .values(is_revoked=True, revoked_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
         )
-        for row in rows:
-            row.is_revoked = True
-        self._session.flush()
 
     async def GetValidTokensForUser(self, user_id: int) -> List[RefreshToken]:
-        from datetime import datetime
-
         now = datetime.utcnow()
-        rows = self._session.query(RefreshTokenModel).filter(
-            and_(
-                RefreshTokenModel.user_id == user_id,
-                RefreshTokenModel.is_revoked == False,  # noqa: E712
-                RefreshTokenModel.expires_at > now,
+        rows = await self._db.Scalars(
+            select(RefreshTokenModel).where(
+                and_(
+                    RefreshTokenModel.user_id == user_id,
+                    RefreshTokenModel.is_revoked == False,  # noqa: E712
+                    RefreshTokenModel.expires_at > now,
+                )
+            )
+        )
+        return MapperInstance.MapMany(rows, RefreshToken)
+
+    async def DeleteExpiredBatch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Xoá tối đa batch_size token hết hạn trước cutoff hoặc đã revoke trước cutoff.
+        Lấy id trước rồi DELETE ... IN (MySQL không hỗ trợ LIMIT trong subquery IN).
+        """
+        ids = await self._db.Scalars(
+            select(RefreshTokenModel.id)
+            .where(
+                or_(
+                    RefreshTokenModel.expires_at < cutoff,
+                    and_(
+                        RefreshTokenModel.is_revoked == True,  # noqa: E712
+                        func.coalesce(RefreshTokenModel.revoked_at, RefreshTokenModel.created_at) < cutoff,
+                    ),
+                )
             )
+            .order_by(RefreshTokenModel.id)
+            .limit(batch_size)
+        )
+        if not ids:
+            return 0
+        result = await self._db.Execute(
+            delete(RefreshTokenModel)
+            .where(RefreshTokenModel.id.in_(ids))
+            .execution_options(synchronize_session=False)
         )
-        return [MapperInstance.Map(r, RefreshToken) for r in rows]
+        return result.rowcount
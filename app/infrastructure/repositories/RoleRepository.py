@@ -1,95 +1,112 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import delete, select, update
 
 from app.domain.repositories.IRoleRepository import IRoleRepository
 from app.domain.entities.Role import Role
+from app.domain.entities.EntityVersion import EntityVersion
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.audit_mixin import QueryVersion
 from app.infrastructure.db.models.role_model import RoleModel
 from app.infrastructure.db.models.user_role_model import UserRoleModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
 
 
 class RoleRepository(IRoleRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def GetAll(self) -> List[Role]:
-        rows = self._session.query(RoleModel).all()
-        return [MapperInstance.Map(r, Role) for r in rows]
+        rows = await self._db.Scalars(select(RoleModel))
+        return MapperInstance.MapMany(rows, Role)
+
+    async def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[Role]:
+        async for row in self._db.StreamScalars(select(RoleModel).order_by(RoleModel.id), batch_size):
+            yield MapperInstance.Map(row, Role)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await QueryVersion(self._db, RoleModel)
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await QueryVersion(self._db, RoleModel, RoleModel.id == id)
 
     async def GetById(self, id: int) -> Optional[Role]:
-        row = self._session.query(RoleModel).filter(RoleModel.id == id).first()
+        row = await self._db.First(select(RoleModel).where(RoleModel.id == id))
         return MapperInstance.Map(row, Role) if row else None
 
     async def GetByName(self, name: str) -> Optional[Role]:
-        row = self._session.query(RoleModel).filter(RoleModel.name == name).first()
+        row = await self._db.First(select(RoleModel).where(RoleModel.name == name))
         return MapperInstance.Map(row, Role) if row else None
 
     async def GetByNames(self, names: List[str]) -> List[Role]:
         if not names:
             return []
-        rows = self._session.query(RoleModel).filter(RoleModel.name.in_(names)).all()
-        return [MapperInstance.Map(r, Role) for r in rows]
+        rows = await self._db.Scalars(select(RoleModel).where(RoleModel.name.in_(names)))
+        return MapperInstance.MapMany(rows, Role)
 
     async def GetByIds(self, ids: List[int]) -> List[Role]:
         if not ids:
             return []
-        rows = self._session.query(RoleModel).filter(RoleModel.id.in_(ids)).all()
-        return [MapperInstance.Map(r, Role) for r in rows]
+        rows = await self._db.Scalars(select(RoleModel).where(RoleModel.id.in_(ids)))
+        return MapperInstance.MapMany(rows, Role)
 
     async def Add(self, entity: Role) -> Role:
         row = MapperInstance.Map(entity, RoleModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
     async def Update(self, entity: Role) -> Role:
-        row = self._session.query(RoleModel).filter(RoleModel.id == entity.id).first()
-        if not row:
+        result = await self._db.Execute(
+            update(RoleModel)
+            .where(RoleModel.id == entity.id)
+            .values(
+                name=entity.name,
+                description=entity.description,
+                is_active=entity.is_active,
+            )
+        )
+        if result.rowcount == 0:
             raise KeyError("Role not found")
-        row.name = entity.name
-        row.description = entity.description
-        row.is_active = entity.is_active
-        self._session.flush()
         return entity
 
     async def Delete(self, id: int) -> None:
-        row = self._session.query(RoleModel).filter(RoleModel.id == id).first()
-        if row:
-            self._session.delete(row)
-            self._session.flush()
+        await self._db.Execute(delete(RoleModel).where(RoleModel.id == id))
 
     async def AssignRoleToUser(self, user_id: int, role_id: int) -> None:
-        existing = (
-            self._session.query(UserRoleModel)
-            .filter(UserRoleModel.user_id == user_id, UserRoleModel.role_id == role_id)
-            .first()
+        existing = await self._db.First(
+            select(UserRoleModel).where(UserRoleModel.user_id == user_id, UserRoleModel.role_id == role_id)
         )
         if existing:
             return
         link = UserRoleModel(user_id=user_id, role_id=role_id)
-        self._session.add(link)
-        self._session.flush()
+        self._db.Add(link)
+        await self._db.Flush()
 
     async def RemoveRoleFromUser(self, user_id: int, role_id: int) -> None:
-        link = (
-            self._session.query(UserRoleModel)
-            .filter(UserRoleModel.user_id == user_id, UserRoleModel.role_id == role_id)
-            .first()
+        await self._db.Execute(
+            delete(UserRoleModel).where(UserRoleModel.user_id == user_id, UserRoleModel.role_id == role_id)
         )
-        if link:
-            self._session.delete(link)
-            self._session.flush()
 
     async def ClearRolesForUser(self, user_id: int) -> None:
-        self._session.query(UserRoleModel).filter(UserRoleModel.user_id == user_id).delete()
-        self._session.flush()
+        await self._db.Execute(delete(UserRoleModel).where(UserRoleModel.user_id == user_id))
+        await self._db.Flush()
 
     async def GetRolesByUser(self, user_id: int) -> List[Role]:
-        joins = (
-            self._session.query(RoleModel)
+        joins = await self._db.Scalars(
+            select(RoleModel)
             .join(UserRoleModel, UserRoleModel.role_id == RoleModel.id)
-            .filter(UserRoleModel.user_id == user_id)
-            .all()
+            .where(UserRoleModel.user_id == user_id)
+        )
+        return MapperInstance.MapMany(joins, Role)
+
+    async def GetRoleIdsByUsers(self, user_ids: List[int]) -> Dict[int, List[int]]:
+        result: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return result
+        rows = await self._db.Execute(
+            select(UserRoleModel.user_id, UserRoleModel.role_id).where(UserRoleModel.user_id.in_(user_ids))
         )
-        return [MapperInstance.Map(r, Role) for r in joins]
+        for user_id, role_id in rows.all():
+            result[user_id].append(role_id)
+        return result
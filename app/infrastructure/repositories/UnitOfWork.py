@@ -17,15 +17,18 @@ from app.infrastructure.repositories.RefreshTokenRepository import RefreshTokenR
 class UnitOfWork(IUnitOfWork):
     def __init__(self, db_context: DbContext):
         self._db_context = db_context
-        self.WeatherForecasts: IWeatherForecastRepository = WeatherForecastRepository(db_context.Session)
-        self.Users: IUserRepository = UserRepository(db_context.Session)
-        self.Products: IProductRepository = ProductRepository(db_context.Session)
-        self.Roles: IRoleRepository = RoleRepository(db_context.Session)
-        self.Permissions: IPermissionRepository = PermissionRepository(db_context.Session)
-        self.RefreshTokens: IRefreshTokenRepository = RefreshTokenRepository(db_context.Session)
+        self.WeatherForecasts: IWeatherForecastRepository = WeatherForecastRepository(db_context)
+        self.Users: IUserRepository = UserRepository(db_context)
+        self.Products: IProductRepository = ProductRepository(db_context)
+        self.Roles: IRoleRepository = RoleRepository(db_context)
+        self.Permissions: IPermissionRepository = PermissionRepository(db_context)
+        self.RefreshTokens: IRefreshTokenRepository = RefreshTokenRepository(db_context)
 
     async def SaveChanges(self) -> None:
-        self._db_context.Session.commit()
+        await self._db_context.Commit()
+
+    async def Rollback(self) -> None:
+        await self._db_context.Rollback()
 
     async def Dispose(self) -> None:
-        self._db_context.Dispose()
+        await self._db_context.Dispose()
@@ -1,30 +1,66 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import Select, and_, asc, delete, desc, func, literal, or_, select, update
 
 from app.domain.repositories.IUserRepository import IUserRepository
 from app.domain.entities.User import User
+from app.infrastructure.db.DbContext import DbContext
 from app.infrastructure.db.models.user_model import UserModel
+from app.infrastructure.db.models.user_role_model import UserRoleModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
+from app.shared.logging_config import get_logger
+from app.shared.pagination import DecodeCursor, EncodeCursor
+
+logger = get_logger(__name__)
+
+_SORT_MAP = {
+    "id": UserModel.id,
+    "username": UserModel.user_name,
+    "user_name": UserModel.user_name,
+    "email": UserModel.email,
+    "fullname": UserModel.full_name,
+    "full_name": UserModel.full_name,
+    "isactive": UserModel.is_active,
+    "is_active": UserModel.is_active,
+}
+
+# Cột sort cho keyset pagination, key = tên cột (được lưu trong cursor) => kiểu của giá trị "v" trong cursor.
+# Sort trên cột gốc để dùng được index (cột, id) (ix_users_full_name_id, ix_users_is_active_id, unique index).
+_KEYSET_COLUMNS = {
+    "id": (UserModel.id, int),
+    "user_name": (UserModel.user_name, str),
+    "email": (UserModel.email, str),
+    "full_name": (UserModel.full_name, str),
+    "is_active": (UserModel.is_active, bool),
+}
+# Cột nullable: NULL luôn được coi là nhỏ nhất (asc: đứng đầu, desc: đứng cuối)
+_NULLABLE_KEYSET_COLUMNS = {"full_name"}
+# Dialect mặc định coi NULL là lớn nhất khi sort => thêm NULLS FIRST / NULLS LAST
+# (MySQL, SQLite mặc định NULL nhỏ nhất và MySQL không hỗ trợ cú pháp NULLS FIRST)
+_NULLS_LARGEST_DIALECTS = {"postgresql", "oracle"}
 
 
 class UserRepository(IUserRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def GetAll(self) -> List[User]:
-        rows = self._session.query(UserModel).all()
-        return [MapperInstance.Map(r, User) for r in rows]
+        rows = await self._db.Scalars(select(UserModel))
+        return MapperInstance.MapMany(rows, User)
 
     async def GetById(self, id: int) -> Optional[User]:
-        row = self._session.query(UserModel).filter(UserModel.id == id).first()
+        row = await self._db.First(select(UserModel).where(UserModel.id == id))
         return MapperInstance.Map(row, User) if row else None
 
     async def GetByUserName(self, user_name: str) -> Optional[User]:
-        row = self._session.query(UserModel).filter(UserModel.user_name == user_name).first()
-        print(row)
+        row = await self._db.First(select(UserModel).where(UserModel.user_name == user_name))
+        logger.debug("GetByUserName %s: found=%s", user_name, row is not None)
         return MapperInstance.Map(row, User) if row else None
 
+    async def GetClaimsVersion(self, id: int) -> Optional[int]:
+        return await self._db.Scalar(
+            select(UserModel.claims_version).where(UserModel.id == id, UserModel.is_active.is_(True))
+        )
+
     async def Search(
         self,
         page: int,
@@ -34,36 +70,11 @@ class UserRepository(IUserRepository):
         search: str | None,
         is_active: bool | None,
     ) -> Tuple[List[User], int]:
-        query = self._session.query(UserModel)
-
-        if is_active is not None:
-            query = query.filter(UserModel.is_active == is_active)
-
-        if search:
-            like_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    UserModel.user_name.ilike(like_pattern),
-                    UserModel.email.ilike(like_pattern),
-                    UserModel.full_name.ilike(like_pattern),
-                )
-            )
+        query = self._FilterQuery(select(UserModel), search, is_active)
 
-        sort_key = (sort_by or "id").lower()
+        sort_column = _SORT_MAP.get((sort_by or "id").lower(), UserModel.id)
         sort_dir = (sort_dir or "asc").lower()
 
-        sort_map = {
-            "id": UserModel.id,
-            "username": UserModel.user_name,
-            "user_name": UserModel.user_name,
-            "email": UserModel.email,
-            "fullname": UserModel.full_name,
-            "full_name": UserModel.full_name,
-            "isactive": UserModel.is_active,
-            "is_active": UserModel.is_active,
-        }
-        sort_column = sort_map.get(sort_key, UserModel.id)
-
         if sort_dir == "desc":
             query = query.order_by(desc(sort_column))
         else:
@@ -74,32 +85,143 @@ class UserRepository(IUserRepository):
         if page_size <= 0:
             page_size = 10
 
-        total = query.count()
-        rows = query.offset((page - 1) * page_size).limit(page_size).all()
+        total = await self._db.Scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        rows = await self._db.Scalars(query.offset((page - 1) * page_size).limit(page_size))
 
-        return [MapperInstance.Map(r, User) for r in rows], total
+        return MapperInstance.MapMany(rows, User), total
+
+    async def SearchByCursor(
+        self,
+        cursor: str | None,
+        page_size: int,
+        sort_by: str | None,
+        sort_dir: str,
+        search: str | None,
+        is_active: bool | None,
+        include_total: bool,
+    ) -> Tuple[List[User], str | None, int | None]:
+        if page_size <= 0:
+            page_size = 10
+
+        if cursor:
+            # Cursor giữ nguyên sort của trang đầu tiên
+            position = self._ParseCursor(cursor)
+            sort_key, sort_dir = position["s"], position["d"]
+        else:
+            position = None
+            sort_column = _SORT_MAP.get((sort_by or "id").lower(), UserModel.id)
+            sort_key = sort_column.key
+            sort_dir = "desc" if (sort_dir or "asc").lower() == "desc" else "asc"
+
+        sort_expr = _KEYSET_COLUMNS[sort_key][0]
+        descending = sort_dir == "desc"
+        filtered = self._FilterQuery(select(UserModel), search, is_active)
+        query = filtered
+
+        if position is not None:
+            query = query.where(self._AfterPosition(sort_key, position["v"], position["id"], descending))
+
+        sort_order = desc(sort_expr) if descending else asc(sort_expr)
+        if sort_key in _NULLABLE_KEYSET_COLUMNS and self._db.Dialect in _NULLS_LARGEST_DIALECTS:
+            sort_order = sort_order.nulls_last() if descending else sort_order.nulls_first()
+        query = query.order_by(sort_order, desc(UserModel.id) if descending else asc(UserModel.id))
+
+        # Lấy dư 1 dòng để biết còn trang sau hay không (không cần COUNT)
+        rows = await self._db.Scalars(query.limit(page_size + 1))
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = EncodeCursor({"s": sort_key, "d": sort_dir, "v": getattr(last, sort_key), "id": last.id})
+
+        total = None
+        if include_total:
+            total = await self._db.Scalar(select(func.count()).select_from(filtered.subquery()))
+
+        return MapperInstance.MapMany(rows, User), next_cursor, total
+
+    @staticmethod
+    def _ParseCursor(cursor: str) -> dict[str, Any]:
+        """Giải mã + kiểm tra cursor: id là int, "v" đúng kiểu của cột sort (None chỉ với cột nullable)."""
+        position = DecodeCursor(cursor)
+        sort_key, last_value, last_id = position.get("s"), position.get("v"), position.get("id")
+        if sort_key not in _KEYSET_COLUMNS or position.get("d") not in ("asc", "desc") or type(last_id) is not int:
+            raise ValueError("Invalid cursor")
+        # type() thay vì isinstance: bool là subclass của int
+        value_type = _KEYSET_COLUMNS[sort_key][1]
+        if type(last_value) is not value_type and not (last_value is None and sort_key in _NULLABLE_KEYSET_COLUMNS):
+            raise ValueError("Invalid cursor")
+        return position
+
+    @staticmethod
+    def _AfterPosition(sort_key: str, last_value: Any, last_id: int, descending: bool) -> Any:
+        """Điều kiện "đứng sau (last_value, last_id)" theo thứ tự sort, NULL được coi là nhỏ nhất."""
+        sort_expr = _KEYSET_COLUMNS[sort_key][0]
+        id_after = UserModel.id < last_id if descending else UserModel.id > last_id
+        if last_value is None:
+            if descending:
+                # NULL đứng cuối: chỉ còn các dòng NULL có id sau last_id
+                return and_(sort_expr.is_(None), id_after)
+            return or_(sort_expr.is_not(None), and_(sort_expr.is_(None), id_after))
+
+        # literal(): so sánh > / < với True/False (cột bool) phải đi qua bind parameter
+        value = literal(last_value, sort_expr.type)
+        value_after = sort_expr < value if descending else sort_expr > value
+        condition = or_(value_after, and_(sort_expr == value, id_after))
+        if descending and sort_key in _NULLABLE_KEYSET_COLUMNS:
+            condition = or_(condition, sort_expr.is_(None))
+        return condition
+
+    @staticmethod
+    def _FilterQuery(query: Select, search: str | None, is_active: bool | None) -> Select:
+        if is_active is not None:
+            query = query.where(UserModel.is_active == is_active)
+
+        if search:
+            like_pattern = f"%{search}%"
+            query = query.where(
+                or_(
+                    UserModel.user_name.ilike(like_pattern),
+                    UserModel.email.ilike(like_pattern),
+                    UserModel.full_name.ilike(like_pattern),
+                )
+            )
+        return query
 
     async def Add(self, entity: User) -> User:
         row = MapperInstance.Map(entity, UserModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
     async def Update(self, entity: User) -> User:
-        row = self._session.query(UserModel).filter(UserModel.id == entity.id).first()
-        if not row:
+        result = await self._db.Execute(
+            update(UserModel)
+            .where(UserModel.id == entity.id)
+            .values(
+                user_name=entity.user_name,
+                email=entity.email,
+                full_name=entity.full_name,
+                is_active=entity.is_active,
+                password_hash=entity.password_hash,
+                claims_version=UserModel.claims_version + 1,
+            )
+        )
+        if result.rowcount == 0:
             raise KeyError("User not found")
-        row.user_name = entity.user_name
-        row.email = entity.email
-        row.full_name = entity.full_name
-        row.is_active = entity.is_active
-        row.password_hash = entity.password_hash
-        self._session.flush()
         return entity
 
     async def Delete(self, id: int) -> None:
-        row = self._session.query(UserModel).filter(UserModel.id == id).first()
-        if row:
-            self._session.delete(row)
-            self._session.flush()
+        await self._db.Execute(delete(UserModel).where(UserModel.id == id))
+
+    async def RevokeClaims(self, id: int) -> None:
+        await self._db.Execute(
+            update(UserModel).where(UserModel.id == id).values(claims_version=UserModel.claims_version + 1)
+        )
+
+    async def RevokeClaimsByRole(self, role_id: int) -> None:
+        user_ids = select(UserRoleModel.user_id).where(UserRoleModel.role_id == role_id)
+        await self._db.Execute(
+            update(UserModel).where(UserModel.id.in_(user_ids)).values(claims_version=UserModel.claims_version + 1)
+        )
@@ -1,43 +1,66 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import delete, insert, select, update
 
 from app.domain.repositories.IWeatherForecastRepository import IWeatherForecastRepository
 from app.domain.entities.WeatherForecast import WeatherForecast
+from app.domain.entities.EntityVersion import EntityVersion
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.audit_mixin import QueryVersion
 from app.infrastructure.db.models.weather_forecast_model import WeatherForecastModel
 from app.infrastructure.mapping.AutoMapper import MapperInstance
 
 
 class WeatherForecastRepository(IWeatherForecastRepository):
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, db_context: DbContext):
+        self._db = db_context
 
     async def GetAll(self) -> List[WeatherForecast]:
-        rows = self._session.query(WeatherForecastModel).all()
-        return [MapperInstance.Map(r, WeatherForecast) for r in rows]
+        rows = await self._db.Scalars(select(WeatherForecastModel))
+        return MapperInstance.MapMany(rows, WeatherForecast)
+
+    async def StreamAll(self, batch_size: int = 1000) -> AsyncIterator[WeatherForecast]:
+        async for row in self._db.StreamScalars(select(WeatherForecastModel).order_by(WeatherForecastModel.id), batch_size):
+            yield MapperInstance.Map(row, WeatherForecast)
+
+    async def GetVersion(self) -> EntityVersion:
+        return await QueryVersion(self._db, WeatherForecastModel)
+
+    async def GetVersionById(self, id: int) -> EntityVersion:
+        return await QueryVersion(self._db, WeatherForecastModel, WeatherForecastModel.id == id)
 
     async def GetById(self, id: int) -> Optional[WeatherForecast]:
-        row = self._session.query(WeatherForecastModel).filter(WeatherForecastModel.id == id).first()
+        row = await self._db.First(select(WeatherForecastModel).where(WeatherForecastModel.id == id))
         return MapperInstance.Map(row, WeatherForecast) if row else None
 
     async def Add(self, entity: WeatherForecast) -> WeatherForecast:
         row = MapperInstance.Map(entity, WeatherForecastModel)
-        self._session.add(row)
-        self._session.flush()
+        self._db.Add(row)
+        await self._db.Flush()
         entity.id = row.id
         return entity
 
+    async def AddRange(self, entities: List[WeatherForecast]) -> None:
+        """Insert nhiều dòng bằng 1 câu INSERT executemany (không lấy lại id)."""
+        if not entities:
+            return
+        await self._db.Execute(
+            insert(WeatherForecastModel),
+            [{"date": e.date, "temperature_c": e.temperature_c, "summary": e.summary} for e in entities],
+        )
+
     async def Update(self, entity: WeatherForecast) -> WeatherForecast:
-        row = self._session.query(WeatherForecastModel).filter(WeatherForecastModel.id == entity.id).first()
-        if not row:
+        result = await self._db.Execute(
+            update(WeatherForecastModel)
+            .where(WeatherForecastModel.id == entity.id)
+            .values(
+                date=entity.date,
+                temperature_c=entity.temperature_c,
+                summary=entity.summary,
+            )
+        )
+        if result.rowcount == 0:
             raise KeyError("Not found")
-        row.date = entity.date
-        row.temperature_c = entity.temperature_c
-        row.summary = entity.summary
-        self._session.flush()
         return entity
 
     async def Delete(self, id: int) -> None:
-        row = self._session.query(WeatherForecastModel).filter(WeatherForecastModel.id == id).first()
-        if row:
-            self._session.delete(row)
-            self._session.flush()
+        await self._db.Execute(delete(WeatherForecastModel).where(WeatherForecastModel.id == id))
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from app.application.services.PermissionResolver import PermissionResolver
+from app.config.settings import Settings
+from app.infrastructure.auth.PasswordHasher import ShutdownPasswordHasher
+from app.infrastructure.auth.RefreshTokenPurgeJob import RunRefreshTokenPurgeLoop
+from app.infrastructure.cache.CacheFactory import AppCaches
+from app.infrastructure.db.base import CreateDbEngines, CurrentDbEngines, DbEngines, InitDb, SetDbEngines
+from app.infrastructure.db.pool import WarmUpAsyncPool, WarmUpPool
+from app.infrastructure.db.query_profiler import InstallQueryProfiler
+from app.infrastructure.monitoring.metrics import MULTIPROCESS, InstallAllQueryMetrics, RunStateMetricsLoop
+from app.shared.logging_config import get_logger
+from app.shared.response_cache import ConfigureResponseCache
+from app.shared.startup_report import StartupPhase, StartupReport
+
+logger = get_logger(__name__)
+
+
+async def _WarmUpDbPool(engines: DbEngines, connections: int) -> None:
+    """Mở sẵn connection trong pool để request đầu tiên sau deploy không phải chờ connect."""
+    if connections <= 0:
+        return
+    started = time.perf_counter()
+    try:
+        if engines.AsyncEngine is not None:
+            opened = await WarmUpAsyncPool(engines.AsyncEngine, connections)
+        else:
+            opened = WarmUpPool(engines.Engine, connections)
+    except Exception:
+        logger.exception("DB pool warm-up failed")
+        return
+    logger.info("DB pool warmed up: %s connections in %.1f ms", opened, (time.perf_counter() - started) * 1000)
+
+
+def _StartBackgroundTasks(settings: Settings) -> list[asyncio.Task]:
+    tasks: list[asyncio.Task] = []
+    if settings.ENABLE_REFRESH_TOKEN and settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(RunRefreshTokenPurgeLoop(settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS)))
+    if settings.METRICS_ENABLED and MULTIPROCESS and settings.METRICS_STATE_REFRESH_SECONDS > 0:
+        tasks.append(asyncio.create_task(RunStateMetricsLoop(settings.METRICS_STATE_REFRESH_SECONDS)))
+    return tasks
+
+
+@asynccontextmanager
+async def Lifespan(app: FastAPI):
+    """
+    Vòng đời tài nguyên của app (thay cho global tạo lúc import):
+
+    Startup:
+    - Tạo engines (sync/async/replica) theo app.state.settings, gắn vào app.state.db_engines
+      và làm engines mặc định cho code ngoài request (background job).
+    - Gắn listener query profiler / metrics, create_all (trừ FAST_STARTUP), warm-up pool.
+    - Tạo cache quyền + response cache theo CACHE_BACKEND (redis: subscribe kênh invalidate), chạy background tasks.
+
+    Shutdown (sau khi server đã xử lý xong request đang chạy):
+    - Cancel background tasks, dừng executor hash password, đóng cache (Redis), dispose toàn bộ connection pool.
+    """
+    settings: Settings = app.state.settings
+
+    with StartupPhase("create_engines"):
+        engines = CreateDbEngines(settings)
+    app.state.db_engines = engines
+    previous_engines = CurrentDbEngines()
+    SetDbEngines(engines)
+
+    if settings.QUERY_PROFILER_ENABLED or settings.QUERY_PROFILER_ALLOW_HEADER:
+        for _, db_engine in engines.SyncEngines():
+            InstallQueryProfiler(db_engine)
+    if settings.METRICS_ENABLED:
+        InstallAllQueryMetrics(engines)
+
+    if not app.state.fast_startup:
+        with StartupPhase("create_all"):
+            InitDb(engines)
+    with StartupPhase("db_pool_warmup"):
+        await _WarmUpDbPool(engines, min(settings.DB_POOL_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+
+    caches = AppCaches(settings)
+    app.state.caches = caches
+    await caches.Start()
+    PermissionResolver.ConfigureCache(caches.Permissions)
+    ConfigureResponseCache(caches.Responses, settings.RESPONSE_CACHE_MAX_BODY_BYTES)
+
+    if settings.STARTUP_REPORT:
+        logger.info("Startup report: %s", StartupReport())
+
+    tasks = _StartBackgroundTasks(settings)
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        ShutdownPasswordHasher()
+        await caches.Close()
+        await engines.Dispose()
+        if CurrentDbEngines() is engines:
+            SetDbEngines(previous_engines)
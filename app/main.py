@@ -1,29 +1,48 @@
+# Import đầu tiên: mốc thời gian + đo import các module app.* (STARTUP_REPORT=true)
+from app.shared.startup_report import ImportsFinished, StartupPhase
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import TimeoutError as SqlAlchemyTimeoutError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.api.middlewares.MetricsMiddleware import MetricsMiddleware
+from app.api.middlewares.QueryProfilerMiddleware import QueryProfilerMiddleware
+from app.api.middlewares.RequestIdMiddleware import RequestIdMiddleware
 from app.api.router import RegisterRoutes
-from app.infrastructure.db.base import InitDb
-from app.infrastructure.mapping.AutoMapper import ConfigureMappings
+from app.config.settings import Settings, get_settings
+from app.infrastructure.mapping.AutoMapper import ConfigureMappings, ConfigureMappingsLazily
+from app.lifespan import Lifespan
 from app.shared.exception_handlers import (
     http_exception_handler,
     validation_exception_handler,
+    db_pool_timeout_handler,
     unhandled_exception_handler,
 )
+from app.shared.json_response import ApiJsonResponse
 from app.shared.logging_config import configure_logging, get_logger
 
 
-def CreateApp() -> FastAPI:
+def CreateApp(settings: Settings | None = None) -> FastAPI:
     """
     Khởi tạo FastAPI app
 
     Convention:
-    - Gọi InitDb() để đảm bảo DB, bảng đã được tạo
-    - Gọi ConfigureMappings() để đăng ký AutoMapper profiles
+    - Không mở connection DB / tạo engine ở đây: engines, create_all, warm-up pool, cache,
+      background tasks và dispose đều do Lifespan (app/lifespan.py) quản lý
+    - settings: None => get_settings(); test truyền Settings riêng để có app instance độc lập (DB riêng)
+    - Gọi ConfigureMappings() để đăng ký AutoMapper profiles (FAST_STARTUP: hoãn tới lần Map đầu tiên)
     - Gọi configure_logging() để setup logging cho toàn app
     - Đăng ký global exception handlers
     - Đăng ký routes qua RegisterRoutes(app)
+    - Query profiler (QUERY_PROFILER_ENABLED / header): middleware, listener gắn trong Lifespan
+    - RequestIdMiddleware: request id cho log (LOG_FORMAT=json, LOG_QUEUE=true)
+    - Prometheus metrics (METRICS_ENABLED): middleware ngoài cùng, listener đo query gắn trong Lifespan
     """
+    ImportsFinished()
+    settings = settings or get_settings()
+    fast_startup = settings.FAST_STARTUP
+
     configure_logging()
     logger = get_logger(__name__)
     logger.info("Starting application...")
@@ -31,18 +50,37 @@ def CreateApp() -> FastAPI:
     app = FastAPI(
         title="FastAPI Clean Architecture Skeleton",
         version="1.0.0",
+        default_response_class=ApiJsonResponse,
+        lifespan=Lifespan,
     )
+    app.state.settings = settings
+    app.state.fast_startup = fast_startup
+
+    if fast_startup:
+        ConfigureMappingsLazily()
+    else:
+        with StartupPhase("configure_mappings"):
+            ConfigureMappings()
+
+    if settings.QUERY_PROFILER_ENABLED or settings.QUERY_PROFILER_ALLOW_HEADER:
+        app.add_middleware(QueryProfilerMiddleware, settings=settings)
+
+    # Request id cho log (contextvar) + response header
+    app.add_middleware(RequestIdMiddleware, settings=settings)
 
-    InitDb()
-    ConfigureMappings()
+    # Thêm sau cùng => middleware ngoài cùng, đo cả thời gian của các middleware khác
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     # Global exception handlers
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(SqlAlchemyTimeoutError, db_pool_timeout_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
 
     # Đăng ký tất cả routers ở một chỗ
-    RegisterRoutes(app)
+    with StartupPhase("register_routes"):
+        RegisterRoutes(app)
 
     logger.info("Application started.")
     return app
@@ -1,8 +1,7 @@
 from fastapi import status
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
 
 from app.shared.api_response import ApiResponse
+from app.shared.json_response import ApiJsonResponse
 
 
 def Ok(data=None, meta: dict | None = None):
@@ -11,9 +10,9 @@ def Ok(data=None, meta: dict | None = None):
         data=data,
         meta=meta,
     )
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=status.HTTP_200_OK,
-        content=jsonable_encoder(payload.to_dict()),
+        content=payload.to_dict(),
     )
 
 
@@ -23,9 +22,9 @@ def Created(location: str, data=None, meta: dict | None = None):
         data=data,
         meta=meta,
     )
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=status.HTTP_201_CREATED,
-        content=jsonable_encoder(payload.to_dict()),
+        content=payload.to_dict(),
         headers={"Location": location},
     )
 
@@ -37,9 +36,9 @@ def BadRequest(message: str = "Bad request", errors: dict | None = None):
         message=message,
         errors=errors,
     )
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
-        content=jsonable_encoder(payload.to_dict()),
+        content=payload.to_dict(),
     )
 
 
@@ -49,7 +48,7 @@ def NotFound(message: str = "Not found"):
         data=None,
         message=message,
     )
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=status.HTTP_404_NOT_FOUND,
-        content=jsonable_encoder(payload.to_dict()),
+        content=payload.to_dict(),
     )
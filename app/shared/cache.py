@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from app.shared.memory_cache import TtlLruCache
+
+
+class ICache(ABC):
+    """
+    Cache key (str) -> value (bytes) dùng chung cho cache quyền, response cache...
+
+    Convention:
+    - Mỗi instance là 1 namespace với TTL + số entry riêng; caller tự serialize value ra bytes.
+    - Delete / Invalidate có hiệu lực trên mọi node (backend phân tán phải broadcast cho node khác).
+    - Generation tăng sau mỗi lần xoá (kể cả nhận từ node khác): đọc Generation trước khi query DB,
+      chỉ Set nếu Generation chưa đổi => kết quả cũ không ghi đè lên invalidate vừa xảy ra.
+    """
+
+    Generation: int = 0
+
+    @property
+    @abstractmethod
+    def Enabled(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def Get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def Set(self, key: str, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def Delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def Invalidate(self, prefix: str = "") -> None:
+        """Xoá mọi key bắt đầu bằng prefix ("" => toàn bộ namespace)."""
+        pass
+
+    @abstractmethod
+    def Stats(self) -> dict[str, Any]:
+        pass
+
+    async def Start(self) -> None:
+        """Mở kết nối / subscribe kênh invalidate (gọi trong lifespan)."""
+
+    async def Close(self) -> None:
+        """Dừng listener, đóng kết nối (gọi khi shutdown)."""
+
+
+class MemoryCache(ICache):
+    """ICache trong process (TTL + LRU): mặc định khi chạy 1 node / dev, không cần Redis."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._items: TtlLruCache[str, bytes] = TtlLruCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.Generation = 0
+
+    @property
+    def Enabled(self) -> bool:
+        return self._items.Enabled
+
+    async def Get(self, key: str) -> bytes | None:
+        return self._items.Get(key)
+
+    async def Set(self, key: str, value: bytes) -> None:
+        self._items.Set(key, value)
+
+    async def Delete(self, key: str) -> None:
+        self.Generation += 1
+        self._items.Delete(key)
+
+    async def Invalidate(self, prefix: str = "") -> None:
+        self.Generation += 1
+        if prefix:
+            self._items.DeleteWhere(lambda key: key.startswith(prefix))
+        else:
+            self._items.Clear()
+
+    def Stats(self) -> dict[str, Any]:
+        return {"backend": "memory", **self._items.Stats()}
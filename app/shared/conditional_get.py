@@ -0,0 +1,136 @@
+import functools
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+
+from app.config.settings import get_settings
+from app.domain.entities.EntityVersion import EntityVersion
+from app.shared.response_cache import SetCacheValidator
+
+
+def _ToUtc(value: datetime) -> datetime:
+    # DB trả datetime naive (SQLite / MySQL DATETIME) => coi như UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _ETag(namespace: str, request: Request, version: EntityVersion) -> str:
+    last_modified = _ToUtc(version.last_modified).isoformat() if version.last_modified else ""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    raw = f"{namespace}|{request.url.path}?{query}|{version.count}|{version.checksum}|{last_modified}"
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _StableLastModified(version: EntityVersion) -> datetime | None:
+    """
+    Last-Modified chỉ dùng được khi giây của nó đã qua hẳn (theo đồng hồ DB): HTTP-date chỉ chính xác tới giây,
+    lần sửa sau trong cùng giây sẽ có cùng Last-Modified => If-Modified-Since trả 304 cho dữ liệu cũ.
+    """
+    if version.last_modified is None or version.database_now is None:
+        return None
+    last_modified = _ToUtc(version.last_modified).replace(microsecond=0)
+    if last_modified >= _ToUtc(version.database_now).replace(microsecond=0):
+        return None
+    return last_modified
+
+
+def _MatchesETag(if_none_match: str, etag: str) -> bool:
+    """If-None-Match dùng so sánh weak: bỏ tiền tố W/ rồi so khớp từng giá trị (hoặc "*")."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _NotModifiedSince(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP-date chỉ có độ chính xác tới giây
+    return _ToUtc(last_modified).replace(microsecond=0) <= since
+
+
+def ConditionalGet(namespace: str, id_param: str | None = None) -> Callable:
+    """
+    Decorator cho endpoint GET: ETag (strong) từ AuditMixin.row_version + Last-Modified từ updated_at,
+    trả 304 khi client đã có bản mới nhất.
+
+    Convention:
+    - Endpoint có tham số `service` với GetVersion() (list) / GetVersionById(id) (id_param != None).
+    - Version = count + sum(row_version) + max(coalesce(updated_at, created_at)) qua 1 query aggregate;
+      ETag = hash của namespace + path + query + version, đổi sau mọi lần ghi (row_version tăng ở mỗi UPDATE).
+      So khớp If-None-Match / If-Modified-Since ngay sau query này, trước khi load entity, map DTO và
+      serialize (đặt decorator ngoài @CachedResponse).
+    - ETag được truyền cho @CachedResponse (SetCacheValidator): body cache render ở version khác bị bỏ qua,
+      nên ETag gửi đi luôn khớp với body (kể cả khi invalidate chưa tới process / node này).
+    - Last-Modified chỉ gắn (và If-Modified-Since chỉ được xét) khi giây của nó đã qua theo đồng hồ DB.
+    - If-None-Match có mặt thì bỏ qua If-Modified-Since (RFC 9110). List chỉ xét If-None-Match:
+      xoá dòng không làm tăng max(updated_at) nên Last-Modified của list không đủ để trả 304.
+    - GetById không tồn tại (count = 0): không gắn validator, endpoint tự trả 404.
+    - Tắt bằng CONDITIONAL_GET_ENABLED=false (bỏ query version).
+    """
+
+    def Decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        # Endpoint không khai báo `request` => thêm tham số `request: Request` để FastAPI inject vào wrapper.
+        # Cùng tên ở mọi decorator: FastAPI chỉ inject 1 tham số Request, decorator ngoài truyền tiếp vào trong.
+        inject_request = "request" not in signature.parameters
+
+        @functools.wraps(endpoint)
+        async def Wrapper(*args, **kwargs):
+            request: Request = kwargs.pop("request") if inject_request else kwargs["request"]
+            settings = getattr(request.app.state, "settings", None) or get_settings()
+            if not settings.CONDITIONAL_GET_ENABLED:
+                return await endpoint(*args, **kwargs)
+
+            service = kwargs["service"]
+            if id_param is None:
+                version = await service.GetVersion()
+            else:
+                version = await service.GetVersionById(kwargs[id_param])
+                if version.count == 0:
+                    return await endpoint(*args, **kwargs)
+
+            headers = {"ETag": _ETag(namespace, request, version)}
+            last_modified = _StableLastModified(version)
+            if last_modified is not None:
+                headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+            if_none_match = request.headers.get("if-none-match")
+            if_modified_since = request.headers.get("if-modified-since")
+            if if_none_match is not None:
+                not_modified = _MatchesETag(if_none_match, headers["ETag"])
+            else:
+                not_modified = (
+                    id_param is not None
+                    and if_modified_since is not None
+                    and last_modified is not None
+                    and _NotModifiedSince(if_modified_since, last_modified)
+                )
+            if not_modified:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            # @CachedResponse bên trong chỉ dùng entry được render ở đúng version này
+            SetCacheValidator(request, headers["ETag"])
+            response = await endpoint(*args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response.headers.update(headers)
+            return response
+
+        if inject_request:
+            parameters = list(signature.parameters.values())
+            parameters.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            Wrapper.__signature__ = signature.replace(parameters=parameters)
+        return Wrapper
+
+    return Decorator
@@ -2,10 +2,12 @@ from typing import Any
 
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.config.settings import get_settings
 from app.shared.api_response import ApiResponse
+from app.shared.json_response import ApiJsonResponse
+from app.shared.logging_config import GetRequestId
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -19,7 +21,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         message=message,
     )
 
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=exc.status_code,
         content=payload.to_dict(),  # <- quan trọng
         headers=getattr(exc, "headers", None),
@@ -52,14 +54,33 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         errors=errors,
     )
 
-    return JSONResponse(
+    return ApiJsonResponse(
         status_code=422,
         content=payload.to_dict(),  # <- quan trọng
     )
 
 
+async def db_pool_timeout_handler(request: Request, exc: Exception):
+    """Hết connection trong pool (QueuePool limit reached) => 503 để client retry, thay vì 500."""
+    payload = ApiResponse[Any](
+        success=False,
+        data=None,
+        meta=None,
+        message="Service temporarily unavailable, please retry",
+    )
+
+    return ApiJsonResponse(
+        status_code=503,
+        content=payload.to_dict(),
+        headers={"Retry-After": "1"},
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception):
-    """Fallback cho mọi Exception chưa được bắt. Không lộ thông tin nội bộ ra ngoài."""
+    """
+    Fallback cho mọi Exception chưa được bắt. Không lộ thông tin nội bộ ra ngoài,
+    chỉ trả request id để đối chiếu với log.
+    """
     payload = ApiResponse[Any](
         success=False,
         data=None,
@@ -67,7 +88,11 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
         message="Internal server error",
     )
 
-    return JSONResponse(
+    request_id = GetRequestId()
+    # 500 do ServerErrorMiddleware trả về (ngoài RequestIdMiddleware) => tự gắn header, cùng tên với middleware
+    settings = getattr(request.app.state, "settings", None) or get_settings()
+    return ApiJsonResponse(
         status_code=500,
         content=payload.to_dict(),  # <- quan trọng
+        headers={settings.REQUEST_ID_HEADER: request_id} if request_id else None,
     )
@@ -0,0 +1,70 @@
+import csv
+import io
+from typing import AsyncIterator, Literal, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+ExportFormat = Literal["json", "ndjson", "csv"]
+
+_FLUSH_BYTES = 64 * 1024
+
+
+async def _NdjsonChunks(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    buffer: list[bytes] = []
+    size = 0
+    first = True
+    async for item in items:
+        line = item.model_dump_json().encode("utf-8") + b"\n"
+        if first:
+            # Đẩy dòng đầu ra ngay để client nhận byte đầu tiên sớm
+            first = False
+            yield line
+            continue
+        buffer.append(line)
+        size += len(line)
+        if size >= _FLUSH_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def _CsvChunks(items: AsyncIterator[BaseModel], fields: list[str]) -> AsyncIterator[bytes]:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    yield output.getvalue().encode("utf-8")
+    output.seek(0)
+    output.truncate()
+
+    async for item in items:
+        data = item.model_dump(mode="json")
+        writer.writerow(["" if data.get(f) is None else data.get(f) for f in fields])
+        if output.tell() >= _FLUSH_BYTES:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+
+def StreamExport(
+    items: AsyncIterator[BaseModel],
+    format: ExportFormat,
+    dto_type: Type[BaseModel],
+    filename: str,
+) -> StreamingResponse:
+    """
+    Trả danh sách dưới dạng stream (NDJSON hoặc CSV), không build cả list / ApiResponse trong bộ nhớ.
+
+    - ndjson: mỗi dòng 1 DTO (application/x-ndjson)
+    - csv: header theo field của DTO, file đính kèm `<filename>.csv`
+    """
+    if format == "csv":
+        return StreamingResponse(
+            _CsvChunks(items, list(dto_type.model_fields.keys())),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+        )
+    return StreamingResponse(_NdjsonChunks(items), media_type="application/x-ndjson")
@@ -0,0 +1,39 @@
+from dataclasses import asdict, is_dataclass
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _Default(obj: Any) -> Any:
+    """Các kiểu orjson không tự serialize được, convert giống jsonable_encoder."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def DumpJson(content: Any) -> bytes:
+    return orjson.dumps(content, default=_Default, option=_ORJSON_OPTIONS)
+
+
+class ApiJsonResponse(JSONResponse):
+    """
+    JSONResponse serialize bằng orjson trong 1 lần duyệt (envelope + DTO),
+    thay cho jsonable_encoder + json.dumps. Output giữ nguyên format của JSONResponse
+    (compact, UTF-8, không escape ký tự non-ASCII).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return DumpJson(content)
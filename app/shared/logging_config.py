@@ -1,7 +1,114 @@
+import atexit
 import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
 from app.config.settings import get_settings
 
+# Request id của request hiện tại (RequestIdMiddleware set), gắn vào mọi log record
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+_listener: QueueListener | None = None
+
+
+def GetRequestId() -> str | None:
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Gắn record.request_id (chạy ở thread gọi log, trước khi record vào queue)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class AccessLogSampler(logging.Filter):
+    """
+    Sample log của uvicorn.access: request lỗi (status >= 400) luôn được log,
+    request thành công chỉ log với xác suất sample_rate.
+    """
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.SampleRate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.SampleRate >= 1:
+            return True
+        # uvicorn.access: args = (client_addr, method, full_path, http_version, status_code)
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 5 and isinstance(args[4], int) and args[4] >= 400:
+            return True
+        return random.random() < self.SampleRate
+
+
+class JsonFormatter(logging.Formatter):
+    """1 dòng JSON / log record: ts, level, logger, message, request_id (+ exception nếu có)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload).decode()
+
+
+def _CreateQueueHandler(use_queue: bool, log_format: str) -> logging.Handler:
+    """
+    Handler gắn cho các logger: QueueHandler đưa record vào queue, QueueListener (thread nền)
+    format + ghi ra stream, nên event loop không bị chặn bởi I/O của log.
+    """
+    global _listener
+    StopLogging()
+
+    console = logging.StreamHandler()
+    console.setFormatter(
+        JsonFormatter()
+        if log_format == "json"
+        else logging.Formatter("%(asctime)s [%(levelname)s] [%(name)s] [%(request_id)s] %(message)s")
+    )
+    if not use_queue:
+        console.addFilter(RequestIdFilter())
+        return console
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = QueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    _listener = QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    return handler
+
+
+def StopLogging() -> None:
+    """Dừng QueueListener (flush hết record còn trong queue)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def RestartLogListenerAfterFork() -> None:
+    """Thread của QueueListener không sống qua fork (gunicorn preload_app): tạo lại listener trong process con."""
+    global _listener
+    if _listener is not None:
+        _listener = QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+atexit.register(StopLogging)
+
 
 def configure_logging():
     settings = get_settings()
@@ -11,15 +118,17 @@ def configure_logging():
         {
             "version": 1,
             "disable_existing_loggers": False,
-            "formatters": {
-                "default": {
-                    "format": "%(asctime)s [%(levelname)s] [%(name)s] %(message)s",
+            "filters": {
+                "access_sampler": {
+                    "()": AccessLogSampler,
+                    "sample_rate": settings.ACCESS_LOG_SAMPLE_RATE,
                 },
             },
             "handlers": {
                 "console": {
-                    "class": "logging.StreamHandler",
-                    "formatter": "default",
+                    "()": _CreateQueueHandler,
+                    "use_queue": settings.LOG_QUEUE,
+                    "log_format": settings.LOG_FORMAT.lower(),
                 },
             },
             "loggers": {
@@ -35,6 +144,7 @@ def configure_logging():
                 },
                 "uvicorn.access": {
                     "handlers": ["console"],
+                    "filters": ["access_sampler"],
                     "level": level,
                     "propagate": False,
                 },
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+TKey = TypeVar("TKey", bound=Hashable)
+TValue = TypeVar("TValue")
+
+
+class TtlLruCache(Generic[TKey, TValue]):
+    """
+    Cache in-process có TTL + giới hạn số entry (LRU).
+
+    - Get: trả về None nếu không có hoặc đã hết hạn (entry hết hạn bị xoá luôn).
+    - Set: vượt quá max_entries thì loại entry ít được dùng nhất.
+    - Thread-safe (dùng được cả từ threadpool của Starlette).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[TKey, tuple[float, TValue]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    @property
+    def Enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl_seconds > 0
+
+    def Get(self, key: TKey) -> TValue | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.Misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._items[key]
+                self.Misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.Hits += 1
+            return value
+
+    def Set(self, key: TKey, value: TValue) -> None:
+        if not self.Enabled:
+            return
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+                self.Evictions += 1
+
+    def Delete(self, key: TKey) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def DeleteWhere(self, predicate: Callable[[TKey], bool]) -> int:
+        with self._lock:
+            keys = [k for k in self._items if predicate(k)]
+            for k in keys:
+                del self._items[k]
+            return len(keys)
+
+    def Clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def Stats(self) -> dict[str, Any]:
+        with self._lock:
+            size = len(self._items)
+        lookups = self.Hits + self.Misses
+        return {
+            "size": size,
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self.Hits,
+            "misses": self.Misses,
+            "evictions": self.Evictions,
+            "hit_ratio": (self.Hits / lookups) if lookups else 0.0,
+        }
@@ -0,0 +1,58 @@
+import json
+from typing import Any, AsyncIterator, Tuple
+
+NDJSON_MEDIA_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+
+def IsNdjson(content_type: str | None) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in NDJSON_MEDIA_TYPES
+
+
+async def _ReadLines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def ReadJsonRecords(content_type: str | None, stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Đọc body dạng JSON array hoặc NDJSON, yield (index, record).
+
+    - NDJSON: đọc dần theo stream (không giữ cả body trong bộ nhớ), bỏ qua dòng trống.
+      Dòng JSON lỗi được yield dưới dạng ValueError để caller ghi vào report của đúng dòng đó.
+    - JSON array: parse cả body; body không phải array => raise ValueError.
+    """
+    if IsNdjson(content_type):
+        index = 0
+        async for line in _ReadLines(stream):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as ex:
+                record = ValueError(f"Invalid JSON: {ex}")
+            yield index, record
+            index += 1
+        return
+
+    body = b"".join([chunk async for chunk in stream])
+    try:
+        records = json.loads(body)
+    except ValueError as ex:
+        raise ValueError("Body must be a JSON array or NDJSON") from ex
+    if not isinstance(records, list):
+        raise ValueError("Body must be a JSON array or NDJSON")
+    for index, record in enumerate(records):
+        yield index, record
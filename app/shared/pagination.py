@@ -1,5 +1,7 @@
+import base64
+import json
 from math import ceil
-from typing import Generic, List, TypeVar
+from typing import Any, Generic, List, TypeVar
 
 T = TypeVar("T")
 
@@ -11,3 +13,30 @@ class PagedResult(Generic[T]):
         self.page = page
         self.page_size = page_size
         self.total_pages = ceil(total / page_size) if page_size else 0
+
+
+class CursorPagedResult(Generic[T]):
+    def __init__(self, items: List[T], page_size: int, next_cursor: str | None, total: int | None = None):
+        self.items = items
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
+        self.total = total
+
+
+def EncodeCursor(position: dict[str, Any]) -> str:
+    """Đóng gói vị trí keyset thành cursor opaque (base64url JSON)."""
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def DecodeCursor(cursor: str) -> dict[str, Any]:
+    """Giải mã cursor; raise ValueError nếu cursor không hợp lệ."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as ex:
+        raise ValueError("Invalid cursor") from ex
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
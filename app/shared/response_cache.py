@@ -0,0 +1,154 @@
+import functools
+import inspect
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.config.settings import get_settings
+from app.shared.cache import ICache, MemoryCache
+
+# Cache dùng chung cho cả process; lifespan thay bằng cache theo CACHE_BACKEND (ConfigureResponseCache).
+# key = "<namespace>|<path>?<query đã sort>|<scope quyền>", value = "<status>\n<media_type>\n<validator>\n" + body
+_response_cache: ICache = MemoryCache(
+    max_entries=get_settings().RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=get_settings().RESPONSE_CACHE_TTL_SECONDS,
+)
+_max_body_bytes = get_settings().RESPONSE_CACHE_MAX_BODY_BYTES
+# Hit/miss theo namespace để tuning TTL / MAX_ENTRIES
+_counters: dict[str, dict[str, int]] = {}
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+def _Count(namespace: str, field: str) -> None:
+    counter = _counters.setdefault(namespace, {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0})
+    counter[field] += 1
+
+
+def _Scope(kwargs: dict[str, Any]) -> str:
+    """Scope quyền: các role của principal (cùng role => cùng response), không có principal => anonymous."""
+    principal = kwargs.get("principal")
+    if principal is None:
+        return "anonymous"
+    return "roles=" + ",".join(sorted(principal.roles))
+
+
+def _Pack(status_code: int, media_type: str, validator: str, body: bytes) -> bytes:
+    return f"{status_code}\n{media_type}\n{validator}\n".encode("latin-1") + body
+
+
+def _Unpack(value: bytes) -> tuple[int, str, str, bytes] | None:
+    parts = value.split(b"\n", 3)
+    if len(parts) != 4:
+        # Entry định dạng cũ (chưa có validator, vd còn trong Redis lúc rolling deploy) => coi như miss
+        return None
+    status_code, media_type, validator, body = parts
+    return int(status_code), media_type.decode("latin-1"), validator.decode("latin-1"), body
+
+
+def SetCacheValidator(request: Request, validator: str) -> None:
+    """
+    Gắn version hiện tại của dữ liệu (vd ETag do @ConditionalGet tính) cho request đang xử lý.
+    Entry được lưu kèm validator; đọc ra mà validator khác (dữ liệu đã đổi nhưng invalidate chưa tới
+    process này) thì coi như miss => không trả body cũ kèm ETag mới.
+    """
+    request.state.response_cache_validator = validator
+
+
+def _GetCacheValidator(request: Request) -> str:
+    return getattr(request.state, "response_cache_validator", "")
+
+
+def CachedResponse(namespace: str) -> Callable:
+    """
+    Decorator cho endpoint GET: cache bytes response đã serialize (TTL + LRU, cấu hình qua RESPONSE_CACHE_*).
+
+    Convention:
+    - Key = namespace + path + query string (đã sort) + scope quyền (roles của `principal`, hoặc anonymous).
+      Endpoint có response phụ thuộc vào user cụ thể (không chỉ roles) thì không dùng decorator này.
+    - Chỉ cache response 200 có body sẵn (ApiJsonResponse); StreamingResponse (export ndjson/csv) đi thẳng.
+    - Auth dependency vẫn chạy trước mỗi request, cache hit chỉ bỏ qua query DB + map + serialize.
+    - Service ghi dữ liệu của namespace phải await InvalidateResponseCache(namespace) sau khi SaveChanges.
+    - Đặt dưới @ConditionalGet: entry được gắn ETag lúc render (SetCacheValidator), ETag hiện tại khác => miss.
+    - Response có header X-Cache: HIT | MISS.
+    """
+
+    def Decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        # Endpoint không khai báo `request` => thêm tham số `request: Request` để FastAPI inject vào wrapper.
+        # Cùng tên ở mọi decorator: FastAPI chỉ inject 1 tham số Request, decorator ngoài truyền tiếp vào trong.
+        inject_request = "request" not in signature.parameters
+
+        @functools.wraps(endpoint)
+        async def Wrapper(*args, **kwargs):
+            request: Request = kwargs.pop("request") if inject_request else kwargs["request"]
+            cache = _response_cache
+            if not cache.Enabled:
+                return await endpoint(*args, **kwargs)
+
+            query = urlencode(sorted(request.query_params.multi_items()))
+            key = f"{namespace}|{request.url.path}?{query}|{_Scope(kwargs)}"
+            validator = _GetCacheValidator(request)
+            cached = await cache.Get(key)
+            entry = _Unpack(cached) if cached is not None else None
+            if entry is not None:
+                status_code, media_type, cached_validator, body = entry
+                if cached_validator == validator:
+                    _Count(namespace, "hits")
+                    return Response(
+                        content=body,
+                        status_code=status_code,
+                        media_type=media_type,
+                        headers={CACHE_STATUS_HEADER: "HIT"},
+                    )
+                _Count(namespace, "stale")
+
+            _Count(namespace, "misses")
+            # Generation đổi trong lúc render (invalidate ở node này hoặc node khác) => không ghi response cũ
+            generation = cache.Generation
+            response = await endpoint(*args, **kwargs)
+            body = getattr(response, "body", None)
+            if (
+                isinstance(body, bytes)
+                and response.status_code == 200
+                and len(body) <= _max_body_bytes
+                and generation == cache.Generation
+                and cache is _response_cache
+            ):
+                await cache.Set(
+                    key, _Pack(response.status_code, response.media_type or "application/json", validator, body)
+                )
+            if isinstance(body, bytes):
+                response.headers[CACHE_STATUS_HEADER] = "MISS"
+            return response
+
+        if inject_request:
+            parameters = list(signature.parameters.values())
+            parameters.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            Wrapper.__signature__ = signature.replace(parameters=parameters)
+        return Wrapper
+
+    return Decorator
+
+
+async def InvalidateResponseCache(*namespaces: str) -> None:
+    """Xoá response đã cache của các namespace (gọi sau Create/Update/Delete), trên mọi node."""
+    for namespace in namespaces:
+        _Count(namespace, "invalidations")
+        await _response_cache.Invalidate(f"{namespace}|")
+
+
+def ConfigureResponseCache(cache: ICache, max_body_bytes: int) -> None:
+    """Dùng cache mới (AppCaches.Responses); gọi khi app start."""
+    global _response_cache, _max_body_bytes
+    _response_cache = cache
+    _max_body_bytes = max_body_bytes
+    _counters.clear()
+
+
+def ResponseCacheStats() -> dict:
+    stats = _response_cache.Stats()
+    stats["max_body_bytes"] = _max_body_bytes
+    stats["namespaces"] = {namespace: dict(counter) for namespace, counter in _counters.items()}
+    return stats
@@ -0,0 +1,69 @@
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from importlib.machinery import PathFinder, SourceFileLoader
+from typing import Iterator
+
+from app.config.settings import get_settings
+
+# Mốc bắt đầu: module này được import đầu tiên trong app.main
+_started = time.perf_counter()
+_phases: list[tuple[str, float]] = []
+_imports: dict[str, float] = {}
+
+
+class _TimedLoader(SourceFileLoader):
+    """SourceFileLoader đo thời gian exec_module (gồm cả các import lồng bên trong module)."""
+
+    def exec_module(self, module) -> None:
+        started = time.perf_counter()
+        try:
+            super().exec_module(module)
+        finally:
+            _imports[module.__name__] = time.perf_counter() - started
+
+
+class _ImportTimer(MetaPathFinder):
+    """Chỉ đo module của app (app.*); thư viện ngoài được tính vào module app đã import chúng."""
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith("app."):
+            return None
+        spec = PathFinder.find_spec(fullname, path, target)
+        if spec is not None and type(spec.loader) is SourceFileLoader:
+            spec.loader = _TimedLoader(spec.loader.name, spec.loader.path)
+        return spec
+
+
+_import_timer = _ImportTimer() if get_settings().STARTUP_REPORT else None
+if _import_timer is not None:
+    sys.meta_path.insert(0, _import_timer)
+
+
+def ImportsFinished() -> None:
+    """Gọi đầu CreateApp: ghi lại thời gian import module và gỡ import timer."""
+    if not any(name == "imports" for name, _ in _phases):
+        _phases.append(("imports", time.perf_counter() - _started))
+    if _import_timer in sys.meta_path:
+        sys.meta_path.remove(_import_timer)
+
+
+@contextmanager
+def StartupPhase(name: str) -> Iterator[None]:
+    """Đo 1 bước khởi động (vd create_all, register routes, warm-up pool)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - started))
+
+
+def StartupReport(top_imports: int = 15) -> dict:
+    """Thời gian từ lúc import app.main, từng bước khởi động và các module app.* import chậm nhất."""
+    slowest = sorted(_imports.items(), key=lambda item: item[1], reverse=True)[:top_imports]
+    return {
+        "total_ms": round((time.perf_counter() - _started) * 1000, 1),
+        "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in _phases},
+        "slowest_imports_ms": {name: round(seconds * 1000, 1) for name, seconds in slowest},
+    }
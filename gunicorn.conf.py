@@ -0,0 +1,46 @@
+"""
+Cấu hình gunicorn cho production (UvicornWorker, nhiều process):
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+- Số worker theo số CPU (SERVER_WORKERS=0) hoặc cấu hình cố định.
+- preload_app: import app.main 1 lần ở master, worker fork ra dùng chung code (copy-on-write).
+- post_fork: mỗi worker bỏ connection DB kế thừa từ master, tạo lại thread ghi log.
+- SIGTERM: worker ngừng nhận request, chờ request đang chạy (SERVER_GRACEFUL_TIMEOUT_SECONDS),
+  rồi chạy lifespan shutdown (đóng pool DB).
+- Prometheus multiprocess: metrics của mọi worker được gộp qua PROMETHEUS_MULTIPROC_DIR.
+"""
+import os
+import shutil
+
+from app.config.settings import get_settings
+
+_settings = get_settings()
+
+# Phải set trước khi preload app (prometheus_client đọc env lúc import); dọn số liệu của lần chạy trước
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+bind = _settings.SERVER_BIND
+workers = _settings.SERVER_WORKERS or os.cpu_count() or 1
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+graceful_timeout = _settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+timeout = graceful_timeout + 30
+keepalive = _settings.SERVER_KEEPALIVE_SECONDS
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from app.infrastructure.db.base import ResetEnginesAfterFork
+    from app.shared.logging_config import RestartLogListenerAfterFork
+
+    ResetEnginesAfterFork()
+    RestartLogListenerAfterFork()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
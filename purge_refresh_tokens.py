@@ -0,0 +1,32 @@
+"""Purge expired / revoked refresh tokens.
+
+Usage:
+    python purge_refresh_tokens.py [--retention-days 7] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from app.config.settings import get_settings
+from app.infrastructure.auth.RefreshTokenPurgeJob import PurgeRefreshTokens
+from app.infrastructure.mapping.AutoMapper import ConfigureMappings
+
+
+async def purge(retention_days: int, batch_size: int):
+    ConfigureMappings()
+    result = await PurgeRefreshTokens(retention_days, batch_size)
+
+    print("=======================================")
+    print(f"Purged   : {result.purged} rows")
+    print(f"Batches  : {result.batches}")
+    print(f"Elapsed  : {result.elapsed_ms} ms")
+    print("=======================================")
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Purge expired / revoked refresh tokens.")
+    parser.add_argument("--retention-days", type=int, default=settings.REFRESH_TOKEN_PURGE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.REFRESH_TOKEN_PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(purge(args.retention_days, args.batch_size))
@@ -105,16 +105,17 @@ async def seed():
     from app.infrastructure.db.models.role_permission_model import RolePermissionModel
     from app.infrastructure.db.models.permission_model import PermissionModel
 
-    session = db.Session
-    perm_rows = (
-        session.query(PermissionModel)
+    from sqlalchemy import select
+
+    perm_rows = await db.Scalars(
+        select(PermissionModel)
         .join(RolePermissionModel, RolePermissionModel.permission_id == PermissionModel.id)
-        .filter(RolePermissionModel.role_id.in_([r.id for r in roles]))
-        .all()
+        .where(RolePermissionModel.role_id.in_([r.id for r in roles]))
     )
     perm_names = sorted({p.name for p in perm_rows})
 
     await uow.SaveChanges()
+    await uow.Dispose()
 
     print("=======================================")
     print("Admin user & default roles/permissions created/updated successfully!")
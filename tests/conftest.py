@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import seed_admin
+from app.config.settings import Settings
+from app.infrastructure.db.query_profiler import InstallQueryProfiler
+from app.main import CreateApp
+
+
+@pytest.fixture
+def make_app():
+    """Factory app riêng cho mỗi test: mặc định SQLite in-memory, không chạy background job."""
+
+    def _MakeApp(**overrides):
+        settings = Settings(
+            **{
+                "DATABASE_URL": "sqlite://",
+                "DB_ASYNC": False,
+                "READ_REPLICA_URLS": "",
+                "ENABLE_REFRESH_TOKEN": False,
+                "REFRESH_TOKEN_PURGE_INTERVAL_SECONDS": 0,
+                "DB_POOL_WARMUP_CONNECTIONS": 0,
+                "FAST_STARTUP": False,
+                **overrides,
+            }
+        )
+        return CreateApp(settings)
+
+    return _MakeApp
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    """TestClient đã chạy lifespan (create_all), seed admin + roles/permissions, gắn listener đếm query."""
+    with TestClient(app) as test_client:
+        for _, engine in app.state.db_engines.SyncEngines():
+            InstallQueryProfiler(engine)
+        test_client.portal.call(seed_admin.seed)
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(client):
+    response = client.post(
+        "/api/auth/login",
+        json={"user_name": seed_admin.ADMIN_USERNAME, "password": seed_admin.ADMIN_PASSWORD},
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
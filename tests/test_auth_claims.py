@@ -0,0 +1,60 @@
+import pytest
+
+import seed_admin
+from app.config.settings import get_settings
+from app.infrastructure.auth import Dependencies
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+
+
+@pytest.fixture
+def claims_builds(monkeypatch) -> list[int]:
+    """Bật AUTH_CLAIMS_PRINCIPAL, ghi lại user id mỗi lần principal được dựng từ claims."""
+    monkeypatch.setattr(get_settings(), "AUTH_CLAIMS_PRINCIPAL", True)
+    builds: list[int] = []
+    build = Dependencies.BuildUserFromClaims
+
+    def _Spy(payload):
+        user = build(payload)
+        builds.append(user.id)
+        return user
+
+    monkeypatch.setattr(Dependencies, "BuildUserFromClaims", _Spy)
+    return builds
+
+
+def _Login(client) -> dict[str, str]:
+    response = client.post(
+        "/api/auth/login",
+        json={"user_name": seed_admin.ADMIN_USERNAME, "password": seed_admin.ADMIN_PASSWORD},
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+async def _RevokeClaims(user_name: str) -> None:
+    db = DbContext()
+    try:
+        uow = UnitOfWork(db)
+        user = await uow.Users.GetByUserName(user_name)
+        await uow.Users.RevokeClaims(user.id)
+        await uow.SaveChanges()
+    finally:
+        await db.Dispose()
+
+
+def test_login_after_revoke_uses_claims_again(client, claims_builds):
+    headers = _Login(client)
+    assert client.get("/api/auth/me/roles", headers=headers).status_code == 200
+    assert len(claims_builds) == 1
+
+    client.portal.call(_RevokeClaims, seed_admin.ADMIN_USERNAME)
+
+    # Token cũ mang "cv" cũ: vẫn dùng được nhưng user được đọc lại từ DB
+    assert client.get("/api/auth/me/roles", headers=headers).status_code == 200
+    assert len(claims_builds) == 1
+
+    # Token mới mang claims_version hiện tại => quay lại dùng claims
+    headers = _Login(client)
+    assert client.get("/api/auth/me/roles", headers=headers).status_code == 200
+    assert len(claims_builds) == 2
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from app.config.settings import get_settings
+
+CHUNK_SIZE = 3
+# 10**20 qua được DTO (int) nhưng vượt INTEGER của SQLite => insert cả chunk chứa nó bị lỗi
+OVERFLOW = 10**20
+
+
+@pytest.fixture
+def bulk_settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ERRORS", 1000)
+    return settings
+
+
+def _Forecast(index: int, temperature_c=None) -> dict:
+    return {"date": f"2024-01-{index + 1:02d}", "temperature_c": index if temperature_c is None else temperature_c}
+
+
+def _Post(client, records: list[dict], ndjson: bool):
+    if ndjson:
+        content = "\n".join(json.dumps(record) for record in records).encode()
+        headers = {"Content-Type": "application/x-ndjson"}
+    else:
+        content = json.dumps(records).encode()
+        headers = {"Content-Type": "application/json"}
+    response = client.post("/api/weather-forecasts/bulk", content=content, headers=headers)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.mark.parametrize("ndjson", [False, True], ids=["json", "ndjson"])
+def test_failed_chunk_does_not_block_other_chunks(client, bulk_settings, ndjson):
+    records = [_Forecast(index) for index in range(9)]
+    records[4] = _Forecast(4, OVERFLOW)
+    records[7] = _Forecast(7, "not a number")
+
+    result = _Post(client, records, ndjson)
+
+    # Chunk theo record hợp lệ: [0, 1, 2] [3, 4, 5] [6, 8]; chunk 2 rollback cả 3 dòng, dòng 7 lỗi validate
+    assert result["total"] == 9
+    assert result["inserted"] == 5
+    assert result["failed"] == 4
+    assert [error["index"] for error in result["errors"]] == [3, 4, 5, 7]
+    assert "temperature_c" in result["errors"][3]["errors"]
+
+    listing = client.get("/api/weather-forecasts?pageSize=100").json()["data"]
+    assert sorted(item["temperature_c"] for item in listing) == [0, 1, 2, 6, 8]
+
+
+def test_error_report_is_capped(client, bulk_settings, monkeypatch):
+    monkeypatch.setattr(bulk_settings, "BULK_IMPORT_MAX_ERRORS", 2)
+    records = [_Forecast(index, "bad") for index in range(5)] + [_Forecast(5)]
+
+    result = _Post(client, records, ndjson=True)
+
+    assert result["failed"] == 5
+    assert result["inserted"] == 1
+    assert [error["index"] for error in result["errors"]] == [0, 1]
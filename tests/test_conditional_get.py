@@ -0,0 +1,104 @@
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+
+
+def _CreateProduct(client, headers) -> int:
+    response = client.post("/api/products", json={"name": "p1", "price": 1.5}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+
+def test_unchanged_resource_returns_not_modified(client, admin_headers):
+    product_id = _CreateProduct(client, admin_headers)
+
+    first = client.get(f"/api/products/{product_id}", headers=admin_headers)
+    second = client.get(
+        f"/api/products/{product_id}",
+        headers={**admin_headers, "If-None-Match": first.headers["ETag"]},
+    )
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_write_in_same_second_changes_etag(client, admin_headers):
+    # GET -> PUT -> GET với ETag cũ chạy trong cùng 1 giây: updated_at không đổi, row_version thì có
+    product_id = _CreateProduct(client, admin_headers)
+    item = client.get(f"/api/products/{product_id}", headers=admin_headers)
+
+    response = client.put(f"/api/products/{product_id}", json={"name": "p1b", "price": 2.5}, headers=admin_headers)
+    assert response.status_code == 200
+
+    item_after = client.get(
+        f"/api/products/{product_id}",
+        headers={**admin_headers, "If-None-Match": item.headers["ETag"]},
+    )
+    assert item_after.status_code == 200
+    assert item_after.json()["data"]["name"] == "p1b"
+    assert item_after.headers["ETag"] != item.headers["ETag"]
+
+
+def test_list_etag_changes_after_update_in_same_second(client):
+    response = client.post("/api/weather-forecasts", json={"date": "2024-01-02", "temperature_c": 3})
+    forecast = response.json()["data"]
+    listing = client.get("/api/weather-forecasts")
+
+    response = client.put(f"/api/weather-forecasts/{forecast['id']}", json={**forecast, "temperature_c": 4})
+    assert response.status_code == 200
+
+    listing_after = client.get("/api/weather-forecasts", headers={"If-None-Match": listing.headers["ETag"]})
+    assert listing_after.status_code == 200
+    assert listing_after.headers["ETag"] != listing.headers["ETag"]
+
+
+def test_last_modified_is_not_sent_for_current_second(client, admin_headers):
+    product_id = _CreateProduct(client, admin_headers)
+
+    response = client.get(f"/api/products/{product_id}", headers=admin_headers)
+
+    # Chỉ gắn Last-Modified khi giây của nó đã qua: lần sửa sau không thể có cùng Last-Modified
+    if "Last-Modified" in response.headers:
+        response = client.get(
+            f"/api/products/{product_id}",
+            headers={**admin_headers, "If-Modified-Since": response.headers["Last-Modified"]},
+        )
+        assert response.status_code == 304
+    else:
+        assert response.status_code == 200
+
+
+async def _UpdateForecastWithoutInvalidation(id: int, temperature_c: int) -> None:
+    """Ghi như 1 worker khác: dữ liệu đổi nhưng response cache của process này không nhận invalidate."""
+    db = DbContext()
+    try:
+        uow = UnitOfWork(db)
+        forecast = await uow.WeatherForecasts.GetById(id)
+        forecast.temperature_c = temperature_c
+        await uow.WeatherForecasts.Update(forecast)
+        await uow.SaveChanges()
+    finally:
+        await db.Dispose()
+
+
+def test_cached_body_from_older_version_is_not_served_with_new_etag(client):
+    response = client.post("/api/weather-forecasts", json={"date": "2024-01-02", "temperature_c": 3})
+    forecast_id = response.json()["data"]["id"]
+    client.get("/api/weather-forecasts")
+    cached = client.get("/api/weather-forecasts")
+    assert cached.headers["X-Cache"] == "HIT"
+
+    client.portal.call(_UpdateForecastWithoutInvalidation, forecast_id, 4)
+
+    fresh = client.get("/api/weather-forecasts", headers={"If-None-Match": cached.headers["ETag"]})
+    assert fresh.status_code == 200
+    assert fresh.headers["X-Cache"] == "MISS"
+    assert fresh.headers["ETag"] != cached.headers["ETag"]
+    assert fresh.json()["data"][0]["temperature_c"] == 4
+
+    # Entry mới được ghi đè với ETag hiện tại
+    again = client.get("/api/weather-forecasts", headers={"If-None-Match": fresh.headers["ETag"]})
+    assert again.status_code == 304
+    again = client.get("/api/weather-forecasts")
+    assert again.headers["X-Cache"] == "HIT"
+    assert again.headers["ETag"] == fresh.headers["ETag"]
+    assert again.json()["data"][0]["temperature_c"] == 4
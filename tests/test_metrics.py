@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+
+def test_metrics_endpoint_is_disabled_by_default(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_endpoint_requires_token(make_app):
+    with TestClient(make_app(METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")) as client:
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+        assert "http_request_duration_seconds" in response.text
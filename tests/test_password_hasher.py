@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+import seed_admin
+from app.config.settings import get_settings
+from app.infrastructure.auth import PasswordHasher
+
+
+@pytest.fixture
+def blocking_hasher(monkeypatch):
+    """1 worker, tối đa 1 hash đang chạy; VerifyPassword chặn tới khi event được set."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "PASSWORD_HASH_EXECUTOR", "thread")
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    PasswordHasher.ShutdownPasswordHasher()
+
+    release = threading.Event()
+    verify = PasswordHasher.VerifyPassword
+
+    def _BlockingVerify(plain_password, hashed_password):
+        release.wait(timeout=10)
+        return verify(plain_password, hashed_password)
+
+    monkeypatch.setattr(PasswordHasher, "VerifyPassword", _BlockingVerify)
+    yield release
+    release.set()
+    # Executor được tạo lại theo settings mặc định cho test sau
+    PasswordHasher.ShutdownPasswordHasher()
+
+
+def _Login(client):
+    return client.post(
+        "/api/auth/login",
+        json={"user_name": seed_admin.ADMIN_USERNAME, "password": seed_admin.ADMIN_PASSWORD},
+    )
+
+
+def test_saturated_hasher_rejects_with_retry_after(client, blocking_hasher):
+    rejected = PasswordHasher.PasswordHasherStats()["rejected"]
+    responses = []
+    first = threading.Thread(target=lambda: responses.append(_Login(client)))
+    first.start()
+
+    deadline = time.monotonic() + 5
+    while PasswordHasher.PasswordHasherStats()["in_flight"] < 1:
+        assert time.monotonic() < deadline, "first login never reached the hasher"
+        time.sleep(0.01)
+
+    response = _Login(client)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert PasswordHasher.PasswordHasherStats()["rejected"] == rejected + 1
+
+    blocking_hasher.set()
+    first.join(timeout=10)
+    assert responses[0].status_code == 200
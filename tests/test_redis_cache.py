@@ -0,0 +1,108 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.config.settings import Settings
+from app.infrastructure.cache.CacheFactory import AppCaches
+from app.infrastructure.cache.RedisCache import RedisCache
+from app.shared.cache import MemoryCache
+
+pytestmark = pytest.mark.anyio
+
+KEY_PREFIX = "test:"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def server():
+    """1 server Redis giả dùng chung => mỗi AppCaches là 1 node."""
+    return fakeredis.FakeServer()
+
+
+def _Node(server, **overrides) -> AppCaches:
+    settings = Settings(**{"CACHE_BACKEND": "redis", "CACHE_KEY_PREFIX": KEY_PREFIX, **overrides})
+    return AppCaches(settings, fakeredis.FakeAsyncRedis(server=server))
+
+
+async def _WaitFor(condition, timeout: float = 2) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "invalidation message not received"
+        await asyncio.sleep(0.005)
+
+
+async def test_factory_picks_backend(server):
+    assert isinstance(AppCaches(Settings(CACHE_BACKEND="memory")).Responses, MemoryCache)
+
+    node = _Node(server, PERMISSION_CACHE_MAX_ENTRIES=0)
+    assert isinstance(node.Responses, RedisCache)
+    # MAX_ENTRIES <= 0 => cache tắt, không cần round-trip Redis
+    assert isinstance(node.Permissions, MemoryCache)
+
+    with pytest.raises(ValueError):
+        AppCaches(Settings(CACHE_BACKEND="memcached"))
+
+
+async def test_get_set_delete(server):
+    node = _Node(server)
+    cache = node.Responses
+
+    assert await cache.Get("a") is None
+    await cache.Set("a", b"1")
+    assert await cache.Get("a") == b"1"
+    assert await node.RedisClient.get(f"{KEY_PREFIX}responses:a") == b"1"
+
+    # Node khác (near-cache rỗng) đọc được từ Redis
+    other = _Node(server).Responses
+    assert await other.Get("a") == b"1"
+    assert other.Stats()["remote_hits"] == 1
+
+    await cache.Delete("a")
+    assert await cache.Get("a") is None
+    assert await node.RedisClient.get(f"{KEY_PREFIX}responses:a") is None
+
+
+async def test_invalidate_prefix(server):
+    node = _Node(server)
+    cache = node.Responses
+    for key in ["products|/api/products?|anonymous", "products|/api/products?page=2|anonymous", "roles|/api/roles?|anonymous"]:
+        await cache.Set(key, b"x")
+
+    await cache.Invalidate("products|")
+
+    assert await cache.Get("products|/api/products?|anonymous") is None
+    assert await cache.Get("products|/api/products?page=2|anonymous") is None
+    assert await cache.Get("roles|/api/roles?|anonymous") == b"x"
+    assert sorted(await node.RedisClient.keys(f"{KEY_PREFIX}*")) == [f"{KEY_PREFIX}responses:roles|/api/roles?|anonymous".encode()]
+
+
+async def test_invalidate_on_one_node_evicts_near_cache_of_other(server):
+    first, second = _Node(server), _Node(server)
+    await first.Start()
+    await second.Start()
+    try:
+        await first.Responses.Set("products|list", b"v1")
+        await first.Responses.Set("roles|list", b"r1")
+        # Nạp near-cache của node 2
+        assert await second.Responses.Get("products|list") == b"v1"
+        assert await second.Responses.Get("roles|list") == b"r1"
+
+        await first.Responses.Invalidate("products|")
+        await _WaitFor(lambda: second.Responses.InvalidationsReceived == 1)
+        assert await second.Responses.Get("products|list") is None
+        assert await second.Responses.Get("roles|list") == b"r1"
+
+        await first.Responses.Delete("roles|list")
+        await _WaitFor(lambda: second.Responses.InvalidationsReceived == 2)
+        assert await second.Responses.Get("roles|list") is None
+
+        # Node gửi không tự nhận message của chính nó
+        assert first.Responses.InvalidationsReceived == 0
+    finally:
+        await first.Close()
+        await second.Close()
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+import seed_admin
+from app.domain.entities.RefreshToken import RefreshToken
+from app.infrastructure.auth.RefreshTokenPurgeJob import PurgeRefreshTokens
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.models.refresh_token_model import RefreshTokenModel
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+
+RETENTION_DAYS = 7
+
+
+def _Token(name: str, user_id: int, expires_in_days: float, revoked_days_ago: float | None = None) -> RefreshToken:
+    now = datetime.utcnow()
+    return RefreshToken(
+        user_id=user_id,
+        token_hash=name.encode().ljust(32, b"\0"),
+        expires_at=now + timedelta(days=expires_in_days),
+        revoked_at=None if revoked_days_ago is None else now - timedelta(days=revoked_days_ago),
+        is_revoked=revoked_days_ago is not None,
+    )
+
+
+async def _SeedTokens() -> None:
+    db = DbContext()
+    try:
+        uow = UnitOfWork(db)
+        user = await uow.Users.GetByUserName(seed_admin.ADMIN_USERNAME)
+        tokens = [
+            # Bị xoá: hết hạn / revoke trước cutoff
+            _Token("expired-1", user.id, -10),
+            _Token("expired-2", user.id, -8),
+            _Token("expired-3", user.id, -30),
+            _Token("revoked-old-1", user.id, 5, revoked_days_ago=10),
+            _Token("revoked-old-2", user.id, 5, revoked_days_ago=8),
+            # Giữ lại: còn trong retention hoặc còn hiệu lực
+            _Token("revoked-recent", user.id, 5, revoked_days_ago=1),
+            _Token("expired-recent", user.id, -1),
+            _Token("valid-1", user.id, 5),
+            _Token("valid-2", user.id, 1),
+        ]
+        for token in tokens:
+            await uow.RefreshTokens.Add(token)
+        await uow.SaveChanges()
+    finally:
+        await db.Dispose()
+
+
+async def _RemainingTokens() -> set[str]:
+    db = DbContext()
+    try:
+        hashes = await db.Scalars(select(RefreshTokenModel.token_hash))
+        return {bytes(value).rstrip(b"\0").decode() for value in hashes}
+    finally:
+        await db.Dispose()
+
+
+def test_purge_deletes_only_eligible_tokens_in_batches(client):
+    client.portal.call(_SeedTokens)
+
+    result = client.portal.call(PurgeRefreshTokens, RETENTION_DAYS, 2)
+
+    # 5 token đủ điều kiện, batch 2 => 2 + 2 + 1
+    assert result.purged == 5
+    assert result.batches == 3
+    assert client.portal.call(_RemainingTokens) == {"revoked-recent", "expired-recent", "valid-1", "valid-2"}
+
+    result = client.portal.call(PurgeRefreshTokens, RETENTION_DAYS, 2)
+    assert result.purged == 0
+    assert result.batches == 0
@@ -0,0 +1,100 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.weather_forecast_model import WeatherForecastModel
+from app.infrastructure.db.routing import SetConsistencyKey
+
+REPLICA_MARKER = "from-replica"
+REPLICA_ROWS = 3
+
+
+@pytest.fixture
+def replica_files(tmp_path):
+    """2 file SQLite độc lập (không replicate): dữ liệu đọc được cho biết câu lệnh chạy trên DB nào."""
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{replica}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for index in range(REPLICA_ROWS):
+            session.add(WeatherForecastModel(date=date(2024, 1, 1), temperature_c=index, summary=REPLICA_MARKER))
+        session.commit()
+    engine.dispose()
+    return primary, replica
+
+
+@pytest.fixture
+def replica_client(make_app, replica_files):
+    primary, replica = replica_files
+    app = make_app(
+        DATABASE_URL=f"sqlite:///{primary}",
+        READ_REPLICA_URLS=f"sqlite:///{replica}",
+        RESPONSE_CACHE_TTL_SECONDS=0,
+        READ_YOUR_WRITES_SECONDS=60,
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def _Summaries(path) -> list[str]:
+    with sqlite3.connect(path) as connection:
+        return [row[0] for row in connection.execute("SELECT summary FROM weather_forecasts ORDER BY id")]
+
+
+def _ListSummaries(client) -> list[str]:
+    response = client.get("/api/weather-forecasts")
+    assert response.status_code == 200
+    return [item["summary"] for item in response.json()["data"]]
+
+
+def test_reads_use_replica_and_writes_use_primary(replica_client, replica_files):
+    primary, replica = replica_files
+    assert _ListSummaries(replica_client) == [REPLICA_MARKER] * REPLICA_ROWS
+
+    response = replica_client.post(
+        "/api/weather-forecasts", json={"date": "2024-01-02", "temperature_c": 2, "summary": "written"}
+    )
+    assert response.status_code == 201
+    assert _Summaries(primary) == ["written"]
+    assert _Summaries(replica) == [REPLICA_MARKER] * REPLICA_ROWS
+
+    # Read-your-writes: ngay sau commit, request đọc (cùng khoá "*") vẫn đi primary
+    assert _ListSummaries(replica_client) == ["written"]
+
+
+async def _CountForecasts(engines, key: str, write: bool = False) -> tuple[int, int | None]:
+    """Đếm weather_forecasts trong 1 DbContext read-only; write=True thì ghi thêm 1 dòng rồi đếm lại trong cùng transaction."""
+    SetConsistencyKey(key)
+    db = DbContext(read_only=True, engines=engines)
+    try:
+        before = await db.Scalar(select(func.count()).select_from(WeatherForecastModel))
+        if not write:
+            return before, None
+        db.Add(WeatherForecastModel(date=date(2024, 1, 3), temperature_c=3))
+        await db.Flush()
+        during = await db.Scalar(select(func.count()).select_from(WeatherForecastModel))
+        await db.Commit()
+        return before, during
+    finally:
+        await db.Dispose()
+        SetConsistencyKey(None)
+
+
+def test_write_transaction_and_read_your_writes_window_stay_on_primary(replica_client):
+    engines = replica_client.app.state.db_engines
+
+    # Replica có REPLICA_ROWS dòng, primary rỗng
+    assert replica_client.portal.call(_CountForecasts, engines, "user:1") == (REPLICA_ROWS, None)
+
+    # Sau khi ghi, câu SELECT trong cùng transaction thấy dòng vừa flush => chạy trên primary
+    assert replica_client.portal.call(_CountForecasts, engines, "user:1", True) == (REPLICA_ROWS, 1)
+
+    # Cửa sổ read-your-writes chỉ áp dụng cho khoá đã ghi
+    assert replica_client.portal.call(_CountForecasts, engines, "user:1") == (1, None)
+    assert replica_client.portal.call(_CountForecasts, engines, "user:2") == (REPLICA_ROWS, None)
@@ -0,0 +1,20 @@
+from fastapi.testclient import TestClient
+
+HEADER = "X-Correlation-ID"
+
+
+def test_unhandled_error_returns_configured_request_id_header(make_app):
+    app = make_app(REQUEST_ID_HEADER=HEADER)
+
+    @app.get("/boom")
+    async def Boom():
+        raise RuntimeError("boom")
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        ok = client.get("/api/weather-forecasts", headers={HEADER: "abc-123"})
+        error = client.get("/boom", headers={HEADER: "abc-456"})
+
+    assert ok.headers[HEADER] == "abc-123"
+    assert error.status_code == 500
+    assert error.headers[HEADER] == "abc-456"
+    assert "X-Request-ID" not in error.headers
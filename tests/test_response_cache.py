@@ -0,0 +1,80 @@
+import seed_admin
+from app.domain.entities.User import User
+from app.infrastructure.auth.PasswordHasher import HashPassword
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+
+MANAGER_USERNAME = "manager"
+MANAGER_PASSWORD = "manager-secret"
+
+
+async def _SeedAdmins() -> None:
+    """admin: SuperAdmin + Admin; manager: chỉ Admin => cùng qua RequireRoles("Admin") nhưng khác scope cache."""
+    db = DbContext()
+    try:
+        uow = UnitOfWork(db)
+        admin_role = await uow.Roles.GetByName("Admin")
+        admin = await uow.Users.GetByUserName(seed_admin.ADMIN_USERNAME)
+        await uow.Roles.AssignRoleToUser(user_id=admin.id, role_id=admin_role.id)
+        manager = await uow.Users.Add(
+            User(
+                user_name=MANAGER_USERNAME,
+                email="manager@example.com",
+                is_active=True,
+                password_hash=HashPassword(MANAGER_PASSWORD),
+            )
+        )
+        await uow.Roles.AssignRoleToUser(user_id=manager.id, role_id=admin_role.id)
+        await uow.SaveChanges()
+    finally:
+        await db.Dispose()
+
+
+def _Login(client, user_name: str, password: str) -> dict[str, str]:
+    response = client.post("/api/auth/login", json={"user_name": user_name, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+def _Get(client, url: str, headers: dict[str, str] | None = None):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.headers["X-Cache"], response.json()["data"]
+
+
+def test_second_request_is_served_from_cache(client):
+    assert _Get(client, "/api/weather-forecasts")[0] == "MISS"
+    assert _Get(client, "/api/weather-forecasts")[0] == "HIT"
+    # Query string khác => key khác
+    assert _Get(client, "/api/weather-forecasts?pageSize=5")[0] == "MISS"
+
+
+def test_write_invalidates_cached_list(client):
+    _Get(client, "/api/weather-forecasts")
+    assert _Get(client, "/api/weather-forecasts")[0] == "HIT"
+
+    response = client.post("/api/weather-forecasts", json={"date": "2024-01-02", "temperature_c": 7})
+    assert response.status_code == 201
+
+    status, items = _Get(client, "/api/weather-forecasts")
+    assert status == "MISS"
+    assert [item["temperature_c"] for item in items] == [7]
+
+
+def test_principals_with_different_roles_do_not_share_entries(client):
+    client.portal.call(_SeedAdmins)
+    admin = _Login(client, seed_admin.ADMIN_USERNAME, seed_admin.ADMIN_PASSWORD)
+    manager = _Login(client, MANAGER_USERNAME, MANAGER_PASSWORD)
+
+    assert _Get(client, "/api/products", admin)[0] == "MISS"
+    assert _Get(client, "/api/products", admin)[0] == "HIT"
+    assert _Get(client, "/api/products", manager)[0] == "MISS"
+    assert _Get(client, "/api/products", manager)[0] == "HIT"
+
+    response = client.post("/api/products", json={"name": "p1", "price": 1.5}, headers=admin)
+    assert response.status_code == 201
+
+    for headers in (admin, manager):
+        status, items = _Get(client, "/api/products", headers)
+        assert status == "MISS"
+        assert [item["name"] for item in items] == ["p1"]
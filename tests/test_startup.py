@@ -0,0 +1,11 @@
+from fastapi.testclient import TestClient
+
+from app.config.settings import Settings
+
+
+def test_production_start_creates_schema_by_default(make_app):
+    app = make_app(ENV="production", FAST_STARTUP=Settings.model_fields["FAST_STARTUP"].default)
+
+    with TestClient(app) as client:
+        assert app.state.fast_startup is False
+        assert client.get("/api/weather-forecasts").status_code == 200
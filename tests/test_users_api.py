@@ -0,0 +1,110 @@
+from app.domain.entities.User import User
+from app.shared.pagination import EncodeCursor
+from app.infrastructure.db.DbContext import DbContext
+from app.infrastructure.db.query_profiler import AssertMaxQueries, ProfileQueries
+from app.infrastructure.repositories.UnitOfWork import UnitOfWork
+
+USER_COUNT = 60
+# Auth (claims / user + roles, quyền qua cache) + COUNT + SELECT trang + 1 query roles cho cả trang
+MAX_LIST_QUERIES = 6
+
+
+async def _SeedUsers(count: int) -> None:
+    """Thêm user (không hash password cho nhanh), mỗi user 2 role để cover bước gán roles theo trang."""
+    db = DbContext()
+    try:
+        uow = UnitOfWork(db)
+        roles = await uow.Roles.GetAll()
+        for index in range(count):
+            user = await uow.Users.Add(
+                User(
+                    user_name=f"user{index:03d}",
+                    email=f"user{index:03d}@example.com",
+                    # full_name có NULL và giá trị trùng nhau, is_active xen kẽ để kiểm tra keyset
+                    full_name=None if index % 3 == 0 else f"Name {index % 7}",
+                    is_active=index % 4 != 0,
+                )
+            )
+            for role in roles[:2]:
+                await uow.Roles.AssignRoleToUser(user_id=user.id, role_id=role.id)
+        await uow.SaveChanges()
+    finally:
+        await db.Dispose()
+
+
+def _ListUsers(client, headers, page_size: int) -> tuple[int, list[dict]]:
+    with ProfileQueries() as profile:
+        response = client.get(f"/api/users?pageSize={page_size}&sortBy=id", headers=headers)
+    assert response.status_code == 200
+    return profile.Count, response.json()["data"]
+
+
+def test_list_users_query_count_does_not_grow_with_page_size(client, admin_headers):
+    client.portal.call(_SeedUsers, USER_COUNT)
+    # Request đầu nạp cache quyền của admin, các request sau chỉ còn query của endpoint
+    _ListUsers(client, admin_headers, 5)
+
+    small_count, small_page = _ListUsers(client, admin_headers, 5)
+    large_count, large_page = _ListUsers(client, admin_headers, 50)
+
+    assert len(small_page) == 5
+    assert len(large_page) == 50
+    assert all(len(user["roles"]) == 2 for user in large_page if user["user_name"].startswith("user"))
+    assert small_count == large_count
+
+
+def test_list_users_stays_within_query_budget(client, admin_headers):
+    client.portal.call(_SeedUsers, USER_COUNT)
+
+    with AssertMaxQueries(MAX_LIST_QUERIES):
+        response = client.get("/api/users?pageSize=50", headers=admin_headers)
+    assert response.status_code == 200
+
+    with AssertMaxQueries(MAX_LIST_QUERIES):
+        response = client.get("/api/users?pageSize=50&useCursor=true", headers=admin_headers)
+    assert response.status_code == 200
+
+
+def _WalkCursor(client, headers, query: str) -> list[int]:
+    ids: list[int] = []
+    cursor = None
+    while True:
+        url = f"/api/users?pageSize=7&useCursor=true&{query}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        ids += [user["id"] for user in response.json()["data"]]
+        cursor = response.json()["meta"]["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_cursor_pagination_matches_offset_order(client, admin_headers):
+    client.portal.call(_SeedUsers, USER_COUNT)
+
+    for query in ["", "sortBy=fullname", "sortBy=fullname&sortDir=desc", "sortBy=isactive", "sortBy=email&sortDir=desc"]:
+        walked = _WalkCursor(client, admin_headers, query)
+        response = client.get(f"/api/users?pageSize=100&{query}", headers=admin_headers)
+        users = {user["id"]: user for user in response.json()["data"]}
+        assert len(walked) == USER_COUNT + 1
+        assert sorted(walked) == sorted(users)
+        if "fullname" in query:
+            # (full_name, id) với NULL nhỏ nhất
+            keys = [(users[id]["full_name"] is not None, users[id]["full_name"] or "", id) for id in walked]
+            assert keys == sorted(keys, reverse="desc" in query)
+
+
+def test_tampered_cursor_returns_bad_request(client, admin_headers):
+    invalid = [
+        "garbage",
+        EncodeCursor({"s": "id", "d": "asc", "v": 1, "id": "1 OR 1=1"}),
+        EncodeCursor({"s": "id", "d": "asc", "v": 1, "id": True}),
+        EncodeCursor({"s": "id", "d": "asc", "v": "1", "id": 1}),
+        EncodeCursor({"s": "is_active", "d": "asc", "v": 1, "id": 1}),
+        EncodeCursor({"s": "email", "d": "asc", "v": None, "id": 1}),
+        EncodeCursor({"s": "full_name", "d": "asc", "v": ["x"], "id": 1}),
+        EncodeCursor({"s": "password_hash", "d": "asc", "v": "x", "id": 1}),
+    ]
+    for cursor in invalid:
+        response = client.get(f"/api/users?cursor={cursor}", headers=admin_headers)
+        assert response.status_code == 400, cursor
+        assert response.json()["message"] == "Invalid cursor"